@@ -1,4 +1,3 @@
-import os
 from dotenv import load_dotenv
 from flask import Flask
 from flask_cors import CORS
@@ -8,29 +7,58 @@ from app.routes.projects import projects_bp
 from app.routes.users import users_bp
 from app.routes.admin import admin_bp
 from app.routes.comments import comments_bp
+from app.routes.exports import exports_bp
 from app.routes.logs import logs_bp
+from app.routes.search import search_bp
+from app.routes.imports import imports_bp
+from app.routes.events import events_bp
+from app.routes.sync import sync_bp
+from app.routes.stats import stats_bp
+from app.cli import db_cli, import_command, logs_cli, stats_cli
 from app.extentions import jwt, bcrypt,  db
+from app.json_provider import init_json
+from app.compression import init_compression
+from app.services.password_service import init_passwords
+from app.services.rate_limit_service import init_rate_limits
+from app.services.event_service import init_events
+from app.services.search_service import get_search_backend, init_search
+from config import get_config
+import app.database
 import app.listeners
 
 load_dotenv()
 
 
-def create_app() -> Flask:
+def create_app(config_name: str | None = None) -> Flask:
     app: Flask = Flask(__name__, instance_relative_config=True)
-    app.config.from_mapping(
-        SECRET_KEY=os.getenv("SECRET_KEY"),
-        SQLALCHEMY_DATABASE_URI=os.getenv("SQLALCHEMY_DATABASE_URI"),
-        SQLALCHEMY_TRACK_MODIFICATIONS=False,
-        JWT_SECRET_KEY=os.getenv("JWT_SECRET_KEY"),
-    )
-
-    # Initialize SQLAlchemy with Flask app
+    # Profile from APP_ENV (development, testing, production) unless given
+    app.config.from_object(get_config(config_name))
+
+    # Serialize responses with orjson when it is installed
+    init_json(app)
+
+    # Initialize SQLAlchemy with Flask app. The schema is managed with
+    # `flask db upgrade`, so workers start without touching the database.
     db.init_app(app)
-    with app.app_context():
-        db.create_all()
+
+    # Pick the full-text search backend for the database in use
+    init_search(app)
+
+    if app.config["DB_AUTO_CREATE"]:
+        with app.app_context():
+            db.create_all()
+            with db.engine.begin() as connection:
+                get_search_backend().setup(connection)
+
+    # Broker fanning change events out to the event streams
+    init_events(app)
 
     # Initialize bcrypt with the app instance
     bcrypt.init_app(app)
+    init_passwords(app)
+
+    # Throttle logins and registrations
+    init_rate_limits(app)
 
     # Initialize jwt with the app instance
     jwt.init_app(app)
@@ -39,12 +67,27 @@ def create_app() -> Flask:
     # Enable CORS for all routes
     CORS(app)
 
+    # Compress large responses for clients that accept it
+    init_compression(app)
+
     # Register Blueprints
     app.register_blueprint(issues_bp)
     app.register_blueprint(projects_bp)
     app.register_blueprint(users_bp)
     app.register_blueprint(admin_bp)
     app.register_blueprint(comments_bp)
+    app.register_blueprint(exports_bp)
     app.register_blueprint(logs_bp)
+    app.register_blueprint(search_bp)
+    app.register_blueprint(imports_bp)
+    app.register_blueprint(events_bp)
+    app.register_blueprint(sync_bp)
+    app.register_blueprint(stats_bp)
+
+    # Register CLI commands
+    app.cli.add_command(db_cli)
+    app.cli.add_command(import_command)
+    app.cli.add_command(stats_cli)
+    app.cli.add_command(logs_cli)
 
     return app
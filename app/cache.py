@@ -0,0 +1,69 @@
+import time
+from threading import Lock
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class TTLCache:
+    """
+    A dict whose entries expire after a time to live, safe to share between
+    threads.
+
+    Expired entries are dropped when read, and all of them at once when the
+    cache is full; if that is not enough the cache starts over empty, so its
+    size stays bounded without tracking the order of use.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        # key -> (expiry, value)
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any:
+        """Get the value of a key, or None if it is missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        """Store a value for ``ttl`` seconds; nothing is stored if it is 0 or less."""
+        if ttl <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if key not in self._entries and len(self._entries) >= self.max_size:
+                self._prune(now)
+            self._entries[key] = (now + ttl, value)
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def discard(self, predicate: Callable[[Hashable, Any], bool]) -> None:
+        """Drop the entries for which ``predicate(key, value)`` is true."""
+        with self._lock:
+            for key in [
+                key
+                for key, (_, value) in self._entries.items()
+                if predicate(key, value)
+            ]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _prune(self, now: float) -> None:
+        for key in [k for k, (expires, _) in self._entries.items() if expires < now]:
+            del self._entries[key]
+        if len(self._entries) >= self.max_size:
+            self._entries.clear()
@@ -0,0 +1,170 @@
+import os
+from datetime import datetime, timedelta
+
+import click
+from alembic import command
+from alembic.config import Config
+from flask import current_app
+from flask.cli import AppGroup, with_appcontext
+from sqlalchemy import select
+
+from app.models import User, db
+from app.services.import_service import (
+    DEFAULT_CHUNK_SIZE,
+    IMPORT_FORMATS,
+    IMPORT_KINDS,
+    import_records,
+)
+from app.services.retention_service import prune_logs
+from app.services.stats_service import rebuild_stats
+from app.services.user_service import CurrentUser
+
+MIGRATIONS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "migrations"
+)
+
+db_cli = AppGroup("db", help="Manage the database schema.")
+stats_cli = AppGroup("stats", help="Manage the project statistics.")
+logs_cli = AppGroup("logs", help="Manage the audit log.")
+
+
+def alembic_config() -> Config:
+    config = Config(os.path.join(MIGRATIONS_DIR, "alembic.ini"))
+    config.set_main_option("script_location", MIGRATIONS_DIR)
+    return config
+
+
+@db_cli.command("upgrade")
+@click.argument("revision", default="head")
+@click.option("--sql", is_flag=True, help="Print the SQL instead of running it.")
+def upgrade(revision, sql):
+    """Upgrade the database to a revision (default: head)."""
+    command.upgrade(alembic_config(), revision, sql=sql)
+
+
+@db_cli.command("downgrade")
+@click.argument("revision", default="-1")
+@click.option("--sql", is_flag=True, help="Print the SQL instead of running it.")
+def downgrade(revision, sql):
+    """Revert the database to a previous revision (default: -1)."""
+    command.downgrade(alembic_config(), revision, sql=sql)
+
+
+@db_cli.command("stamp")
+@click.argument("revision", default="head")
+def stamp(revision):
+    """Mark the database as being at a revision without running migrations."""
+    command.stamp(alembic_config(), revision)
+
+
+@db_cli.command("current")
+def current():
+    """Show the current revision of the database."""
+    command.current(alembic_config(), verbose=True)
+
+
+@db_cli.command("revision")
+@click.option("-m", "--message", required=True, help="Revision message.")
+@click.option("--autogenerate", is_flag=True, help="Detect changes from the models.")
+def revision(message, autogenerate):
+    """Create a new migration script."""
+    command.revision(alembic_config(), message=message, autogenerate=autogenerate)
+
+
+@click.command("import")
+@click.argument("kind", type=click.Choice(list(IMPORT_KINDS)))
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--format",
+    "import_format",
+    type=click.Choice(IMPORT_FORMATS),
+    help="File format (default: from the file extension).",
+)
+@click.option("--project-id", type=int, help="Project of issues that do not name one.")
+@click.option("--username", help="User the import is attributed to in the logs.")
+@click.option(
+    "--chunk-size",
+    type=click.IntRange(min=1),
+    default=DEFAULT_CHUNK_SIZE,
+    show_default=True,
+    help="Records written per transaction.",
+)
+@with_appcontext
+def import_command(kind, path, import_format, project_id, username, chunk_size):
+    """Import issues or comments from an NDJSON or CSV file."""
+    if import_format is None:
+        import_format = "csv" if path.lower().endswith(".csv") else "ndjson"
+    user = None
+    if username:
+        row = db.session.execute(
+            select(User.id, User.username, User.role).where(User.username == username)
+        ).first()
+        if row is None:
+            raise click.BadParameter(
+                f"Unknown user {username}", param_hint="--username"
+            )
+        user = CurrentUser(*row)
+
+    def progress(report):
+        click.echo(
+            f"{report.processed} processed, {report.imported} imported, "
+            f"{report.failed} rejected"
+        )
+
+    with open(path, encoding="utf-8", newline="") as stream:
+        report = import_records(
+            kind,
+            stream,
+            import_format,
+            user=user,
+            project_id=project_id,
+            chunk_size=chunk_size,
+            progress=progress,
+        )
+    for error in report.errors:
+        click.echo(f"line {error['line']}: {error['message']}", err=True)
+
+
+@stats_cli.command("rebuild")
+@click.option("--project-id", type=int, help="Only rebuild this project.")
+def rebuild(project_id):
+    """Recompute the project statistics from the issues and comments."""
+    rebuild_stats(db.session.connection(), project_id)
+    db.session.commit()
+    click.echo("Statistics rebuilt.")
+
+
+@logs_cli.command("prune")
+@click.option(
+    "--days",
+    type=click.IntRange(min=1),
+    help="Keep entries this many days old (default: LOG_RETENTION_DAYS).",
+)
+@click.option(
+    "--archive-dir",
+    help="Directory of the compressed archives (default: LOG_ARCHIVE_DIR).",
+)
+@click.option("--no-archive", is_flag=True, help="Delete without archiving.")
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    help="Entries deleted per transaction (default: LOG_RETENTION_BATCH_SIZE).",
+)
+def prune(days, archive_dir, no_archive, batch_size):
+    """Archive and delete the audit log entries past the retention period."""
+    config = current_app.config
+    days = days or config["LOG_RETENTION_DAYS"]
+    if no_archive:
+        archive_dir = None
+    elif archive_dir is None:
+        archive_dir = config["LOG_ARCHIVE_DIR"] or None
+
+    report = prune_logs(
+        datetime.now() - timedelta(days=days),
+        archive_dir=archive_dir,
+        batch_size=batch_size or config["LOG_RETENTION_BATCH_SIZE"],
+        progress=lambda report: click.echo(f"{report.deleted} deleted"),
+    )
+    click.echo(f"Deleted {report.deleted} log entries older than {days} days.")
+    if report.archive:
+        click.echo(f"Archived to {report.archive}")
@@ -0,0 +1,145 @@
+import gzip
+import hashlib
+from collections import OrderedDict
+from threading import Lock
+from typing import Tuple
+
+from flask import Flask, Response, current_app, request
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+
+class CompressedCache:
+    """
+    Process-local LRU cache of compressed bodies, bounded by total size.
+
+    Keys identify one representation of a resource in one encoding, so
+    repeated polls of an unchanged resource are served without compressing
+    it again.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: "OrderedDict[Tuple, bytes]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Tuple) -> bytes | None:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def set(self, key: Tuple, body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old)
+            self._entries[key] = body
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+def _compress(data: bytes, encoding: str) -> bytes:
+    config = current_app.config
+    if encoding == "br":
+        return brotli.compress(data, quality=config["COMPRESS_BROTLI_QUALITY"])
+    # A fixed mtime keeps the output identical for identical bodies
+    return gzip.compress(data, compresslevel=config["COMPRESS_LEVEL"], mtime=0)
+
+
+def _choose_encoding() -> str | None:
+    offered = ["br", "gzip"] if brotli is not None else ["gzip"]
+    accepted = request.accept_encodings
+    # Prefer brotli when the client accepts both equally
+    return max(
+        (encoding for encoding in offered if accepted[encoding]),
+        key=lambda encoding: accepted[encoding],
+        default=None,
+    )
+
+
+def _should_compress(response: Response) -> bool:
+    config = current_app.config
+    return (
+        config["COMPRESS_ENABLED"]
+        and response.status_code == 200
+        and request.method != "HEAD"
+        and not response.direct_passthrough
+        and not response.is_streamed
+        and "Content-Encoding" not in response.headers
+        and response.mimetype in config["COMPRESS_MIMETYPES"]
+        and "no-transform" not in response.headers.get("Cache-Control", "")
+        and (response.content_length or 0) >= config["COMPRESS_MIN_SIZE"]
+    )
+
+
+def compress_response(response: Response) -> Response:
+    """
+    Compress a response body with gzip or brotli if the client accepts it.
+
+    Only complete, non-streamed bodies of at least ``COMPRESS_MIN_SIZE`` bytes
+    are compressed. Compressed bodies are cached by ETag (or by a digest of
+    the body when there is none) so unchanged resources are compressed once.
+
+    Args:
+        response: The response to compress.
+
+    Returns:
+        The same response, compressed in place if applicable.
+    """
+    if not _should_compress(response):
+        return response
+    response.vary.add("Accept-Encoding")
+    encoding = _choose_encoding()
+    if encoding is None:
+        return response
+
+    body = response.get_data()
+    etag, weak = response.get_etag()
+    if etag:
+        key = (request.path, etag, encoding)
+    else:
+        key = (hashlib.sha1(body).digest(), encoding)
+
+    cache: CompressedCache = current_app.extensions["compression"]
+    compressed = cache.get(key)
+    if compressed is None:
+        compressed = _compress(body, encoding)
+        cache.set(key, compressed)
+    if len(compressed) >= len(body):
+        return response
+
+    response.set_data(compressed)
+    response.headers["Content-Encoding"] = encoding
+    if etag and not weak:
+        # The compressed bytes differ from the identity representation, so
+        # the tag can only promise semantic equivalence
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_compression(app: Flask) -> None:
+    """
+    Compress eligible responses of the app and set up the compressed cache.
+
+    Args:
+        app: The Flask application.
+    """
+    app.extensions["compression"] = CompressedCache(
+        app.config["COMPRESS_CACHE_MAX_BYTES"]
+    )
+    app.after_request(compress_response)
@@ -0,0 +1,75 @@
+import hashlib
+from datetime import datetime, timezone
+
+from flask import Response, request
+
+
+def make_etag(*parts, vary_on_args: bool = True) -> str:
+    """
+    Build an ETag from version information.
+
+    Args:
+        parts: Values identifying the version of the resource, e.g. the
+            entity type, its id and its version counter.
+        vary_on_args: Whether the query string is part of the tag, for
+            endpoints whose output depends on it.
+
+    Returns:
+        The (unquoted) entity tag.
+    """
+    tag = "-".join(str(part) for part in parts)
+    if vary_on_args and request.query_string:
+        digest = hashlib.sha1(request.query_string).hexdigest()[:12]
+        tag = f"{tag}-{digest}"
+    return tag
+
+
+def _http_date(value: datetime | None) -> datetime | None:
+    # Timestamps are stored as naive local time; HTTP dates are in UTC
+    if value is None:
+        return None
+    return value.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def not_modified(etag: str, last_modified: datetime | None = None) -> Response | None:
+    """
+    Answer a conditional GET from the validators alone.
+
+    Args:
+        etag: Current ETag of the resource.
+        last_modified: Time of the last change to the resource.
+
+    Returns:
+        A ``304 Not Modified`` response if the client's copy is current,
+        otherwise None.
+    """
+    if request.if_none_match:
+        fresh = request.if_none_match.contains_weak(etag)
+    elif request.if_modified_since and last_modified is not None:
+        fresh = _http_date(last_modified) <= request.if_modified_since
+    else:
+        fresh = False
+    if not fresh:
+        return None
+    response = Response(status=304)
+    return add_validators(response, etag, last_modified)
+
+
+def add_validators(
+    response: Response, etag: str, last_modified: datetime | None = None
+) -> Response:
+    """
+    Set the ``ETag`` and ``Last-Modified`` headers of a response.
+
+    Args:
+        response: Response to update.
+        etag: ETag of the resource.
+        last_modified: Time of the last change to the resource.
+
+    Returns:
+        The same response.
+    """
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = _http_date(last_modified)
+    return response
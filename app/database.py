@@ -0,0 +1,49 @@
+from flask import current_app, g, has_app_context, has_request_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.extentions import db
+
+
+def _timeout_ms() -> int:
+    if has_request_context() and "statement_timeout" in g:
+        return g.statement_timeout
+    if has_app_context():
+        return current_app.config.get("DB_STATEMENT_TIMEOUT_MS", 0)
+    return 0
+
+
+def _apply_timeout(connection, timeout_ms: int) -> None:
+    # SET LOCAL only lasts for the current transaction, which keeps it
+    # compatible with PgBouncer in transaction pooling mode
+    connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
+
+
+def set_statement_timeout_listener(session, transaction, connection):
+    if connection.dialect.name != "postgresql":
+        return
+    timeout_ms = _timeout_ms()
+    if timeout_ms:
+        _apply_timeout(connection, timeout_ms)
+
+
+def set_statement_timeout(timeout_ms: int) -> None:
+    """
+    Override the statement timeout for the rest of the current request.
+
+    Long-running endpoints such as exports can raise the limit, or disable it
+    with 0. Applies to the transaction in progress, if any, and to every
+    transaction the request starts afterwards.
+
+    Args:
+        timeout_ms: Timeout in milliseconds.
+    """
+    g.statement_timeout = timeout_ms
+    session = db.session()
+    if session.in_transaction():
+        connection = session.connection()
+        if connection.dialect.name == "postgresql":
+            _apply_timeout(connection, timeout_ms)
+
+
+event.listen(Session, "after_begin", set_statement_timeout_listener)
@@ -1,16 +1,18 @@
 from functools import wraps
 from flask import g, jsonify
-from flask_jwt_extended import get_jwt_identity, jwt_required
+from flask_jwt_extended import jwt_required
 
-from app.models import Project, Role, User
+from app.database import set_statement_timeout
+from app.models import Project, Role, db
+from app.services.membership_service import can_access_project
+from app.services.user_service import get_current_identity
 
 
 def role_required(role):
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            current_user = get_jwt_identity()
-            user = User.query.filter_by(username=current_user["username"]).first()
+            user = get_current_identity()
 
             if not user:
                 return jsonify({"message": "User not found"}), 403
@@ -29,15 +31,27 @@ def project_access_required(fn):
     @wraps(fn)
     @jwt_required()
     def decorator(*args, **kwargs):
-        current_user_id = get_jwt_identity()
-        current_user = User.query.filter_by(id=current_user_id)
-        project_id = kwargs.get("project_id")
-        project = Project.query.get(project_id)
+        current_user = get_current_identity()
+        if not current_user:
+            return jsonify({"message": "User not found"}), 403
+        project = db.session.get(Project, kwargs.get("project_id"))
         if not project:
             return jsonify({"message": "Project not found!"}), 404
-        if current_user_id != project.user_id and current_user not in project.members:
+        if not can_access_project(current_user, project):
             return jsonify({"message": "Access forbidden!"}), 403
         g.project = project
         return fn(*args, **kwargs)
 
     return decorator
+
+
+def long_running(fn):
+    """Lift the statement timeout for bulk endpoints such as exports and imports."""
+
+    @wraps(fn)
+    def decorator(*args, **kwargs):
+        # These may legitimately run longer than regular requests
+        set_statement_timeout(0)
+        return fn(*args, **kwargs)
+
+    return decorator
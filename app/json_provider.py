@@ -0,0 +1,85 @@
+import typing as t
+
+from flask import Flask, Response
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def _default(o: t.Any) -> t.Any:
+    # Named tuples (e.g. result rows) go out as lists, like with the stdlib
+    if isinstance(o, tuple):
+        return list(o)
+    return DefaultJSONProvider.default(o)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    JSON provider backed by orjson.
+
+    Output matches the default provider: dates use the HTTP date format and
+    non-string keys are converted to strings. Keys are left in the order the
+    serializers build them instead of being sorted.
+    """
+
+    default: t.Callable[[t.Any], t.Any] = staticmethod(_default)
+    sort_keys = False
+
+    def _options(self) -> int:
+        # Datetimes go through default() to keep the HTTP date format
+        options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        return options
+
+    def dumps(self, obj: t.Any, **kwargs: t.Any) -> str:
+        if kwargs:
+            # Stdlib-specific arguments such as indent or cls
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._options()).decode()
+
+    def loads(self, s: str | bytes, **kwargs: t.Any) -> t.Any:
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: t.Any, **kwargs: t.Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        options = self._options() | orjson.OPT_APPEND_NEWLINE
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            options |= orjson.OPT_INDENT_2
+        # Bytes go straight into the response body, without a str round trip
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=options),
+            mimetype=self.mimetype,
+        )
+
+
+JSON_PROVIDERS = {"default": DefaultJSONProvider}
+if orjson is not None:
+    JSON_PROVIDERS["orjson"] = OrjsonProvider
+
+
+def init_json(app: Flask) -> None:
+    """
+    Install the JSON provider used by ``jsonify`` and request parsing.
+
+    The ``JSON_PROVIDER`` setting picks it by name; by default orjson is used
+    when it is installed, and Flask's stdlib-based provider otherwise.
+
+    Args:
+        app: The Flask application.
+
+    Raises:
+        ValueError: If the configured provider is unknown or not installed.
+    """
+    name = app.config.get("JSON_PROVIDER") or (
+        "orjson" if orjson is not None else "default"
+    )
+    if name not in JSON_PROVIDERS:
+        raise ValueError(f"Unknown or unavailable JSON provider: {name}")
+    app.json_provider_class = JSON_PROVIDERS[name]
+    app.json = app.json_provider_class(app)
@@ -1,47 +1,105 @@
 import logging
-from sqlalchemy.orm import Session
-from sqlalchemy import event
-from flask_jwt_extended import get_jwt_identity, jwt_required
+from typing import Dict, List, NamedTuple
+from sqlalchemy import event, insert, inspect
+from sqlalchemy.orm import Session, object_session
 from app.models import Log, User, Project, Issue, Comment
+from app.services.event_service import (
+    change_events,
+    discard_pending_events,
+    publish_pending_events,
+    record_events,
+)
+from app.services.search_service import sync_search_index
+from app.services.stats_service import update_stats
+from app.services.user_service import get_current_identity, invalidate_user
+from app.services.version_service import bump_parent_versions, bump_version
 
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Key under which pending changes are collected in ``Session.info``
+PENDING_CHANGES = "pending_changes"
 
-def fetch_entity_name(session, entity_type, entity_id):
+# Longest entity name copied into a log action, so the action fits its column
+MAX_NAME_LENGTH = 100
+
+
+class Change(NamedTuple):
+    entity_type: str
+    entity_id: int
+    action_type: str
+    name: str
+    target: object
+    # Values of the changed columns before an update
+    previous: Dict | None = None
+
+
+def entity_name(target):
+    """
+    Get the name or relevant details of an entity from its in-memory state.
+
+    Args:
+        target: The SQLAlchemy target entity.
+
+    Returns:
+        The name, title or content of the entity, otherwise 'N/A'.
+    """
+    for attribute in ("name", "title", "content"):
+        value = getattr(target, attribute, None)
+        if value:
+            value = str(value)
+            if len(value) > MAX_NAME_LENGTH:
+                value = value[: MAX_NAME_LENGTH - 3] + "..."
+            return value
+    return "N/A"
+
+
+def make_change(target, action_type, previous: Dict | None = None) -> Change:
     """
-    Fetch the name or relevant details of an entity from the database.
+    Describe a change to an entity for the change handlers.
 
     Args:
-        session: SQLAlchemy session.
-        entity_type: Type of the entity (e.g., 'project', 'issue', 'comment', 'user').
-        entity_id: ID of the entity.
+        target: The SQLAlchemy target entity, which may be a transient copy
+            when the change was made with a bulk statement.
+        action_type: Type of action ('inserte', 'update', 'delete').
+        previous: Values of the changed columns before an update.
 
     Returns:
-        The name of the entity if found, otherwise 'N/A'.
+        The change.
     """
-    model_map = {"project": Project, "issue": Issue, "comment": Comment, "user": User}
-    model = model_map.get(entity_type.lower())
-    if not model:
-        return "N/A"
+    return Change(
+        entity_type=target.__tablename__.lower(),
+        entity_id=target.id,
+        action_type=action_type,
+        name=entity_name(target),
+        target=target,
+        previous=previous,
+    )
+
 
-    entity = session.query(model).filter_by(id=entity_id).first()
+def previous_values(target) -> Dict:
+    """
+    Get the values the changed columns of an entity had before the flush.
 
-    if not entity:
-        return "N/A"
-    name = getattr(entity, "name", "N/A")
-    if name == "N/A":
-        name = getattr(entity, "title", "N/A")
-    elif name == "N/A":
-        name = getattr(entity, "content", "N/A")
-    return name
+    Only valid until the flush ends, when the attribute history is reset.
+    """
+    state = inspect(target)
+    previous = {}
+    for column in state.mapper.column_attrs:
+        history = state.attrs[column.key].history
+        if history.deleted:
+            previous[column.key] = history.deleted[0]
+    return previous
 
 
 def log_action(mapper, connection, target, action_type):
     """
-    General function to log actions (insert, update, delete).
+    Record an action (insert, update, delete) to be logged at the end of the flush.
+
+    Nothing is written here; the change is kept on the session and all
+    changes of a flush are handled together by ``process_pending_changes``.
 
     Args:
         mapper: SQLAlchemy mapper.
@@ -49,54 +107,133 @@ def log_action(mapper, connection, target, action_type):
         target: The SQLAlchemy target entity.
         action_type: Type of action ('insert', 'update', 'delete').
     """
-    username = get_jwt_identity().get("username")
-    user = User.query.filter_by(username=username).first()
-    if not user:
-        logger.warning(f"User {username} not found for {action_type} action.")
+    session = object_session(target)
+    if session is None:
         return
+    previous = previous_values(target) if action_type == "update" else None
+    session.info.setdefault(PENDING_CHANGES, []).append(
+        make_change(target, action_type, previous)
+    )
 
-    user_id = user.id
-    entity_type = target.__tablename__.lower()
-    target_id = target.id
 
-    with Session(connection) as session:
-        target_name = fetch_entity_name(session, entity_type, target_id)
+def process_pending_changes(session, flush_context):
+    """
+    Handle every change recorded during a flush.
 
-    action = f"{action_type.capitalize()}d {entity_type.capitalize()} with ID {target_id} (Name: {target_name}) by {username}"
-    logger.info(f"Log entry: {action}")
+    Runs on the flush's connection, inside the same transaction as the
+    changes themselves.
 
-    log = Log(user_id=user_id, action=action)
-    with Session(connection) as session:
-        session.add(log)
-        session.commit()
-    logger.info(
-        f"Log entry committed for {entity_type.capitalize()} ID {target_id} (Name: {target_name})."
+    Args:
+        session: SQLAlchemy session that was flushed.
+        flush_context: SQLAlchemy flush context.
+    """
+    changes: List[Change] = session.info.pop(PENDING_CHANGES, [])
+    if not changes:
+        return
+    handle_changes(session.connection(), changes)
+
+
+def handle_changes(connection, changes: List[Change]):
+    """
+    Update everything derived from a batch of changes.
+
+    Called for every flush, and directly by code that changes rows with bulk
+    statements, which bypass the mapper events.
+
+    Args:
+        connection: SQLAlchemy connection of the transaction making the changes.
+        changes: The changes.
+    """
+    bump_parent_versions(connection, [c.target for c in changes])
+    sync_search_index(
+        connection,
+        [c.target for c in changes if c.action_type != "delete"],
+        [c.target for c in changes if c.action_type == "delete"],
     )
+    update_stats(connection, changes)
+    write_logs(connection, changes)
+    record_events(connection, change_events(connection, changes))
+
+
+def write_logs(connection, changes: List[Change]):
+    """
+    Write the log entries for a batch of changes.
+
+    The acting user is resolved once per request and all entries are written
+    with a single bulk INSERT.
+
+    Args:
+        connection: SQLAlchemy connection to write with.
+        changes: Changes to log.
+    """
+    user = get_current_identity()
+    if user is None:
+        logger.warning(f"Acting user not found, skipping {len(changes)} log entries.")
+        return
+    username = user.username
+
+    rows = []
+    for change in changes:
+        action = f"{change.action_type.capitalize()}d {change.entity_type.capitalize()} with ID {change.entity_id} (Name: {change.name}) by {username}"
+        logger.debug(f"Log entry: {action}")
+        rows.append({"user_id": user.id, "action": action[:255]})
+
+    connection.execute(insert(Log), rows)
+    # Written in the flush's transaction, so they still go if it rolls back
+    logger.info(f"Added {len(rows)} log entries by {username} to the transaction.")
+
+
+def discard_pending_changes(session, previous_transaction=None):
+    session.info.pop(PENDING_CHANGES, None)
+    discard_pending_events(session)
+
+
+def user_updated_listener(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[key].history.has_changes() for key in ("username", "role")):
+        invalidate_user(username=target.username, user_id=target.id)
+
+
+def user_deleted_listener(mapper, connection, target):
+    invalidate_user(username=target.username, user_id=target.id)
+
+
+def user_before_update_listener(mapper, connection, target):
+    if inspect(target).attrs.role.history.has_changes():
+        target.role_version = User.role_version + 1
+
+
+def before_update_listener(mapper, connection, target):
+    session = object_session(target)
+    if session is not None and session.is_modified(target):
+        bump_version(target)
 
 
-@jwt_required()
 def after_insert_listener(mapper, connection, target):
     log_action(mapper, connection, target, "inserte")
 
 
-@jwt_required()
 def after_update_listener(mapper, connection, target):
     log_action(mapper, connection, target, "update")
 
 
-@jwt_required()
 def after_delete_listener(mapper, connection, target):
     log_action(mapper, connection, target, "delete")
 
 
 # Event listeners
+event.listen(User, "before_update", user_before_update_listener)
 event.listen(User, "after_update", after_update_listener)
 event.listen(User, "after_delete", after_delete_listener)
+event.listen(User, "after_update", user_updated_listener)
+event.listen(User, "after_delete", user_deleted_listener)
 
+event.listen(Project, "before_update", before_update_listener)
 event.listen(Project, "after_insert", after_insert_listener)
 event.listen(Project, "after_update", after_update_listener)
 event.listen(Project, "after_delete", after_delete_listener)
 
+event.listen(Issue, "before_update", before_update_listener)
 event.listen(Issue, "after_insert", after_insert_listener)
 event.listen(Issue, "after_update", after_update_listener)
 event.listen(Issue, "after_delete", after_delete_listener)
@@ -104,3 +241,7 @@ event.listen(Issue, "after_delete", after_delete_listener)
 event.listen(Comment, "after_insert", after_insert_listener)
 event.listen(Comment, "after_update", after_update_listener)
 event.listen(Comment, "after_delete", after_delete_listener)
+
+event.listen(Session, "after_flush", process_pending_changes)
+event.listen(Session, "after_soft_rollback", discard_pending_changes)
+event.listen(Session, "after_commit", publish_pending_events)
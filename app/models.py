@@ -1,5 +1,6 @@
 from typing import List
-from app.extentions import bcrypt, db
+from app.extentions import db
+from app.services.password_service import hash_password, verify_password
 from datetime import datetime
 
 
@@ -12,6 +13,16 @@ class Role:
 
 class Issue(db.Model):
     __tablename__ = "issue"
+    __table_args__ = (
+        db.Index("ix_issue_project_id_status_id", "project_id", "status", "id"),
+        db.Index("ix_issue_project_id_id", "project_id", "id"),
+        # Full-text search index, see PostgresSearchBackend
+        db.Index(
+            "ix_issue_search",
+            db.text("to_tsvector('english', title || ' ' || description)"),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(100), nullable=False)
@@ -20,6 +31,10 @@ class Issue(db.Model):
     project_id = db.Column(
         db.Integer, db.ForeignKey("project.id", ondelete="CASCADE"), nullable=False
     )
+    # Bumped on every change to the issue or its comments, see version_service
+    version = db.Column(db.Integer, nullable=False, default=1, server_default="1")
+    created_at = db.Column(db.DateTime, default=datetime.now, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.now, nullable=False)
     comment = db.relationship(
         "Comment", backref="issue", lazy=True, cascade="all, delete-orphan"
     )
@@ -37,12 +52,9 @@ project_members = db.Table(
     "project_members",
     db.Column("user_id", db.Integer, db.ForeignKey("user.id"), primary_key=True),
     db.Column("project_id", db.Integer, db.ForeignKey("project.id"), primary_key=True),
-)
-
-member_projects = db.Table(
-    "member_projects",
-    db.Column("user_id", db.Integer, db.ForeignKey("user.id"), primary_key=True),
-    db.Column("project_id", db.Integer, db.ForeignKey("project.id"), primary_key=True),
+    # The primary key serves membership checks by user; this one serves
+    # member lists by project
+    db.Index("ix_project_members_project_id_user_id", "project_id", "user_id"),
 )
 
 
@@ -55,14 +67,17 @@ class Project(db.Model):
     user_id = db.Column(
         db.Integer, db.ForeignKey("user.id", ondelete="CASCADE"), nullable=False
     )
+    # Bumped on every change to the project, its members or its issues
+    version = db.Column(db.Integer, nullable=False, default=1, server_default="1")
+    updated_at = db.Column(db.DateTime, default=datetime.now, nullable=False)
     issues = db.relationship(
         "Issue", backref="project", lazy=True, cascade="all, delete-orphan"
     )
     members = db.relationship(
         "User",
         secondary=project_members,
-        lazy="subquery",
-        backref=db.backref("project", lazy=True),
+        lazy="select",
+        back_populates="projects",
     )
 
     def __init__(
@@ -84,11 +99,13 @@ class User(db.Model):
     email = db.Column(db.String(100), nullable=False, unique=True)
     password_hash = db.Column(db.String(200), nullable=False)
     role = db.Column(db.String(20), nullable=False, default=Role.DEFAULT_ROLE)
+    # Bumped on every role change to invalidate access tokens with the old role
+    role_version = db.Column(db.Integer, nullable=False, default=1, server_default="1")
     projects = db.relationship(
         "Project",
-        secondary=member_projects,
-        lazy="subquery",
-        backref=db.backref("user", lazy=True),
+        secondary=project_members,
+        lazy="select",
+        back_populates="members",
     )
     comments = db.relationship(
         "Comment", backref="user", lazy=True, cascade="all, delete-orphan"
@@ -106,19 +123,23 @@ class User(db.Model):
         self.projects = projects
 
     def set_password(self, password: str):
-        self.password_hash = bcrypt.generate_password_hash(password).decode("utf-8")
+        self.password_hash = hash_password(password)
 
     def check_password(self, password: str):
-        return bcrypt.check_password_hash(self.password_hash, password)
+        return verify_password(self.password_hash, password)
 
 
 class Log(db.Model):
     __tablename__ = "log"
 
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=True)
+    user_id = db.Column(
+        db.Integer, db.ForeignKey("user.id"), nullable=True, index=True
+    )
     action = db.Column(db.String(255), nullable=False)
-    timestamp = db.Column(db.DateTime, default=datetime.now, nullable=False)
+    timestamp = db.Column(
+        db.DateTime, default=datetime.now, nullable=False, index=True
+    )
 
     def __init__(self, user_id, action):
         self.user_id = user_id
@@ -127,6 +148,15 @@ class Log(db.Model):
 
 class Comment(db.Model):
     __tablename__ = "comment"
+    __table_args__ = (
+        db.Index("ix_comment_issue_id_timestamp_id", "issue_id", "timestamp", "id"),
+        # Full-text search index, see PostgresSearchBackend
+        db.Index(
+            "ix_comment_search",
+            db.text("to_tsvector('english', content)"),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     content = db.Column(db.Text, nullable=False)
@@ -140,3 +170,62 @@ class Comment(db.Model):
         self.content = content
         self.user_id = user_id
         self.issue_id = issue_id
+
+
+class ChangeLog(db.Model):
+    """
+    Sequence of changes to the entities of each project, read by /api/sync.
+
+    Rows outlive the entities and projects they describe, so there are no
+    foreign keys.
+    """
+
+    __tablename__ = "change_log"
+    __table_args__ = (
+        db.Index("ix_change_log_project_id_id", "project_id", "id"),
+        db.Index(
+            "ix_change_log_entity_type_entity_id_id", "entity_type", "entity_id", "id"
+        ),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    project_id = db.Column(db.Integer, nullable=False)
+    # 'project', 'issue', 'comment' or 'member' (entity_id is then the user id)
+    entity_type = db.Column(db.String(20), nullable=False)
+    entity_id = db.Column(db.Integer, nullable=False)
+    # 'created', 'updated' or 'deleted'
+    action = db.Column(db.String(20), nullable=False)
+    timestamp = db.Column(db.DateTime, default=datetime.now, nullable=False)
+
+
+# Project statistics, maintained by stats_service from every change and only
+# ever read whole. Rows of deleted projects are removed along with them.
+class ProjectStatusStats(db.Model):
+    """Number of issues of a project per status."""
+
+    __tablename__ = "project_status_stats"
+
+    project_id = db.Column(db.Integer, primary_key=True)
+    status = db.Column(db.String(20), primary_key=True)
+    issues = db.Column(db.Integer, nullable=False, default=0)
+
+
+class ProjectDailyStats(db.Model):
+    """Issues and comments of a project by the day they were created."""
+
+    __tablename__ = "project_daily_stats"
+
+    project_id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    issues = db.Column(db.Integer, nullable=False, default=0)
+    comments = db.Column(db.Integer, nullable=False, default=0)
+
+
+class ProjectCommenterStats(db.Model):
+    """Number of comments of each user on the issues of a project."""
+
+    __tablename__ = "project_commenter_stats"
+
+    project_id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, primary_key=True)
+    comments = db.Column(db.Integer, nullable=False, default=0)
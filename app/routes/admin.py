@@ -2,6 +2,7 @@ from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required
 from app.models import db, User, Role
 from app.decorators import role_required
+from app.services.user_service import invalidate_user
 
 
 admin_bp = Blueprint("admin", __name__)
@@ -27,5 +28,6 @@ def change_role():
 
     user.role = new_role
     db.session.commit()
+    invalidate_user(username=user.username, user_id=user.id)
 
     return jsonify({"message": "User role updated successfully"}), 200
@@ -1,8 +1,18 @@
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import get_jwt_identity, jwt_required
+from flask_jwt_extended import jwt_required
 
-from app.models import Comment, User, db
-from app.decorators import role_required
+from app.models import Comment, db
+from app.conditional import add_validators, make_etag, not_modified
+from app.serializers import serialize_all, serialize_comment
+from app.services.comment_service import list_comments
+from app.services.pagination import (
+    decode_cursor,
+    get_limit,
+    parse_datetime,
+    set_next_cursor,
+)
+from app.services.version_service import get_issue_version
+from app.services.user_service import get_current_identity
 
 
 comments_bp = Blueprint("comments", __name__)
@@ -11,25 +21,34 @@ comments_bp = Blueprint("comments", __name__)
 @comments_bp.route("/api/comments", methods=["GET"])
 @jwt_required()
 def get_comments():
-    issue_id = request.args.get("issue_id")
+    issue_id = request.args.get("issue_id", type=int)
     if not issue_id:
         return jsonify({"message": "Issue ID is required"}), 400
-    comments = Comment.query.filter_by(issue_id=issue_id).all()
-    return (
-        jsonify(
-            [
-                {
-                    "id": comment.id,
-                    "content": comment.content,
-                    "user_id": comment.user_id,
-                    "issue_id": comment.issue_id,
-                    "timestamp": comment.timestamp,
-                }
-                for comment in comments
-            ]
-        ),
-        200,
-    )
+
+    # Any change to a comment bumps the issue version
+    version = get_issue_version(issue_id)
+    if version:
+        etag = make_etag("comments", issue_id, version.version)
+        cached = not_modified(etag, version.updated_at)
+        if cached:
+            return cached
+
+    try:
+        limit = get_limit()
+        comments, next_cursor = list_comments(
+            issue_id,
+            limit,
+            cursor=decode_cursor(request.args.get("cursor")),
+            since=parse_datetime(request.args.get("since")),
+        )
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    response = jsonify(serialize_all(serialize_comment, comments))
+    set_next_cursor(response, next_cursor)
+    if version:
+        add_validators(response, etag, version.updated_at)
+    return response, 200
 
 
 @comments_bp.route("/api/comment", methods=["GET"])
@@ -42,18 +61,7 @@ def get_comment():
     if not comment:
         return jsonify({"message": "Comment not found"}), 404
 
-    return (
-        jsonify(
-            {
-                "id": comment.id,
-                "content": comment.content,
-                "user_id": comment.user_id,
-                "issue_id": comment.issue_id,
-                "timestamp": comment.timestamp,
-            }
-        ),
-        200,
-    )
+    return jsonify(serialize_comment(comment)), 200
 
 
 @comments_bp.route("/api/comments", methods=["POST"])
@@ -81,9 +89,7 @@ def edit_comment():
     id = request.args.get("id")
     if not id:
         return jsonify({"message": "Comment ID is required"}), 400
-    jwt = get_jwt_identity()
-    username = jwt["username"]
-    user = User.query.filter_by(username=username).first()
+    user = get_current_identity()
     comment = Comment.query.filter_by(id=id).first()
     if (
         not user
@@ -100,9 +106,7 @@ def edit_comment():
 @jwt_required()
 def delete_comment():
     id = request.args.get("id")
-    jwt = get_jwt_identity()
-    username = jwt["username"]
-    user = User.query.filter_by(username=username).first()
+    user = get_current_identity()
     comment = Comment.query.filter_by(id=id).first()
     if not user or not comment:
         return jsonify({"message": "Not authorized or comment not found"}), 403
@@ -0,0 +1,94 @@
+import json
+import time
+from typing import Callable, Iterator
+
+from flask import Blueprint, Flask, Response, current_app
+from sqlalchemy import select
+
+from app.decorators import project_access_required
+from app.models import Project, User, db
+from app.services.event_service import (
+    Subscription,
+    get_event_broker,
+    project_channel,
+)
+from app.services.membership_service import can_access_project
+from app.services.user_service import CurrentUser, get_current_identity
+
+events_bp = Blueprint("events", __name__)
+
+
+def access_check(app: Flask, user_id: int, project_id: int) -> Callable[[], bool]:
+    """
+    Build a check of whether a user can still access a project.
+
+    The check runs outside the request that opened the stream, in its own
+    application context, and reads the user's current role.
+    """
+
+    def allowed() -> bool:
+        with app.app_context():
+            row = db.session.execute(
+                select(User.id, User.username, User.role).where(User.id == user_id)
+            ).first()
+            project = db.session.get(Project, project_id)
+            return bool(
+                row and project and can_access_project(CurrentUser(*row), project)
+            )
+
+    return allowed
+
+
+def event_stream(
+    subscription: Subscription, heartbeat: float, allowed: Callable[[], bool]
+) -> Iterator[str]:
+    """
+    Write the messages of a subscription as Server-Sent Events.
+
+    A comment line is sent every ``heartbeat`` seconds without messages, so
+    proxies keep the connection open and closed clients are noticed. Access
+    is checked again as often, and the stream ends once it is lost.
+    """
+    try:
+        # Seconds for the client to wait before reconnecting
+        yield "retry: 5000\n\n"
+        checked = time.monotonic()
+        while True:
+            message = subscription.get(heartbeat)
+            if time.monotonic() - checked >= heartbeat:
+                # Users removed from the project stop receiving its events;
+                # reconnecting then fails with 403
+                if not allowed():
+                    return
+                checked = time.monotonic()
+            if subscription.overflowed:
+                # Events were dropped, the client has to reload everything
+                subscription.overflowed = False
+                yield "event: resync\ndata: {}\n\n"
+            if message is None:
+                yield ": keepalive\n\n"
+                continue
+            data = json.dumps(message, separators=(",", ":"))
+            yield f"event: {message['type']}\ndata: {data}\n\n"
+    finally:
+        subscription.close()
+
+
+@events_bp.route("/api/projects/<int:project_id>/events", methods=["GET"])
+@project_access_required
+def project_events(project_id):
+    allowed = access_check(
+        current_app._get_current_object(), get_current_identity().id, project_id
+    )
+    subscription = get_event_broker().subscribe(project_channel(project_id))
+    heartbeat = current_app.config["EVENTS_HEARTBEAT"]
+    # The stream outlives the request context; give the connection back now
+    db.session.remove()
+
+    response = Response(
+        event_stream(subscription, heartbeat, allowed), mimetype="text/event-stream"
+    )
+    response.headers["Cache-Control"] = "no-cache"
+    # Keep nginx from buffering the stream
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
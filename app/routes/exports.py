@@ -0,0 +1,69 @@
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from flask_jwt_extended import jwt_required
+
+from app.decorators import long_running, project_access_required, role_required
+from app.services.export_service import (
+    EXPORT_FORMATS,
+    export_stream,
+    logs_query,
+    project_comments_query,
+    project_issues_query,
+)
+from app.services.pagination import parse_datetime
+
+
+exports_bp = Blueprint("exports", __name__)
+
+
+def export_response(query, name: str):
+    export_format = request.args.get("format", "ndjson")
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({"message": "Invalid format"}), 400
+
+    # Compress on the fly when the client accepts it, unless told not to
+    compress = bool(request.accept_encodings["gzip"]) and request.args.get(
+        "gzip"
+    ) not in ("0", "false")
+
+    response = Response(
+        stream_with_context(export_stream(query, export_format, compress)),
+        mimetype=EXPORT_FORMATS[export_format],
+    )
+    response.headers["Content-Disposition"] = (
+        f"attachment; filename={name}.{export_format}"
+    )
+    response.headers["Vary"] = "Accept-Encoding"
+    if compress:
+        response.headers["Content-Encoding"] = "gzip"
+    return response
+
+
+@exports_bp.route("/api/projects/<int:project_id>/export/issues", methods=["GET"])
+@project_access_required
+@long_running
+def export_issues(project_id):
+    return export_response(
+        project_issues_query(project_id), f"project-{project_id}-issues"
+    )
+
+
+@exports_bp.route("/api/projects/<int:project_id>/export/comments", methods=["GET"])
+@project_access_required
+@long_running
+def export_comments(project_id):
+    return export_response(
+        project_comments_query(project_id), f"project-{project_id}-comments"
+    )
+
+
+@exports_bp.route("/api/logs/export", methods=["GET"])
+@jwt_required()
+@role_required("admin")
+@long_running
+def export_logs():
+    try:
+        since = parse_datetime(request.args.get("since"))
+        until = parse_datetime(request.args.get("until"))
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+    return export_response(logs_query(since, until), "logs")
@@ -0,0 +1,53 @@
+import io
+
+from flask import Blueprint, jsonify, request
+from flask_jwt_extended import jwt_required
+
+from app.decorators import long_running, role_required
+from app.services.import_service import (
+    DEFAULT_CHUNK_SIZE,
+    IMPORT_FORMATS,
+    IMPORT_KINDS,
+    import_records,
+)
+from app.services.user_service import get_current_identity
+
+imports_bp = Blueprint("imports", __name__)
+
+MAX_CHUNK_SIZE = 10000
+
+
+@imports_bp.route("/api/import/<kind>", methods=["POST"])
+@jwt_required()
+@role_required("project_manager")
+@long_running
+def import_data(kind):
+    if kind not in IMPORT_KINDS:
+        return jsonify({"message": "Invalid import type"}), 404
+
+    # A multipart upload in `file`, or the raw request body
+    upload = request.files.get("file")
+    filename = upload.filename if upload else ""
+    default_format = "csv" if filename.lower().endswith(".csv") else "ndjson"
+    import_format = request.args.get("format", default_format)
+    if import_format not in IMPORT_FORMATS:
+        return jsonify({"message": "Invalid format"}), 400
+
+    project_id = request.args.get("project_id", type=int)
+    chunk_size = request.args.get("chunk_size", DEFAULT_CHUNK_SIZE, type=int)
+    if chunk_size < 1:
+        return jsonify({"message": "chunk_size must be positive"}), 400
+    chunk_size = min(chunk_size, MAX_CHUNK_SIZE)
+
+    stream = io.TextIOWrapper(
+        upload.stream if upload else request.stream, encoding="utf-8", newline=""
+    )
+    report = import_records(
+        kind,
+        stream,
+        import_format,
+        user=get_current_identity(),
+        project_id=project_id,
+        chunk_size=chunk_size,
+    )
+    return jsonify(report.to_dict()), 200
@@ -1,12 +1,65 @@
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required
 
-from app.models import db, Issue
-from app.decorators import role_required
+from app.models import db, Issue, Role
+from app.conditional import add_validators, make_etag, not_modified
+from app.decorators import project_access_required, role_required
+from app.serializers import serialize_all, serialize_issue, serializer
+from app.services.issue_service import (
+    ISSUE_FIELDS,
+    MAX_BULK_OPERATIONS,
+    apply_bulk_operations,
+    list_issues,
+)
+from app.services.user_service import get_current_identity
+from app.services.version_service import get_project_version
+from app.services.pagination import (
+    decode_cursor,
+    get_fields,
+    get_limit,
+    set_next_cursor,
+)
 
 
 issues_bp = Blueprint("issues", __name__)
 
+SUMMARY_FIELDS = ("id", "title", "status", "project_id")
+
+
+def list_issues_response(project_id: int, default_fields: tuple):
+    # Any change to an issue bumps the project version, so the listing can
+    # be validated without running it
+    version = get_project_version(project_id)
+    if version:
+        etag = make_etag("issues", project_id, version.version)
+        cached = not_modified(etag, version.updated_at)
+        if cached:
+            return cached
+
+    args = request.args
+    try:
+        limit = get_limit()
+        fields = get_fields(ISSUE_FIELDS, default_fields)
+        statuses = [s for s in args.get("status", "").split(",") if s]
+        issues, next_cursor = list_issues(
+            project_id,
+            limit,
+            statuses=statuses,
+            title=args.get("q"),
+            sort=args.get("sort", "id"),
+            cursor=decode_cursor(args.get("cursor")),
+            after=args.get("after", type=int),
+            fields=fields,
+        )
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    response = jsonify(serialize_all(serializer(*fields), issues))
+    set_next_cursor(response, next_cursor)
+    if version:
+        add_validators(response, etag, version.updated_at)
+    return response
+
 
 @issues_bp.route("/api/issues", methods=["GET"])
 @jwt_required()
@@ -15,22 +68,13 @@ def get_issues():
     if not project_id:
         return jsonify({"message": "Project Id Not Found"}), 404
 
-    issues: Issue | None = Issue.query.filter_by(project_id=project_id).first()
-    if not issues:
-        return jsonify({"message": "Issues Not Found"}), 404
-
-    return jsonify(
-        [
-            {
-                "id": issue.id,
-                "title": issue.title,
-                "description": issue.description,
-                "status": issue.status,
-                "project_id": issue.project_id,
-            }
-            for issue in issues
-        ]
-    )
+    return list_issues_response(project_id, ISSUE_FIELDS)
+
+
+@issues_bp.route("/api/projects/<int:project_id>/issues", methods=["GET"])
+@project_access_required
+def get_project_issues(project_id):
+    return list_issues_response(project_id, SUMMARY_FIELDS)
 
 
 @issues_bp.route("/api/issue", methods=["GET"])
@@ -50,15 +94,7 @@ def get_issue():
     if not issue:
         return jsonify({"message": "Issue Not Found"}), 404
 
-    return jsonify(
-        {
-            "id": issue.id,
-            "title": issue.title,
-            "description": issue.description,
-            "status": issue.status,
-            "project_id": issue.project_id,
-        }
-    )
+    return jsonify(serialize_issue(issue))
 
 
 @issues_bp.route("/api/issues", methods=["POST"])
@@ -84,6 +120,37 @@ def create_issue():
     return jsonify({"message": "Issue created successfully!"}), 200
 
 
+@issues_bp.route("/api/issues/bulk", methods=["POST"])
+@jwt_required()
+def bulk_issues():
+    data = request.get_json()
+    if not isinstance(data, dict):
+        return jsonify({"message": "Request body must be a JSON object"}), 400
+    operations = data.get("operations")
+    if not isinstance(operations, list) or not operations:
+        return jsonify({"message": "operations must be a non-empty list"}), 400
+    if len(operations) > MAX_BULK_OPERATIONS:
+        return (
+            jsonify({"message": f"At most {MAX_BULK_OPERATIONS} operations allowed"}),
+            400,
+        )
+
+    # Deleting needs the same role as delete_issue
+    user = get_current_identity()
+    can_delete = user is not None and user.role in [Role.ADMIN, Role.PROJECT_MANAGER]
+    atomic = bool(data.get("atomic"))
+
+    results, applied = apply_bulk_operations(operations, can_delete, atomic)
+    if applied:
+        db.session.commit()
+    else:
+        db.session.rollback()
+
+    if atomic and not applied:
+        return jsonify({"message": "No operation applied", "results": results}), 400
+    return jsonify({"results": results}), 200
+
+
 @issues_bp.route("/api/issues", methods=["PATCH"])
 @jwt_required()
 def edit_issue():
@@ -1,28 +1,55 @@
-from math import inf
 from flask import Blueprint, jsonify, request
 from app.models import Log
+from app.serializers import serialize_all, serialize_log
+from app.services.pagination import MAX_LIMIT, get_int, get_limit, parse_datetime
 
 logs_bp = Blueprint("logs", __name__)
 
 
 @logs_bp.route("/api/logs", methods=["GET"])
 def get_logs():
-    # Get the 'count' query parameter from the request
-    count = request.args.get("count", default=inf, type=int)
+    # 'count' is kept as an alias of 'limit' for older clients
+    args = request.args
+    try:
+        if "limit" not in args and "count" in args:
+            count = args.get("count", type=int)
+            if count is None or count < 1:
+                raise ValueError("count must be a positive integer")
+            limit = min(count, MAX_LIMIT)
+        else:
+            limit = get_limit()
+        before = get_int("before")
+        after = get_int("after")
+        user_id = get_int("user_id")
+        since = parse_datetime(args.get("since"))
+        until = parse_datetime(args.get("until"))
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
 
-    # Fetch logs from the database
-    logs = Log.query.all()
+    query = Log.query
+    if user_id is not None:
+        query = query.filter(Log.user_id == user_id)
+    if since is not None:
+        query = query.filter(Log.timestamp >= since)
+    if until is not None:
+        query = query.filter(Log.timestamp < until)
+    if before is not None:
+        query = query.filter(Log.id < before)
 
-    # Ensure count is not more than available logs
-    if count == inf:
-        count = len(logs)
+    if after is not None:
+        # Polling for newer entries: take the ones right after the cursor
+        # and flip them so the response stays newest first.
+        logs = (
+            query.filter(Log.id > after).order_by(Log.id.asc()).limit(limit).all()
+        )
+        logs.reverse()
     else:
-        count = min(count, len(logs))
+        logs = query.order_by(Log.id.desc()).limit(limit).all()
 
-    # Return logs in reverse order
-    return jsonify(
-        [
-            {"id": log.id, "action": log.action, "timestamp": log.timestamp}
-            for log in logs[-count:][::-1]
-        ]
-    )
+    response = jsonify(serialize_all(serialize_log, logs))
+    # Cursor for the next page in the same direction: pass it back as
+    # 'after' when polling forward, otherwise as 'before'
+    if len(logs) == limit:
+        cursor = logs[0].id if after is not None else logs[-1].id
+        response.headers["X-Next-Cursor"] = str(cursor)
+    return response
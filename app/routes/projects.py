@@ -1,8 +1,22 @@
 from typing import Dict
 from flask import Blueprint, g, jsonify, request
-from flask_jwt_extended import get_jwt_identity, jwt_required
-from app.models import Role, User, db, Project
+from flask_jwt_extended import jwt_required
+from sqlalchemy.orm import selectinload
+from app.models import Issue, Role, User, db, Project, project_members
+from app.conditional import add_validators, make_etag, not_modified
 from app.decorators import project_access_required, role_required
+from app.serializers import (
+    serialize_all,
+    serialize_member_contact,
+    serialize_project,
+)
+from app.services.issue_service import count_issues_by_status
+from app.services.membership_service import (
+    add_member,
+    invalidate_membership,
+    remove_member,
+)
+from app.services.user_service import get_current_identity
 
 
 projects_bp = Blueprint("projects", __name__)
@@ -15,36 +29,37 @@ def get_projects():
     if user_id is None:
         return jsonify({"message": "User ID is required"}), 400
 
+    summary = request.args.get("fields") == "summary"
+
     user = User.query.filter_by(id=user_id).first()
     if not user:
         return jsonify({"message": "User not found"}), 404
-    projects = user.projects
-
-    project_data = [
-        {
-            "id": project.id,
-            "name": project.name,
-            "description": project.description,
-            "members": [
-                {
-                    "id": member.id,
-                    "name": member.name,
-                    "role": member.role,
-                }
-                for member in project.members
-            ],
-            "issues": [
-                {
-                    "id": issue.id,
-                    "title": issue.title,
-                    "description": issue.description,
-                    "status": issue.status,
-                }
-                for issue in project.issues
-            ],
-        }
-        for project in projects
-    ]
+
+    # Members and issues are fetched with one extra query each, for all
+    # projects at once, and only with the columns the response needs.
+    options = [selectinload(Project.members).load_only(User.id, User.name, User.role)]
+    if not summary:
+        options.append(
+            selectinload(Project.issues).load_only(
+                Issue.id, Issue.title, Issue.description, Issue.status
+            )
+        )
+    projects = (
+        Project.query.join(
+            project_members, project_members.c.project_id == Project.id
+        )
+        .filter(project_members.c.user_id == user.id)
+        .options(*options)
+        .order_by(Project.id)
+        .all()
+    )
+    if summary:
+        issue_counts = count_issues_by_status(project.id for project in projects)
+        project_data = [
+            serialize_project(project, issue_counts[project.id]) for project in projects
+        ]
+    else:
+        project_data = [serialize_project(project) for project in projects]
 
     return jsonify(project_data), 200
 
@@ -57,15 +72,7 @@ def get_users(project_id):
     if not project:
         return jsonify({"message": "Project not found"}), 404
     member_data = {
-        "members": [
-            {
-                "id": member.id,
-                "name": member.name,
-                "role": member.role,
-                "email": member.email,
-            }
-            for member in project.members
-        ],
+        "members": serialize_all(serialize_member_contact, project.members),
     }
 
     return jsonify(member_data), 200
@@ -75,34 +82,17 @@ def get_users(project_id):
 @project_access_required
 def get_project(project_id):
     project = g.project
-    return (
-        jsonify(
-            {
-                "id": project.id,
-                "name": project.name,
-                "description": project.description,
-                "user_id": project.user_id,
-                "members": [
-                    {
-                        "id": member.id,
-                        "name": member.name,
-                        "role": member.role,
-                    }
-                    for member in project.members
-                ],
-                "issues": [
-                    {
-                        "id": issue.id,
-                        "title": issue.title,
-                        "description": issue.description,
-                        "status": issue.status,
-                    }
-                    for issue in project.issues
-                ],
-            }
-        ),
-        200,
-    )
+    etag = make_etag("project", project.id, project.version)
+    cached = not_modified(etag, project.updated_at)
+    if cached:
+        return cached
+
+    issue_counts = None
+    if request.args.get("fields") == "summary":
+        issue_counts = count_issues_by_status([project.id])[project.id]
+    data = serialize_project(project, issue_counts)
+    data["user_id"] = project.user_id
+    return add_validators(jsonify(data), etag, project.updated_at), 200
 
 
 @projects_bp.route("/api/projects", methods=["POST"])
@@ -125,8 +115,8 @@ def create_project():
     )
 
     db.session.add(new_project)
-    user.projects.append(new_project)
     db.session.commit()
+    invalidate_membership(user.id, new_project.id)
 
     return (
         jsonify({"id": new_project.id, "message": "Project created successfully"}),
@@ -185,6 +175,7 @@ def delete_project():
 
     db.session.delete(project)
     db.session.commit()
+    invalidate_membership(project_id=project_id)
 
     return jsonify({"message": "Project deleted successfully"}), 200
 
@@ -193,10 +184,7 @@ def delete_project():
 @jwt_required()
 @role_required("project_manager")
 def add_user_to_project(project_id):
-    current_user_username = get_jwt_identity()
-    current_user = User.query.filter_by(
-        username=current_user_username["username"]
-    ).first()
+    current_user = get_current_identity()
     if not current_user:
         return jsonify({"message": "User not found!"}), 404
 
@@ -216,10 +204,9 @@ def add_user_to_project(project_id):
     if not user:
         return jsonify({"message": "User not found!"}), 404
 
-    if user not in project.members:
-        project.members.append(user)
-        user.projects.append(project)
+    if add_member(project, user.id):
         db.session.commit()
+        invalidate_membership(user.id, project.id)
         return jsonify({"message": "User added to project!"}), 200
     else:
         return jsonify({"message": "User is already a member of the project!"}), 400
@@ -229,10 +216,7 @@ def add_user_to_project(project_id):
 @jwt_required()
 @role_required("project_manager")
 def remove_user_to_project(project_id):
-    current_user_username = get_jwt_identity()
-    current_user = User.query.filter_by(
-        username=current_user_username["username"]
-    ).first()
+    current_user = get_current_identity()
     if not current_user:
         return jsonify({"message": "User not found!"}), 404
 
@@ -252,10 +236,9 @@ def remove_user_to_project(project_id):
     if not user:
         return jsonify({"message": "User not found!"}), 404
 
-    if user in project.members:
-        project.members.remove(user)
-        user.projects.remove(project)
+    if remove_member(project, user.id):
         db.session.commit()
+        invalidate_membership(user.id, project.id)
         return jsonify({"message": "User removed to project!"}), 200
     else:
         return jsonify({"message": "User is not already a member of the project!"}), 400
@@ -0,0 +1,73 @@
+from flask import Blueprint, jsonify, request
+from flask_jwt_extended import jwt_required
+
+from app.models import Project, db
+from app.services.membership_service import accessible_projects, can_access_project
+from app.services.pagination import decode_cursor, get_limit, set_next_cursor
+from app.services.search_service import ENTITY_TYPES, get_search_backend
+from app.services.user_service import get_current_identity
+
+search_bp = Blueprint("search", __name__)
+
+# Deepest offset a client may page to; ranked results are not keyset-friendly
+MAX_OFFSET = 1000
+
+
+@search_bp.route("/api/search", methods=["GET"])
+@jwt_required()
+def search():
+    query = request.args.get("q", "").strip()
+    if not query:
+        return jsonify({"message": "Query is required"}), 400
+
+    entity_type = request.args.get("type")
+    if entity_type is not None and entity_type not in ENTITY_TYPES:
+        return jsonify({"message": "Invalid type"}), 400
+    user = get_current_identity()
+    if not user:
+        return jsonify({"message": "User not found"}), 403
+    # Only the projects the user can access are searched
+    project_id = request.args.get("project_id", type=int)
+    projects = None
+    if project_id is not None:
+        project = db.session.get(Project, project_id)
+        if not project:
+            return jsonify({"message": "Project not found!"}), 404
+        if not can_access_project(user, project):
+            return jsonify({"message": "Access forbidden!"}), 403
+    else:
+        projects = accessible_projects(user)
+
+    try:
+        limit = get_limit(default=20, maximum=100)
+        cursor = decode_cursor(request.args.get("cursor")) or [0]
+        offset = cursor[0]
+        if (
+            not isinstance(offset, int)
+            or isinstance(offset, bool)
+            or not 0 <= offset <= MAX_OFFSET
+        ):
+            raise ValueError("Invalid cursor")
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    hits = get_search_backend().search(
+        query, project_id, entity_type, limit, offset, projects
+    )
+    response = jsonify(
+        [
+            {
+                "type": hit.entity_type,
+                "id": hit.entity_id,
+                "issue_id": hit.issue_id,
+                "project_id": hit.project_id,
+                "title": hit.title,
+                "snippet": hit.snippet,
+                "rank": hit.rank,
+            }
+            for hit in hits
+        ]
+    )
+    if len(hits) == limit and offset + limit <= MAX_OFFSET:
+        set_next_cursor(response, [offset + limit])
+    return response
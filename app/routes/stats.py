@@ -0,0 +1,24 @@
+from flask import Blueprint, jsonify, request
+
+from app.decorators import project_access_required
+from app.services.stats_service import get_project_stats
+
+stats_bp = Blueprint("stats", __name__)
+
+DEFAULT_DAYS = 30
+MAX_DAYS = 366
+DEFAULT_TOP = 10
+MAX_TOP = 100
+
+
+@stats_bp.route("/api/projects/<int:project_id>/stats", methods=["GET"])
+@project_access_required
+def project_stats(project_id):
+    days = request.args.get("days", DEFAULT_DAYS, type=int)
+    top = request.args.get("top", DEFAULT_TOP, type=int)
+    if not 1 <= days <= MAX_DAYS:
+        return jsonify({"message": f"days must be between 1 and {MAX_DAYS}"}), 400
+    if not 1 <= top <= MAX_TOP:
+        return jsonify({"message": f"top must be between 1 and {MAX_TOP}"}), 400
+
+    return jsonify(get_project_stats(project_id, days, top)), 200
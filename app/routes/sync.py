@@ -0,0 +1,38 @@
+from flask import Blueprint, jsonify, request
+from flask_jwt_extended import jwt_required
+
+from app.services.pagination import decode_cursor, encode_cursor, get_limit
+from app.services.sync_service import current_sync_cursor, sync_changes
+from app.services.user_service import get_current_identity
+
+sync_bp = Blueprint("sync", __name__)
+
+
+@sync_bp.route("/api/sync", methods=["GET"])
+@jwt_required()
+def sync():
+    user = get_current_identity()
+    if not user:
+        return jsonify({"message": "User not found"}), 404
+
+    try:
+        since = decode_cursor(request.args.get("since"))
+        # bool is a subclass of int, but true is not a position
+        if since is not None and (
+            len(since) != 1
+            or not isinstance(since[0], int)
+            or isinstance(since[0], bool)
+        ):
+            raise ValueError("Invalid cursor")
+        limit = get_limit(default=500)
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    if since is None:
+        # First sync: only hand out the starting point, to be taken before
+        # downloading the projects in full
+        return jsonify({"cursor": encode_cursor([current_sync_cursor()])}), 200
+
+    changes = sync_changes(user, since[0], limit)
+    changes["cursor"] = encode_cursor([changes["cursor"]])
+    return jsonify(changes), 200
@@ -1,12 +1,32 @@
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import create_access_token, get_jwt_identity, jwt_required
+from flask_jwt_extended import get_jwt_identity, jwt_required
 from app.models import db, User, Role
+from app.serializers import serialize_all, serialize_user
+from app.services.password_service import PasswordPoolBusy, needs_rehash
+from app.services.rate_limit_service import (
+    check_limit,
+    hit_limit,
+    limit_by_address,
+    too_many_requests,
+)
+from app.services.user_service import (
+    access_token_for,
+    get_current_identity,
+    refresh_token_for,
+)
 
 
 users_bp = Blueprint("users", __name__)
 
 
+def server_busy():
+    response = jsonify({"message": "Server busy, try again later"})
+    response.headers["Retry-After"] = "1"
+    return response, 503
+
+
 @users_bp.route("/api/register", methods=["POST"])
+@limit_by_address("register", "RATE_LIMIT_REGISTER")
 def register():
     data = request.get_json()
     name = data.get("name")
@@ -31,7 +51,10 @@ def register():
     else:
         user.role = Role.DEFAULT_ROLE
 
-    user.set_password(password)
+    try:
+        user.set_password(password)
+    except PasswordPoolBusy:
+        return server_busy()
     db.session.add(user)
     db.session.commit()
 
@@ -39,23 +62,54 @@ def register():
 
 
 @users_bp.route("/api/login", methods=["POST"])
+@limit_by_address("login", "RATE_LIMIT_LOGIN")
 def login():
     data = request.get_json()
-    username = data["username"]
-    password = data["password"]
+    username = data.get("username")
+    password = data.get("password")
+    if not isinstance(username, str) or not isinstance(password, str):
+        return jsonify({"message": "username and password must be strings"}), 400
+
+    # Failed attempts are counted per username across all addresses
+    failures_key = f"login:user:{username.lower()}"
+    retry_after = check_limit(failures_key, "RATE_LIMIT_LOGIN_FAILURES")
+    if retry_after:
+        return too_many_requests(retry_after)
 
     user: User | None = User.query.filter_by(username=username).first()
-    if user and user.check_password(password):
-        access_token = create_access_token(identity={"username": user.username})
-        return jsonify(access_token=access_token)
+    try:
+        valid = user is not None and user.check_password(password)
+        # Upgrade hashes made with an older cost setting while the password
+        # is at hand
+        if valid and needs_rehash(user.password_hash):
+            user.set_password(password)
+            db.session.commit()
+    except PasswordPoolBusy:
+        return server_busy()
+    if valid:
+        return jsonify(
+            access_token=access_token_for(user), refresh_token=refresh_token_for(user)
+        )
+    hit_limit(failures_key, "RATE_LIMIT_LOGIN_FAILURES")
     return jsonify({"message": "Invalid credentials"}), 401
 
 
+@users_bp.route("/api/refresh", methods=["POST"])
+@jwt_required(refresh=True)
+def refresh():
+    # A fresh access token with the user's current role
+    username = get_jwt_identity()["username"]
+    user: User | None = User.query.filter_by(username=username).first()
+    if not user:
+        return jsonify({"message": "User not found"}), 404
+    return jsonify(access_token=access_token_for(user))
+
+
 @users_bp.route("/api/user", methods=["GET"])
 @jwt_required()
 def get_user():
     current_user = get_jwt_identity()
-    user = User.query.filter_by(username=current_user["username"]).first()
+    user = get_current_identity()
     if not user:
         return jsonify({"message": "User not found"}), 404
     return (
@@ -68,14 +122,5 @@ def get_user():
 @jwt_required()
 def get_users():
     users = User.query.all()
-    user_list = [
-        {
-            "id": user.id,
-            "name": user.name,
-            "email": user.email,
-            "role": user.role,
-            "username": user.username,
-        }
-        for user in users
-    ]
+    user_list = serialize_all(serialize_user, users)
     return jsonify({"users": user_list})
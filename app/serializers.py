@@ -0,0 +1,77 @@
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, List
+
+from app.models import Project
+
+
+def serializer(*fields: str) -> Callable[[Any], Dict]:
+    """
+    Build a function turning an object into a dict of some of its attributes.
+
+    The attributes are read with a single ``attrgetter`` call and zipped with
+    the field names, which is cheaper than building a dict literal per row.
+
+    Args:
+        fields: Names of the attributes to include, in output order.
+
+    Returns:
+        The serializer.
+    """
+    if len(fields) == 1:
+        (field,) = fields
+        get = attrgetter(field)
+        return lambda obj: {field: get(obj)}
+    get = attrgetter(*fields)
+    return lambda obj: dict(zip(fields, get(obj)))
+
+
+def serialize_all(serialize: Callable[[Any], Dict], objects: Iterable) -> List[Dict]:
+    return list(map(serialize, objects))
+
+
+serialize_issue = serializer("id", "title", "description", "status", "project_id")
+# Projects without their members and issues
+serialize_project_info = serializer("id", "name", "description", "user_id")
+# Issues nested in a project
+serialize_project_issue = serializer("id", "title", "description", "status")
+serialize_member = serializer("id", "name", "role")
+serialize_member_contact = serializer("id", "name", "role", "email")
+_serialize_comment_fields = serializer("id", "content", "user_id", "issue_id")
+serialize_log = serializer("id", "action", "timestamp")
+serialize_user = serializer("id", "name", "email", "role", "username")
+
+
+def serialize_comment(comment) -> Dict:
+    """
+    Serialize a comment, with its timestamp in ISO 8601 format.
+
+    The timestamp keeps its microseconds, so clients can pass the newest one
+    they received back as ``since`` without missing or repeating comments.
+    """
+    data = _serialize_comment_fields(comment)
+    data["timestamp"] = comment.timestamp.isoformat()
+    return data
+
+
+def serialize_project(project: Project, issue_counts: Dict | None = None) -> Dict:
+    """
+    Serialize a project with its members, and its issues or issue counts.
+
+    Args:
+        project: The project, with members and issues loaded as needed.
+        issue_counts: Issue counts by status to include instead of the issues.
+
+    Returns:
+        The project as a dict.
+    """
+    data = {
+        "id": project.id,
+        "name": project.name,
+        "description": project.description,
+        "members": serialize_all(serialize_member, project.members),
+    }
+    if issue_counts is not None:
+        data["issue_counts"] = issue_counts
+    else:
+        data["issues"] = serialize_all(serialize_project_issue, project.issues)
+    return data
@@ -0,0 +1,62 @@
+from datetime import datetime
+from typing import List, Tuple
+
+from app.models import Comment
+from app.services.pagination import after_key
+
+
+SORT_COLUMNS = (Comment.timestamp, Comment.id)
+
+
+def _parse_cursor(cursor: list) -> Tuple[datetime, int]:
+    if (
+        len(cursor) != 2
+        or not isinstance(cursor[0], str)
+        or not isinstance(cursor[1], int)
+        or isinstance(cursor[1], bool)
+    ):
+        raise ValueError("Invalid cursor")
+    try:
+        return datetime.fromisoformat(cursor[0]), cursor[1]
+    except ValueError:
+        raise ValueError("Invalid cursor")
+
+
+def list_comments(
+    issue_id: int,
+    limit: int,
+    cursor: list | None = None,
+    since: datetime | None = None,
+) -> Tuple[List[Comment], list | None]:
+    """
+    Get one page of an issue's comments, oldest first, using keyset pagination.
+
+    Pages follow the ``(issue_id, timestamp, id)`` index, so a page, or a poll
+    for new comments, is a single index range scan.
+
+    Args:
+        issue_id: Id of the issue.
+        limit: Maximum number of comments to return.
+        cursor: ``[timestamp, id]`` of the last comment of the previous page.
+        since: Only return comments posted after this time.
+
+    Returns:
+        The comments of the page and the cursor of the next page, which is
+        None on the last page.
+
+    Raises:
+        ValueError: If the cursor is invalid.
+    """
+    query = Comment.query.filter(Comment.issue_id == issue_id)
+    if since is not None:
+        query = query.filter(Comment.timestamp > since)
+    if cursor is not None:
+        query = query.filter(after_key(SORT_COLUMNS, _parse_cursor(cursor), False))
+
+    comments = query.order_by(*SORT_COLUMNS).limit(limit).all()
+
+    next_cursor = None
+    if len(comments) == limit:
+        last = comments[-1]
+        next_cursor = [last.timestamp.isoformat(), last.id]
+    return comments, next_cursor
@@ -0,0 +1,341 @@
+import json
+import logging
+import queue
+import select as select_module
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from threading import Lock, Thread
+from typing import Dict, Iterable, List, NamedTuple, Set, Tuple
+
+from flask import Flask, current_app, has_app_context
+from sqlalchemy import func, insert, literal, select
+from werkzeug.utils import import_string
+
+from app.models import ChangeLog, Comment, Issue, Project, db
+
+logger = logging.getLogger(__name__)
+
+# Key under which events are collected in ``Session.info`` until commit
+PENDING_EVENTS = "pending_events"
+
+ACTIONS = {"inserte": "created", "update": "updated", "delete": "deleted"}
+
+
+class ChangeEvent(NamedTuple):
+    project_id: int
+    # 'project', 'issue', 'comment' or 'member'
+    type: str
+    id: int
+    # 'created', 'updated' or 'deleted'
+    action: str
+
+
+def project_channel(project_id: int) -> str:
+    return f"project:{project_id}"
+
+
+class Subscription:
+    """
+    Queue of the messages published on a channel, for one listener.
+
+    A listener that falls behind by more than the queue size loses messages;
+    ``overflowed`` is then set so it can tell its client to reload instead.
+    """
+
+    def __init__(self, broker: "LocalBroker", channel: str, size: int) -> None:
+        self.broker = broker
+        self.channel = channel
+        self.overflowed = False
+        self._queue: queue.Queue = queue.Queue(maxsize=size)
+
+    def put(self, message: Dict) -> None:
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            self.overflowed = True
+
+    def get(self, timeout: float) -> Dict | None:
+        """Wait for the next message, or None after ``timeout`` seconds."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self) -> None:
+        self.broker.unsubscribe(self)
+
+
+class EventBroker(ABC):
+    """
+    Interface of a publish/subscribe broker for change events.
+
+    ``publish`` is called after each commit with the messages of the
+    transaction; ``subscribe`` is called for every open event stream.
+    """
+
+    name = "base"
+
+    def __init__(self, app: Flask) -> None:
+        self.queue_size = app.config["EVENTS_QUEUE_SIZE"]
+
+    @abstractmethod
+    def publish(self, messages: List[Tuple[str, Dict]]) -> None:
+        """Publish ``(channel, message)`` pairs to every subscriber."""
+
+    @abstractmethod
+    def subscribe(self, channel: str) -> Subscription:
+        """Start receiving the messages published on a channel."""
+
+
+class LocalBroker(EventBroker):
+    """
+    Broker delivering messages within the current process only.
+
+    Enough for a single worker, and for tests.
+    """
+
+    name = "local"
+
+    def __init__(self, app: Flask) -> None:
+        super().__init__(app)
+        self._subscriptions: Dict[str, Set[Subscription]] = {}
+        self._lock = Lock()
+
+    def publish(self, messages):
+        self.deliver(messages)
+
+    def deliver(self, messages: Iterable[Tuple[str, Dict]]) -> None:
+        """Hand messages to the subscriptions of this process."""
+        with self._lock:
+            targets = [
+                (subscription, message)
+                for channel, message in messages
+                for subscription in self._subscriptions.get(channel, ())
+            ]
+        for subscription, message in targets:
+            subscription.put(message)
+
+    def subscribe(self, channel):
+        subscription = Subscription(self, channel, self.queue_size)
+        with self._lock:
+            self._subscriptions.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.channel)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.channel]
+
+
+class PostgresBroker(LocalBroker):
+    """
+    Broker sharing messages between workers with PostgreSQL LISTEN/NOTIFY.
+
+    Messages are sent with ``pg_notify`` on one database channel. Each
+    process runs a single listener thread, started with its first
+    subscription, that hands the notifications to its local subscriptions.
+    Requires psycopg2.
+    """
+
+    name = "postgresql"
+    CHANNEL = "issue_monitor_events"
+    # Seconds between checks of the listening connection
+    POLL_INTERVAL = 5
+
+    def __init__(self, app: Flask) -> None:
+        super().__init__(app)
+        with app.app_context():
+            self.engine = db.engine
+        self._listener: Thread | None = None
+
+    def publish(self, messages):
+        with self.engine.connect() as connection:
+            for channel, message in messages:
+                payload = json.dumps({"channel": channel, "message": message})
+                connection.execute(select(func.pg_notify(self.CHANNEL, payload)))
+            connection.commit()
+
+    def subscribe(self, channel):
+        if self._listener is None:
+            with self._lock:
+                if self._listener is None:
+                    self._listener = Thread(
+                        target=self._listen, name="event-listener", daemon=True
+                    )
+                    self._listener.start()
+        return super().subscribe(channel)
+
+    def _listen(self) -> None:
+        while True:
+            try:
+                self._listen_once()
+            except Exception:
+                logger.exception("Event listener failed, reconnecting.")
+                time.sleep(self.POLL_INTERVAL)
+
+    def _listen_once(self) -> None:
+        connection = self.engine.raw_connection()
+        try:
+            dbapi_connection = connection.driver_connection
+            dbapi_connection.autocommit = True
+            with dbapi_connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {self.CHANNEL}")
+            while True:
+                ready, _, _ = select_module.select(
+                    [dbapi_connection], [], [], self.POLL_INTERVAL
+                )
+                if not ready:
+                    continue
+                dbapi_connection.poll()
+                notifications = dbapi_connection.notifies[:]
+                del dbapi_connection.notifies[:]
+                messages = []
+                for notification in notifications:
+                    payload = json.loads(notification.payload)
+                    messages.append((payload["channel"], payload["message"]))
+                self.deliver(messages)
+        finally:
+            connection.invalidate()
+
+
+BROKERS = {broker.name: broker for broker in (LocalBroker, PostgresBroker)}
+
+
+def init_events(app: Flask) -> None:
+    """
+    Set up the change event broker named by ``EVENT_BROKER``.
+
+    The setting is either a built-in broker name ('local' or 'postgresql') or
+    the import path of an ``EventBroker`` subclass.
+    """
+    name = app.config["EVENT_BROKER"]
+    broker = BROKERS[name] if name in BROKERS else import_string(name)
+    app.extensions["events"] = broker(app)
+
+
+def get_event_broker() -> EventBroker | None:
+    if not has_app_context():
+        return None
+    return current_app.extensions.get("events")
+
+
+def queue_events(events: Iterable[ChangeEvent]) -> None:
+    """Keep events on the session, to be published once it commits."""
+    db.session.info.setdefault(PENDING_EVENTS, []).extend(events)
+
+
+def record_events(connection, events: List[ChangeEvent]) -> None:
+    """
+    Add events to the change log and queue them for publishing.
+
+    Args:
+        connection: Connection of the transaction making the changes.
+        events: The events.
+    """
+    if not events:
+        return
+    connection.execute(
+        insert(ChangeLog),
+        [
+            {
+                "project_id": event.project_id,
+                "entity_type": event.type,
+                "entity_id": event.id,
+                "action": event.action,
+            }
+            for event in events
+        ],
+    )
+    queue_events(events)
+
+
+def record_inserted(connection, kind: str, ids: List[int]) -> None:
+    """
+    Add bulk inserted rows to the change log, as created.
+
+    Bulk imports bypass the mapper events, so this takes their place with a
+    single ``INSERT ... SELECT``. The rows are not published to event
+    streams, which clients of large imports reload anyway.
+
+    Args:
+        connection: Connection of the transaction that inserted the rows.
+        kind: 'issues' or 'comments'.
+        ids: Ids of the inserted rows.
+    """
+    if kind == "issues":
+        query = select(
+            Issue.project_id, literal("issue"), Issue.id, literal("created")
+        ).where(Issue.id.in_(ids))
+    else:
+        query = (
+            select(Issue.project_id, literal("comment"), Comment.id, literal("created"))
+            .join(Issue, Comment.issue_id == Issue.id)
+            .where(Comment.id.in_(ids))
+        )
+    query = query.add_columns(literal(datetime.now()))
+    connection.execute(
+        insert(ChangeLog).from_select(
+            ["project_id", "entity_type", "entity_id", "action", "timestamp"], query
+        )
+    )
+
+
+def change_events(connection, changes) -> List[ChangeEvent]:
+    """
+    Turn the changes of a flush into events of the projects they belong to.
+
+    Args:
+        connection: Connection of the flush.
+        changes: The ``Change`` tuples of the flush.
+
+    Returns:
+        The events.
+    """
+    events = []
+    comments = []
+    for change in changes:
+        target, action = change.target, ACTIONS[change.action_type]
+        if isinstance(target, Project):
+            events.append(ChangeEvent(target.id, "project", target.id, action))
+        elif isinstance(target, Issue):
+            events.append(ChangeEvent(target.project_id, "issue", target.id, action))
+        elif isinstance(target, Comment):
+            comments.append((target, action))
+
+    if comments:
+        # Comments of issues deleted in the same flush have no project left,
+        # the issue event covers them
+        issue_ids = {target.issue_id for target, _ in comments}
+        projects = dict(
+            connection.execute(
+                select(Issue.id, Issue.project_id).where(Issue.id.in_(issue_ids))
+            ).all()
+        )
+        for target, action in comments:
+            project_id = projects.get(target.issue_id)
+            if project_id is not None:
+                events.append(ChangeEvent(project_id, "comment", target.id, action))
+    return events
+
+
+def publish_pending_events(session) -> None:
+    events: List[ChangeEvent] = session.info.pop(PENDING_EVENTS, [])
+    broker = get_event_broker()
+    if not events or broker is None:
+        return
+    try:
+        broker.publish(
+            [(project_channel(event.project_id), event._asdict()) for event in events]
+        )
+    except Exception:
+        # The changes are committed already; listeners will catch up on
+        # their next reload
+        logger.exception(f"Failed to publish {len(events)} change events.")
+
+
+def discard_pending_events(session) -> None:
+    session.info.pop(PENDING_EVENTS, None)
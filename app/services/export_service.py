@@ -0,0 +1,151 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List
+
+from sqlalchemy import select
+
+from app.models import Comment, Issue, Log, db
+
+
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+# Rows fetched from the server-side cursor at a time
+BATCH_SIZE = 1000
+# Approximate size of the chunks handed to the WSGI server
+CHUNK_SIZE = 64 * 1024
+
+ISSUE_COLUMNS = [Issue.id, Issue.project_id, Issue.title, Issue.description, Issue.status]
+COMMENT_COLUMNS = [
+    Comment.id,
+    Comment.issue_id,
+    Comment.user_id,
+    Comment.content,
+    Comment.timestamp,
+]
+LOG_COLUMNS = [Log.id, Log.user_id, Log.action, Log.timestamp]
+
+
+def project_issues_query(project_id: int):
+    return (
+        select(*ISSUE_COLUMNS).where(Issue.project_id == project_id).order_by(Issue.id)
+    )
+
+
+def project_comments_query(project_id: int):
+    return (
+        select(*COMMENT_COLUMNS)
+        .join(Issue, Issue.id == Comment.issue_id)
+        .where(Issue.project_id == project_id)
+        .order_by(Comment.id)
+    )
+
+
+def logs_query(since: datetime | None = None, until: datetime | None = None):
+    query = select(*LOG_COLUMNS).order_by(Log.id)
+    if since is not None:
+        query = query.where(Log.timestamp >= since)
+    if until is not None:
+        query = query.where(Log.timestamp < until)
+    return query
+
+
+def stream_rows(query) -> Iterator[Dict]:
+    """
+    Run a query and yield its rows one at a time.
+
+    Rows are fetched in batches through a server-side cursor where the driver
+    supports it, and never loaded into the session, so memory use does not
+    depend on the size of the result.
+
+    Args:
+        query: A Core ``select`` of plain columns.
+
+    Yields:
+        Each row as a dict.
+    """
+    result = db.session.execute(query.execution_options(yield_per=BATCH_SIZE))
+    for row in result:
+        yield row._asdict()
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _chunked(pieces: Iterable[str]) -> Iterator[bytes]:
+    buffer: List[str] = []
+    size = 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= CHUNK_SIZE:
+            yield "".join(buffer).encode("utf-8")
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
+
+
+def to_ndjson(rows: Iterable[Dict]) -> Iterator[bytes]:
+    """Encode rows as newline-delimited JSON, in chunks."""
+    return _chunked(
+        json.dumps(row, default=_json_default, separators=(",", ":")) + "\n"
+        for row in rows
+    )
+
+
+def to_csv(rows: Iterable[Dict], columns: List[str]) -> Iterator[bytes]:
+    """Encode rows as CSV with a header line, in chunks."""
+
+    def lines():
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=columns)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(
+                {
+                    key: value.isoformat() if isinstance(value, datetime) else value
+                    for key, value in row.items()
+                }
+            )
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue()
+
+    return _chunked(lines())
+
+
+def gzip_stream(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Compress a stream of chunks on the fly into a single gzip member."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_stream(query, export_format: str, compress: bool) -> Iterator[bytes]:
+    """
+    Stream the rows of a query in an export format.
+
+    Args:
+        query: A Core ``select`` of plain columns.
+        export_format: One of ``EXPORT_FORMATS``.
+        compress: Whether to gzip the output.
+
+    Returns:
+        An iterator of encoded chunks.
+    """
+    rows = stream_rows(query)
+    if export_format == "csv":
+        columns = [column.key for column in query.selected_columns]
+        chunks = to_csv(rows, columns)
+    else:
+        chunks = to_ndjson(rows)
+    return gzip_stream(chunks) if compress else chunks
@@ -0,0 +1,309 @@
+import csv
+import io
+import json
+from datetime import datetime
+from itertools import islice
+from typing import Callable, Dict, Iterator, List, TextIO, Tuple
+
+from sqlalchemy import func, insert, select
+
+from app.models import Comment, Issue, Log, Project, User, db
+from app.services.event_service import record_inserted
+from app.services.issue_service import ISSUE_LIMITS
+from app.services.search_service import SearchDocument, get_search_backend
+from app.services.stats_service import add_inserted_stats
+from app.services.user_service import CurrentUser
+from app.services.version_service import bump_versions
+
+IMPORT_FORMATS = ("ndjson", "csv")
+IMPORT_KINDS = {"issues": Issue, "comments": Comment}
+DEFAULT_CHUNK_SIZE = 1000
+# Per-row errors kept in the report; the rest are only counted
+MAX_REPORTED_ERRORS = 100
+
+
+class ImportReport:
+    def __init__(self, kind: str) -> None:
+        self.kind = kind
+        self.processed = 0
+        self.imported = 0
+        self.failed = 0
+        self.errors: List[Dict] = []
+
+    def add_error(self, line: int, message: str) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "message": message})
+
+    def to_dict(self) -> Dict:
+        return {
+            "kind": self.kind,
+            "processed": self.processed,
+            "imported": self.imported,
+            "failed": self.failed,
+            "errors": self.errors,
+        }
+
+
+def read_records(
+    stream: TextIO, import_format: str
+) -> Iterator[Tuple[int, Dict | None, str | None]]:
+    """
+    Read records one at a time from an NDJSON or CSV text stream.
+
+    Args:
+        stream: Text stream to read from.
+        import_format: 'ndjson' or 'csv'.
+
+    Yields:
+        ``(line, record, error)`` tuples, with either a record or the reason
+        the line could not be parsed.
+    """
+    if import_format == "csv":
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record, None
+        return
+
+    for line_number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, None, f"Invalid JSON: {e.msg}"
+            continue
+        if not isinstance(record, dict):
+            yield line_number, None, "Expected a JSON object"
+            continue
+        yield line_number, record, None
+
+
+def _text(record: Dict, field: str, max_length: int | None = None) -> str:
+    value = record.get(field)
+    if not isinstance(value, str) or not value.strip():
+        raise ValueError(f"{field} is required")
+    if max_length is not None and len(value) > max_length:
+        raise ValueError(f"{field} is longer than {max_length} characters")
+    return value
+
+
+def _integer(record: Dict, field: str, default: int | None = None) -> int:
+    value = record.get(field)
+    if value in (None, ""):
+        value = default
+    if isinstance(value, str) and value.strip().isdigit():
+        value = int(value)
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise ValueError(f"{field} must be an integer")
+    return value
+
+
+def clean_issue(record: Dict, project_id: int | None, now: datetime) -> Dict:
+    """Validate an issue record against the ``Issue`` columns."""
+    return {
+        "title": _text(record, "title", ISSUE_LIMITS["title"]),
+        "description": _text(record, "description"),
+        "status": _text(record, "status", ISSUE_LIMITS["status"]),
+        "project_id": _integer(record, "project_id", project_id),
+        "version": 1,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def clean_comment(record: Dict, project_id: int | None, now: datetime) -> Dict:
+    """Validate a comment record against the ``Comment`` columns."""
+    timestamp = record.get("timestamp") or None
+    if timestamp is not None:
+        try:
+            timestamp = datetime.fromisoformat(timestamp)
+        except (TypeError, ValueError):
+            raise ValueError("timestamp must be an ISO 8601 date")
+    return {
+        "content": _text(record, "content"),
+        "user_id": _integer(record, "user_id"),
+        "issue_id": _integer(record, "issue_id"),
+        "timestamp": timestamp or now,
+    }
+
+
+# Foreign keys checked for every chunk: column -> referenced model
+REFERENCES = {
+    "issues": {"project_id": Project},
+    "comments": {"issue_id": Issue, "user_id": User},
+}
+CLEANERS = {"issues": clean_issue, "comments": clean_comment}
+
+
+def _existing_ids(model, ids) -> set:
+    if not ids:
+        return set()
+    return set(db.session.scalars(select(model.id).where(model.id.in_(ids))))
+
+
+def _write_rows(connection, model, rows: List[Dict]) -> List[int]:
+    """
+    Insert rows with COPY on PostgreSQL (psycopg2) or a bulk INSERT.
+
+    Returns:
+        The ids of the new rows, in order.
+    """
+    if (
+        connection.dialect.name == "postgresql"
+        and connection.dialect.driver == "psycopg2"
+    ):
+        # COPY cannot return the ids, so take them from the sequence first
+        ids = connection.scalars(
+            select(
+                func.nextval(func.pg_get_serial_sequence(model.__tablename__, "id"))
+            ).select_from(func.generate_series(1, len(rows)))
+        ).all()
+        rows = [{"id": id, **row} for id, row in zip(ids, rows)]
+        columns = list(rows[0])
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow(
+                [
+                    (
+                        row[column].isoformat()
+                        if isinstance(row[column], datetime)
+                        else row[column]
+                    )
+                    for column in columns
+                ]
+            )
+        buffer.seek(0)
+        cursor = connection.connection.dbapi_connection.cursor()
+        try:
+            cursor.copy_expert(
+                f'COPY "{model.__tablename__}" ({", ".join(columns)}) '
+                "FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+        finally:
+            cursor.close()
+        return ids
+    return connection.scalars(
+        insert(model.__table__).returning(
+            model.__table__.c.id, sort_by_parameter_order=True
+        ),
+        rows,
+    ).all()
+
+
+def _documents(kind: str, ids: List[int], rows: List[Dict]) -> List[SearchDocument]:
+    if kind == "issues":
+        return [
+            SearchDocument("issue", id, id, row["title"], row["description"])
+            for id, row in zip(ids, rows)
+        ]
+    return [
+        SearchDocument("comment", id, row["issue_id"], "", row["content"])
+        for id, row in zip(ids, rows)
+    ]
+
+
+def import_records(
+    kind: str,
+    stream: TextIO,
+    import_format: str,
+    user: CurrentUser | None = None,
+    project_id: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: Callable[[ImportReport], None] | None = None,
+) -> ImportReport:
+    """
+    Import issues or comments from a stream, one chunk at a time.
+
+    Rows are validated against the model constraints and written with bulk
+    inserts that bypass the ORM and its per-row listeners; each chunk is
+    committed on its own. Versions, statistics, the change log and the search
+    index are updated per chunk, and a single summary entry is written to the
+    audit log at the end.
+
+    Args:
+        kind: 'issues' or 'comments'.
+        stream: Text stream with the records.
+        import_format: 'ndjson' or 'csv'.
+        user: User the import is attributed to in the audit log.
+        project_id: Project of issue records that do not name one.
+        chunk_size: Number of records written per transaction.
+        progress: Called with the report after every chunk.
+
+    Returns:
+        The import report.
+    """
+    model = IMPORT_KINDS[kind]
+    clean = CLEANERS[kind]
+    references = REFERENCES[kind]
+    search_backend = get_search_backend()
+    report = ImportReport(kind)
+    records = read_records(stream, import_format)
+
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            break
+        now = datetime.now()
+
+        cleaned: List[Tuple[int, Dict]] = []
+        for line, record, error in chunk:
+            report.processed += 1
+            if error is None:
+                try:
+                    cleaned.append((line, clean(record, project_id, now)))
+                    continue
+                except ValueError as e:
+                    error = str(e)
+            report.add_error(line, error)
+
+        # One query per referenced table for the whole chunk
+        existing = {
+            column: _existing_ids(referenced, {values[column] for _, values in cleaned})
+            for column, referenced in references.items()
+        }
+        rows = []
+        for line, values in cleaned:
+            missing = [
+                column
+                for column in references
+                if values[column] not in existing[column]
+            ]
+            if missing:
+                report.add_error(line, f"Unknown {', '.join(missing)}")
+            else:
+                rows.append(values)
+
+        if rows:
+            connection = db.session.connection()
+            ids = _write_rows(connection, model, rows)
+            record_inserted(connection, kind, ids)
+            add_inserted_stats(connection, kind, ids)
+            if search_backend is not None and search_backend.needs_sync:
+                search_backend.index(connection, _documents(kind, ids, rows))
+            if kind == "issues":
+                bump_versions(
+                    connection, project_ids={row["project_id"] for row in rows}
+                )
+            else:
+                issue_ids = {row["issue_id"] for row in rows}
+                project_ids = connection.scalars(
+                    select(Issue.project_id).where(Issue.id.in_(issue_ids)).distinct()
+                )
+                bump_versions(connection, project_ids=project_ids, issue_ids=issue_ids)
+            report.imported += len(rows)
+        db.session.commit()
+
+        if progress is not None:
+            progress(report)
+
+    action = f"Imported {report.imported} {kind} ({report.failed} rejected)"
+    if user is not None:
+        action += f" by {user.username}"
+    db.session.execute(
+        insert(Log), [{"user_id": user.id if user else None, "action": action[:255]}]
+    )
+    db.session.commit()
+    return report
@@ -0,0 +1,314 @@
+from datetime import datetime
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.orm import load_only
+
+from app.listeners import handle_changes, make_change
+from app.models import Comment, Issue, Project, db
+from app.services.pagination import after_key
+
+
+def count_issues_by_status(project_ids: Iterable[int]) -> Dict[int, Dict[str, int]]:
+    """
+    Count the issues of several projects, grouped by status.
+
+    Args:
+        project_ids: Ids of the projects to count issues for.
+
+    Returns:
+        A mapping of project id to a ``{status: count}`` mapping. Every
+        requested project is present, with an empty mapping if it has no issues.
+    """
+    project_ids = list(project_ids)
+    counts: Dict[int, Dict[str, int]] = {project_id: {} for project_id in project_ids}
+    if not project_ids:
+        return counts
+
+    rows = (
+        db.session.query(Issue.project_id, Issue.status, func.count(Issue.id))
+        .filter(Issue.project_id.in_(project_ids))
+        .group_by(Issue.project_id, Issue.status)
+    )
+    for project_id, status, count in rows:
+        counts[project_id][status] = count
+    return counts
+
+
+ISSUE_FIELDS = ("id", "title", "description", "status", "project_id")
+SORT_KEYS = {"id": (Issue.id,), "status": (Issue.status, Issue.id)}
+
+
+def list_issues(
+    project_id: int,
+    limit: int,
+    statuses: List[str] | None = None,
+    title: str | None = None,
+    sort: str = "id",
+    cursor: list | None = None,
+    after: int | None = None,
+    fields: Tuple[str, ...] = ISSUE_FIELDS,
+) -> Tuple[List[Issue], list | None]:
+    """
+    Get one page of a project's issues using keyset pagination.
+
+    The filters and sort orders match the ``(project_id, status, id)`` and
+    ``(project_id, id)`` indexes, so a page is a single index range scan.
+
+    Args:
+        project_id: Id of the project.
+        limit: Maximum number of issues to return.
+        statuses: Only return issues with one of these statuses.
+        title: Only return issues whose title contains this text.
+        sort: 'id' or 'status', prefixed with '-' for descending order.
+        cursor: Sort key of the last issue of the previous page.
+        after: Only return issues with an id greater than this one.
+        fields: Columns to load for each issue.
+
+    Returns:
+        The issues of the page and the cursor of the next page, which is None
+        on the last page.
+
+    Raises:
+        ValueError: If the sort order or the cursor is invalid.
+    """
+    descending = sort.startswith("-")
+    columns = SORT_KEYS.get(sort.lstrip("-"))
+    if columns is None:
+        raise ValueError(f"Invalid sort: {sort}")
+    if cursor is not None and (
+        len(cursor) != len(columns)
+        or not all(
+            # bool is a subclass of int, but true is not an id
+            isinstance(value, column.type.python_type)
+            and not isinstance(value, bool)
+            for value, column in zip(cursor, columns)
+        )
+    ):
+        raise ValueError("Invalid cursor")
+
+    load = {getattr(Issue, field) for field in fields} | set(columns)
+    query = Issue.query.filter(Issue.project_id == project_id).options(
+        load_only(*load)
+    )
+    if statuses:
+        query = query.filter(Issue.status.in_(statuses))
+    if title:
+        query = query.filter(Issue.title.icontains(title, autoescape=True))
+    if after is not None:
+        query = query.filter(Issue.id > after)
+    if cursor is not None:
+        query = query.filter(after_key(columns, cursor, descending))
+
+    order = [column.desc() if descending else column for column in columns]
+    issues = query.order_by(*order).limit(limit).all()
+
+    next_cursor = None
+    if len(issues) == limit:
+        last = issues[-1]
+        next_cursor = [getattr(last, column.key) for column in columns]
+    return issues, next_cursor
+
+
+MAX_BULK_OPERATIONS = 1000
+ISSUE_LIMITS = {"title": 100, "status": 20}
+
+
+def _validate_values(values: Dict) -> str | None:
+    for field, value in values.items():
+        if not isinstance(value, str) or not value:
+            return f"{field} must be a non-empty string"
+        if len(value) > ISSUE_LIMITS.get(field, len(value)):
+            return f"{field} is longer than {ISSUE_LIMITS[field]} characters"
+    return None
+
+
+def _is_id(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def apply_bulk_operations(
+    operations: List[Dict], can_delete: bool, atomic: bool = False
+) -> Tuple[List[Dict], bool]:
+    """
+    Apply a batch of issue create/update/delete operations.
+
+    Every kind of operation is executed as one bulk statement in the current
+    transaction, and the audit log, versions and search index are updated
+    with one batch for the whole request. Each issue may be the subject of
+    a single operation per batch. The caller commits.
+
+    Args:
+        operations: Operations such as ``{"op": "create", "title": ...}``,
+            ``{"op": "update", "issue_id": ..., "status": ...}`` or
+            ``{"op": "delete", "issue_id": ...}``.
+        can_delete: Whether the current user may delete issues.
+        atomic: Apply nothing if any operation is invalid.
+
+    Returns:
+        One result per operation, in order, and whether anything was applied.
+    """
+    results: List[Dict] = [{} for _ in operations]
+    creates, updates, deletes = [], [], []
+    seen_issues = set()
+
+    for index, operation in enumerate(operations):
+        kind = operation.get("op") if isinstance(operation, dict) else None
+        results[index] = {"index": index, "op": kind}
+        error = None
+        if kind == "create":
+            values = {
+                field: operation.get(field)
+                for field in ("title", "description", "status")
+            }
+            error = _validate_values(values)
+            project_id = operation.get("project_id")
+            if not _is_id(project_id):
+                error = error or "project_id is required"
+            if not error:
+                creates.append((index, {**values, "project_id": project_id}))
+        elif kind in ("update", "delete"):
+            issue_id = operation.get("issue_id", operation.get("id"))
+            if not _is_id(issue_id):
+                error = "issue_id is required"
+            elif issue_id in seen_issues:
+                # A second operation would act on a stale snapshot of the issue
+                error = "Duplicate issue_id"
+            elif kind == "delete":
+                seen_issues.add(issue_id)
+                if can_delete:
+                    deletes.append((index, issue_id))
+                else:
+                    error = "Permission denied"
+            else:
+                seen_issues.add(issue_id)
+                values = {
+                    field: operation[field]
+                    for field in ("title", "description", "status")
+                    if operation.get(field)
+                }
+                error = _validate_values(values) or (
+                    None if values else "Nothing to update"
+                )
+                if not error:
+                    updates.append((index, issue_id, values))
+        else:
+            error = "Unknown operation"
+        if error:
+            results[index].update(status="error", message=error)
+
+    # Check every referenced project and issue with one query each
+    project_ids = {values["project_id"] for _, values in creates}
+    known_projects = set(
+        db.session.scalars(select(Project.id).where(Project.id.in_(project_ids)))
+    )
+    issue_ids = {issue_id for _, issue_id, _ in updates} | {
+        issue_id for _, issue_id in deletes
+    }
+    known_issues = {
+        row.id: row
+        for row in db.session.execute(
+            select(
+                Issue.id,
+                Issue.title,
+                Issue.description,
+                Issue.status,
+                Issue.project_id,
+                Issue.created_at,
+            ).where(Issue.id.in_(issue_ids))
+        )
+    }
+    for index, values in creates:
+        if values["project_id"] not in known_projects:
+            results[index].update(status="error", message="Project Not Found")
+    for index, issue_id, *_ in updates + deletes:
+        if issue_id not in known_issues:
+            results[index].update(status="error", message="Issue Not Found")
+
+    failed = {result["index"] for result in results if result.get("status") == "error"}
+    if atomic and failed:
+        return results, False
+    creates = [item for item in creates if item[0] not in failed]
+    updates = [item for item in updates if item[0] not in failed]
+    deletes = [item for item in deletes if item[0] not in failed]
+    if not (creates or updates or deletes):
+        return results, False
+
+    # Transient copies of the affected rows describe the changes to the
+    # handlers in app/listeners.py, since bulk statements skip mapper events
+    changes = []
+
+    def copy_issue(issue_id, values, created_at=None):
+        issue = Issue(**values)
+        issue.id = issue_id
+        issue.created_at = created_at
+        return issue
+
+    if creates:
+        new_ids = db.session.scalars(
+            insert(Issue).returning(Issue.id, sort_by_parameter_order=True),
+            [values for _, values in creates],
+        ).all()
+        for (index, values), issue_id in zip(creates, new_ids):
+            results[index].update(status="created", id=issue_id)
+            changes.append(make_change(copy_issue(issue_id, values), "inserte"))
+
+    if updates:
+        db.session.execute(
+            update(Issue),
+            [{"id": issue_id, **values} for _, issue_id, values in updates],
+        )
+        updated_ids = {issue_id for _, issue_id, _ in updates}
+        db.session.execute(
+            update(Issue)
+            .where(Issue.id.in_(updated_ids))
+            .values(version=Issue.version + 1, updated_at=datetime.now())
+            .execution_options(synchronize_session=False)
+        )
+        for index, issue_id, values in updates:
+            row = known_issues[issue_id]._asdict()
+            row.pop("id")
+            created_at = row.pop("created_at")
+            previous = {field: row[field] for field in values}
+            row.update(values)
+            results[index].update(status="updated", id=issue_id)
+            changes.append(
+                make_change(
+                    copy_issue(issue_id, row, created_at), "update", previous
+                )
+            )
+
+    if deletes:
+        deleted_ids = {issue_id for _, issue_id in deletes}
+        # Comments are removed explicitly so the result does not depend on
+        # the database enforcing ON DELETE CASCADE
+        for comment_id, issue_id, user_id, timestamp in db.session.execute(
+            select(
+                Comment.id, Comment.issue_id, Comment.user_id, Comment.timestamp
+            ).where(Comment.issue_id.in_(deleted_ids))
+        ):
+            comment = Comment(content="", user_id=user_id, issue_id=issue_id)
+            comment.id = comment_id
+            comment.timestamp = timestamp
+            changes.append(make_change(comment, "delete"))
+        db.session.execute(
+            delete(Comment)
+            .where(Comment.issue_id.in_(deleted_ids))
+            .execution_options(synchronize_session=False)
+        )
+        db.session.execute(
+            delete(Issue)
+            .where(Issue.id.in_(deleted_ids))
+            .execution_options(synchronize_session=False)
+        )
+        for index, issue_id in deletes:
+            row = known_issues[issue_id]._asdict()
+            row.pop("id")
+            created_at = row.pop("created_at")
+            results[index].update(status="deleted", id=issue_id)
+            changes.append(
+                make_change(copy_issue(issue_id, row, created_at), "delete")
+            )
+
+    handle_changes(db.session.connection(), changes)
+    return results, True
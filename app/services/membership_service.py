@@ -0,0 +1,154 @@
+from flask import current_app
+from sqlalchemy import Select, delete, exists, insert, select, union
+
+from app.cache import TTLCache
+from app.listeners import handle_changes, make_change
+from app.models import Project, Role, User, db, project_members
+from app.services.event_service import ChangeEvent, record_events
+from app.services.user_service import CurrentUser
+from app.services.version_service import bump_versions
+
+DEFAULT_CACHE_TTL = 30
+MAX_CACHE_SIZE = 100000
+
+# (user_id, project_id) -> is member, shared by all requests of the process
+_cache = TTLCache(MAX_CACHE_SIZE)
+
+
+def invalidate_membership(user_id: int | None = None, project_id: int | None = None):
+    """
+    Drop cached memberships of a user, a project, or one user in one project.
+
+    Args:
+        user_id: Id of the user, or None for all users.
+        project_id: Id of the project, or None for all projects.
+    """
+    if user_id is not None and project_id is not None:
+        _cache.pop((user_id, project_id))
+        return
+    _cache.discard(
+        lambda key, _: user_id in (None, key[0]) and project_id in (None, key[1])
+    )
+
+
+def _membership_exists(user_id: int, project_id: int) -> bool:
+    return db.session.execute(
+        select(
+            exists().where(
+                project_members.c.user_id == user_id,
+                project_members.c.project_id == project_id,
+            )
+        )
+    ).scalar()
+
+
+def is_member(user_id: int, project_id: int) -> bool:
+    """
+    Tell whether a user is a member of a project.
+
+    Answered with a single ``EXISTS`` on the primary key of the association
+    table, whatever the number of members, and cached per process for
+    ``MEMBERSHIP_CACHE_TTL`` seconds.
+
+    Args:
+        user_id: Id of the user.
+        project_id: Id of the project.
+    """
+    key = (user_id, project_id)
+    member = _cache.get(key)
+    if member is None:
+        member = _membership_exists(user_id, project_id)
+        ttl = current_app.config.get("MEMBERSHIP_CACHE_TTL", DEFAULT_CACHE_TTL)
+        _cache.set(key, member, ttl)
+    return member
+
+
+def can_access_project(user: CurrentUser, project: Project) -> bool:
+    """Admins, the owner and the members of a project can access it."""
+    return (
+        user.role == Role.ADMIN
+        or project.user_id == user.id
+        or is_member(user.id, project.id)
+    )
+
+
+def accessible_projects(user: CurrentUser) -> Select | None:
+    """
+    Query of the ids of the projects a user can access, for use in ``IN``.
+
+    Args:
+        user: The user.
+
+    Returns:
+        The query, or None for admins, who can access every project.
+    """
+    if user.role == Role.ADMIN:
+        return None
+    return union(
+        select(Project.id).where(Project.user_id == user.id),
+        select(project_members.c.project_id).where(
+            project_members.c.user_id == user.id
+        ),
+    )
+
+
+def add_member(project: Project, user_id: int) -> bool:
+    """
+    Add a user to a project without loading its member list.
+
+    The caller commits, then calls ``invalidate_membership``.
+
+    Args:
+        project: The project.
+        user_id: Id of the user to add.
+
+    Returns:
+        False if the user already was a member.
+    """
+    if _membership_exists(user_id, project.id):
+        return False
+    connection = db.session.connection()
+    connection.execute(
+        insert(project_members), [{"user_id": user_id, "project_id": project.id}]
+    )
+    _membership_changed(connection, project)
+    record_events(connection, [ChangeEvent(project.id, "member", user_id, "created")])
+    return True
+
+
+def remove_member(project: Project, user_id: int) -> bool:
+    """
+    Remove a user from a project without loading its member list.
+
+    The caller commits, then calls ``invalidate_membership``.
+
+    Args:
+        project: The project.
+        user_id: Id of the user to remove.
+
+    Returns:
+        False if the user was not a member.
+    """
+    if not _membership_exists(user_id, project.id):
+        return False
+    connection = db.session.connection()
+    connection.execute(
+        delete(project_members).where(
+            project_members.c.user_id == user_id,
+            project_members.c.project_id == project.id,
+        )
+    )
+    _membership_changed(connection, project)
+    record_events(connection, [ChangeEvent(project.id, "member", user_id, "deleted")])
+    return True
+
+
+def _membership_changed(connection, project: Project) -> None:
+    # The association rows bypass the ORM, so expire the loaded collections
+    # and do what the mapper events would have done
+    db.session.expire(project, ["members"])
+    for user in db.session.identity_map.values():
+        if isinstance(user, User) and "projects" in user.__dict__:
+            db.session.expire(user, ["projects"])
+    bump_versions(connection, project_ids=[project.id])
+    handle_changes(connection, [make_change(project, "update")])
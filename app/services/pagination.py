@@ -0,0 +1,177 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from flask import request
+from sqlalchemy import and_, or_
+
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+
+def get_limit(default: int = DEFAULT_LIMIT, maximum: int = MAX_LIMIT) -> int:
+    """
+    Read the page size from the ``limit`` query parameter.
+
+    Args:
+        default: Page size used when the parameter is missing.
+        maximum: Upper bound applied to whatever the client asked for.
+
+    Returns:
+        The page size, clamped to ``1..maximum``.
+
+    Raises:
+        ValueError: If the parameter is not a positive integer.
+    """
+    limit = request.args.get("limit", type=int)
+    if limit is None:
+        if "limit" in request.args:
+            raise ValueError("limit must be an integer")
+        return default
+    if limit < 1:
+        raise ValueError("limit must be positive")
+    return min(limit, maximum)
+
+
+def get_int(name: str) -> int | None:
+    """
+    Read an optional integer query parameter.
+
+    Args:
+        name: Name of the parameter.
+
+    Returns:
+        The value, or None when the parameter is missing.
+
+    Raises:
+        ValueError: If the parameter is present but not an integer.
+    """
+    value = request.args.get(name, type=int)
+    if value is None and name in request.args:
+        raise ValueError(f"{name} must be an integer")
+    return value
+
+
+def parse_datetime(value: str | None) -> datetime | None:
+    """
+    Parse an ISO 8601 timestamp taken from a query parameter.
+
+    Args:
+        value: Raw query string value, or None.
+
+    Returns:
+        The parsed datetime as naive local time (matching how timestamps are
+        stored), or None when no value was given.
+
+    Raises:
+        ValueError: If the value is not a valid ISO 8601 timestamp.
+    """
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+
+def encode_cursor(values: list) -> str:
+    """
+    Encode the sort key of the last row of a page into an opaque cursor.
+
+    Args:
+        values: JSON-serializable sort key values, e.g. ``[status, id]``.
+
+    Returns:
+        A URL-safe cursor string.
+    """
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def set_next_cursor(response, values: list | None) -> None:
+    """
+    Send the cursor of the next page in the ``X-Next-Cursor`` header.
+
+    Clients pass it back as the ``cursor`` query parameter.
+
+    Args:
+        response: Response of the current page.
+        values: Sort key of the last row of the page, or None on the last
+            page.
+    """
+    if values is not None:
+        response.headers["X-Next-Cursor"] = encode_cursor(values)
+
+
+def decode_cursor(cursor: str | None) -> list | None:
+    """
+    Decode a cursor produced by ``encode_cursor``.
+
+    Args:
+        cursor: Cursor string taken from a query parameter, or None.
+
+    Returns:
+        The list of sort key values, or None when no cursor was given.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def get_fields(allowed: tuple, default: tuple) -> tuple:
+    """
+    Read the ``fields`` query parameter as a comma-separated projection.
+
+    Args:
+        allowed: Field names that may be requested.
+        default: Fields used when the parameter is missing.
+
+    Returns:
+        The requested fields, in the order of ``allowed``.
+
+    Raises:
+        ValueError: If an unknown field is requested, or none at all.
+    """
+    value = request.args.get("fields")
+    if not value:
+        return default
+    requested = {field.strip() for field in value.split(",") if field.strip()}
+    if not requested:
+        raise ValueError("fields must name at least one field")
+    unknown = requested - set(allowed)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return tuple(field for field in allowed if field in requested)
+
+
+def after_key(columns, values, descending: bool = False):
+    """
+    Build the keyset condition selecting the rows that sort after ``values``.
+
+    Args:
+        columns: Sort columns, most significant first.
+        values: Values of the sort columns in the last row of the previous page.
+        descending: Whether the sort order is descending.
+
+    Returns:
+        A SQL condition.
+    """
+    column, value = columns[0], values[0]
+    past = column < value if descending else column > value
+    if len(columns) == 1:
+        return past
+    return or_(
+        past, and_(column == value, after_key(columns[1:], values[1:], descending))
+    )
@@ -0,0 +1,110 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import BoundedSemaphore, Lock
+from typing import Callable, TypeVar
+
+from flask import Flask, current_app
+
+from app.extentions import bcrypt
+
+
+T = TypeVar("T")
+
+
+class PasswordPoolBusy(Exception):
+    """Raised when too many password hashes are already waiting to run."""
+
+
+class PasswordPool:
+    """
+    Bounded thread pool running bcrypt hashing off the request threads.
+
+    bcrypt releases the GIL while hashing, so a few workers keep password
+    checks from running on every request thread at once. At most
+    ``max_pending`` jobs are running or queued; past that, new jobs are
+    rejected right away instead of piling up.
+
+    The executor is created on first use so that it is never shared across
+    a fork of the worker process.
+    """
+
+    def __init__(self, workers: int, max_pending: int) -> None:
+        self.workers = workers
+        self._slots = BoundedSemaphore(max_pending)
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers, thread_name_prefix="bcrypt"
+                    )
+        return self._executor
+
+    def run(self, fn: Callable[..., T], *args) -> T:
+        """
+        Run a function on the pool and wait for its result.
+
+        Raises:
+            PasswordPoolBusy: If the pool is full.
+        """
+        if not self._slots.acquire(blocking=False):
+            raise PasswordPoolBusy()
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future.result()
+
+
+def init_passwords(app: Flask) -> None:
+    """
+    Set up the password hashing pool of the app.
+
+    Args:
+        app: The Flask application.
+    """
+    app.extensions["password_pool"] = PasswordPool(
+        app.config["BCRYPT_WORKERS"], app.config["BCRYPT_MAX_PENDING"]
+    )
+
+
+def _pool() -> PasswordPool:
+    return current_app.extensions["password_pool"]
+
+
+def hash_password(password: str) -> str:
+    """
+    Hash a password with the configured bcrypt cost.
+
+    Raises:
+        PasswordPoolBusy: If the hashing pool is overloaded.
+    """
+    return _pool().run(bcrypt.generate_password_hash, password).decode("utf-8")
+
+
+def verify_password(password_hash: str, password: str) -> bool:
+    """
+    Check a password against a bcrypt hash.
+
+    Raises:
+        PasswordPoolBusy: If the hashing pool is overloaded.
+    """
+    return _pool().run(bcrypt.check_password_hash, password_hash, password)
+
+
+def needs_rehash(password_hash: str) -> bool:
+    """
+    Tell whether a hash was made with a cost other than ``BCRYPT_LOG_ROUNDS``.
+
+    Args:
+        password_hash: A bcrypt hash, e.g. ``$2b$12$...``.
+    """
+    try:
+        rounds = int(password_hash.split("$")[2])
+    except (IndexError, ValueError):
+        return True
+    return rounds != current_app.config["BCRYPT_LOG_ROUNDS"]
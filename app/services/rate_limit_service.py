@@ -0,0 +1,192 @@
+import time
+from abc import ABC, abstractmethod
+from functools import wraps
+from threading import Lock
+from typing import NamedTuple
+
+from flask import Flask, current_app, jsonify, request
+from werkzeug.utils import import_string
+
+from app.cache import TTLCache
+
+
+class RateLimit(NamedTuple):
+    # Bucket size, i.e. how many requests may come in a burst
+    capacity: int
+    # Seconds for an empty bucket to refill completely
+    period: float
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / self.period
+
+
+def parse_limit(value: str) -> RateLimit:
+    """
+    Parse a limit written as ``<requests>/<seconds>``, e.g. ``10/60``.
+
+    Raises:
+        ValueError: If the value is malformed.
+    """
+    try:
+        capacity, period = value.split("/")
+        limit = RateLimit(int(capacity), float(period))
+    except ValueError:
+        raise ValueError(f"Invalid rate limit: {value!r}")
+    if limit.capacity < 1 or limit.period <= 0:
+        raise ValueError(f"Invalid rate limit: {value!r}")
+    return limit
+
+
+class RateLimitBackend(ABC):
+    """
+    Interface of a token bucket store.
+
+    Each key has a bucket of ``limit.capacity`` tokens refilled at
+    ``limit.rate`` tokens per second. The process-local backend below keeps
+    buckets per worker; a backend shared by all workers (e.g. on Redis) only
+    needs to implement these two methods atomically and be named in
+    ``RATE_LIMIT_BACKEND`` by its import path.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def check(self, key: str, limit: RateLimit) -> float:
+        """
+        Tell whether a token is available, without taking it.
+
+        Returns:
+            0 if a token is available, otherwise the seconds until there is.
+        """
+
+    @abstractmethod
+    def take(self, key: str, limit: RateLimit, cost: float = 1) -> float:
+        """
+        Take ``cost`` tokens from the bucket if it has them.
+
+        Returns:
+            0 if the tokens were taken, otherwise the seconds until they can.
+        """
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    name = "memory"
+    # Buckets kept at most
+    MAX_KEYS = 100000
+
+    def __init__(self) -> None:
+        # key -> (tokens, time of the last update), forgotten once the bucket
+        # would be full again
+        self._buckets = TTLCache(self.MAX_KEYS)
+        self._lock = Lock()
+
+    def _tokens(self, key: str, limit: RateLimit, now: float) -> float:
+        tokens, updated = self._buckets.get(key) or (limit.capacity, now)
+        return min(limit.capacity, tokens + (now - updated) * limit.rate)
+
+    def check(self, key, limit):
+        now = time.monotonic()
+        with self._lock:
+            tokens = self._tokens(key, limit, now)
+        return 0 if tokens >= 1 else (1 - tokens) / limit.rate
+
+    def take(self, key, limit, cost=1):
+        now = time.monotonic()
+        with self._lock:
+            tokens = self._tokens(key, limit, now)
+            if tokens < cost:
+                return (cost - tokens) / limit.rate
+            tokens -= cost
+            ttl = (limit.capacity - tokens) / limit.rate
+            self._buckets.set(key, (tokens, now), ttl)
+        return 0
+
+
+BACKENDS = {backend.name: backend for backend in (MemoryRateLimitBackend,)}
+
+
+def init_rate_limits(app: Flask) -> None:
+    """
+    Set up the rate limit backend named by ``RATE_LIMIT_BACKEND``.
+
+    The setting is either a built-in backend name ('memory') or the import
+    path of a ``RateLimitBackend`` subclass, e.g. ``mypackage.limits:Redis``.
+    """
+    name = app.config["RATE_LIMIT_BACKEND"]
+    backend = BACKENDS[name] if name in BACKENDS else import_string(name)
+    app.extensions["rate_limit"] = backend()
+
+
+def get_limit_config(setting: str) -> RateLimit:
+    return parse_limit(current_app.config[setting])
+
+
+def _backend() -> RateLimitBackend | None:
+    if not current_app.config["RATE_LIMIT_ENABLED"]:
+        return None
+    return current_app.extensions["rate_limit"]
+
+
+def client_address() -> str:
+    # Behind a proxy, wrap the app in werkzeug's ProxyFix so this is the
+    # client and not the proxy
+    return request.remote_addr or "unknown"
+
+
+def check_limit(key: str, setting: str) -> float:
+    """
+    Tell whether the bucket of a key has a token left, without taking it.
+
+    Args:
+        key: Bucket key.
+        setting: Config setting holding the limit.
+
+    Returns:
+        0 if allowed, otherwise the seconds to wait.
+    """
+    backend = _backend()
+    return backend.check(key, get_limit_config(setting)) if backend else 0
+
+
+def hit_limit(key: str, setting: str) -> float:
+    """
+    Take a token from the bucket of a key.
+
+    Args:
+        key: Bucket key.
+        setting: Config setting holding the limit.
+
+    Returns:
+        0 if allowed, otherwise the seconds to wait.
+    """
+    backend = _backend()
+    return backend.take(key, get_limit_config(setting)) if backend else 0
+
+
+def too_many_requests(retry_after: float):
+    response = jsonify({"message": "Too many requests, try again later"})
+    response.headers["Retry-After"] = str(max(1, round(retry_after)))
+    return response, 429
+
+
+def limit_by_address(scope: str, setting: str):
+    """
+    Rate limit a route per client address, before it does any work.
+
+    Args:
+        scope: Name of the limited action, part of the bucket key.
+        setting: Config setting holding the limit.
+    """
+
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            retry_after = hit_limit(f"{scope}:ip:{client_address()}", setting)
+            if retry_after:
+                return too_many_requests(retry_after)
+            return f(*args, **kwargs)
+
+        return decorated_function
+
+    return decorator
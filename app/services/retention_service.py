@@ -0,0 +1,102 @@
+import gzip
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, List
+
+from sqlalchemy import delete, func, select
+
+from app.models import Log, db
+from app.services.export_service import LOG_COLUMNS, to_ndjson
+
+DEFAULT_BATCH_SIZE = 5000
+
+
+@dataclass
+class PruneReport:
+    deleted: int = 0
+    archive: str | None = None
+
+
+def archive_path(archive_dir: str) -> str:
+    """Name a new archive file after the time of the run."""
+    return os.path.join(archive_dir, f"log-{datetime.now():%Y%m%dT%H%M%S}.ndjson.gz")
+
+
+def _append_archive(path: str, rows: List[dict]) -> None:
+    # Each batch is a complete gzip member, and concatenated members are a
+    # valid gzip file, so an interrupted run leaves a readable archive
+    data = gzip.compress(b"".join(to_ndjson(rows)))
+    with open(path, "ab") as archive:
+        archive.write(data)
+        archive.flush()
+        os.fsync(archive.fileno())
+
+
+def prune_logs(
+    before: datetime,
+    archive_dir: str | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    progress: Callable[[PruneReport], None] | None = None,
+) -> PruneReport:
+    """
+    Delete the log entries older than a time, archiving them first.
+
+    Entries are read in id order, a batch at a time, and each batch is
+    deleted by primary key in its own short transaction, so locks are held
+    only briefly and writers are never blocked for long. A batch is appended
+    to the archive and synced to disk before it is deleted; a run that is
+    interrupted in between archives that batch again on the next run.
+
+    Args:
+        before: Entries logged before this time are removed.
+        archive_dir: Directory of the gzip-compressed NDJSON archives, or
+            None to delete without archiving.
+        batch_size: Entries archived and deleted per transaction.
+        progress: Called with the report after every batch.
+
+    Returns:
+        The prune report.
+    """
+    report = PruneReport()
+    if archive_dir:
+        os.makedirs(archive_dir, exist_ok=True)
+        report.archive = archive_path(archive_dir)
+
+    # Ids grow with time, so the aged entries sit at the start of the primary
+    # key, below the newest of them found with the timestamp index
+    max_id = db.session.execute(
+        select(func.max(Log.id)).where(Log.timestamp < before)
+    ).scalar()
+    last_id = 0
+    while max_id is not None:
+        rows = [
+            row._asdict()
+            for row in db.session.execute(
+                select(*LOG_COLUMNS)
+                .where(Log.id > last_id, Log.id <= max_id, Log.timestamp < before)
+                .order_by(Log.id)
+                .limit(batch_size)
+            )
+        ]
+        if not rows:
+            break
+        ids = [row["id"] for row in rows]
+        last_id = ids[-1]
+
+        if report.archive:
+            _append_archive(report.archive, rows)
+        db.session.execute(
+            delete(Log)
+            .where(Log.id.in_(ids))
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        report.deleted += len(ids)
+        if progress is not None:
+            progress(report)
+
+    db.session.commit()
+    if report.archive and not report.deleted:
+        report.archive = None
+    return report
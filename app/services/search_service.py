@@ -0,0 +1,402 @@
+from abc import ABC, abstractmethod
+from typing import Iterable, List, NamedTuple
+
+from flask import Flask, current_app, has_app_context
+from sqlalchemy import (
+    Select,
+    column,
+    func,
+    literal,
+    literal_column,
+    select,
+    table,
+    text,
+    union_all,
+)
+
+from app.models import Comment, Issue, db
+
+ENTITY_TYPES = ("issue", "comment")
+
+
+class SearchDocument(NamedTuple):
+    entity_type: str
+    entity_id: int
+    issue_id: int
+    title: str
+    body: str
+
+
+class SearchHit(NamedTuple):
+    entity_type: str
+    entity_id: int
+    issue_id: int
+    project_id: int
+    title: str
+    snippet: str
+    rank: float
+
+
+def document_for(target) -> SearchDocument | None:
+    """
+    Build the search document of an issue or comment from its in-memory state.
+
+    Args:
+        target: An ``Issue`` or ``Comment`` instance.
+
+    Returns:
+        The document, or None for entities that are not searchable.
+    """
+    if isinstance(target, Issue):
+        return SearchDocument(
+            "issue", target.id, target.id, target.title, target.description
+        )
+    if isinstance(target, Comment):
+        return SearchDocument("comment", target.id, target.issue_id, "", target.content)
+    return None
+
+
+def _in_projects(stmt, project_id: int | None, projects: Select | None):
+    """Restrict a search statement joined to ``Issue`` to some projects."""
+    if project_id is not None:
+        stmt = stmt.where(Issue.project_id == project_id)
+    if projects is not None:
+        stmt = stmt.where(Issue.project_id.in_(projects))
+    return stmt
+
+
+class SearchBackend(ABC):
+    """
+    Interface of a search index.
+
+    Backends whose index is maintained by the database itself only need to
+    implement ``search``; the others also keep their index in sync through
+    ``index`` and ``remove``, which are called from the flush hooks in
+    ``app/listeners.py`` on the flush's connection.
+    """
+
+    name = "base"
+    # Whether ``index`` and ``remove`` have to be called on every write
+    needs_sync = False
+
+    def setup(self, connection) -> None:
+        """Create whatever the backend needs in the database, if missing."""
+
+    def index(self, connection, documents: List[SearchDocument]) -> None:
+        """Add or replace the given documents in the index."""
+
+    def remove(self, connection, keys: List[tuple]) -> None:
+        """Remove the ``(entity_type, entity_id)`` documents from the index."""
+
+    def rebuild(self, connection) -> None:
+        """Re-index every issue and comment."""
+
+    def reindex(self, connection, entity_type: str) -> None:
+        """Index every issue or comment."""
+
+    @abstractmethod
+    def search(
+        self,
+        query: str,
+        project_id: int | None,
+        entity_type: str | None,
+        limit: int,
+        offset: int,
+        projects: Select | None = None,
+    ) -> List[SearchHit]:
+        """
+        Find the issues and comments matching a query, best matches first.
+
+        Args:
+            query: Text typed by the user.
+            project_id: Only search this project.
+            entity_type: Only search 'issue' or 'comment' documents.
+            limit: Maximum number of hits.
+            offset: Number of hits to skip.
+            projects: Query of the ids of the projects the caller can see, or
+                None to search every project.
+        """
+
+
+class LikeSearchBackend(SearchBackend):
+    """Fallback scanning the tables with case-insensitive substring matches."""
+
+    name = "like"
+
+    def search(self, query, project_id, entity_type, limit, offset, projects=None):
+        selects = []
+        if entity_type in (None, "issue"):
+            match = Issue.title.icontains(
+                query, autoescape=True
+            ) | Issue.description.icontains(query, autoescape=True)
+            stmt = select(
+                literal("issue").label("entity_type"),
+                Issue.id.label("entity_id"),
+                Issue.id.label("issue_id"),
+                Issue.project_id.label("project_id"),
+                Issue.title.label("title"),
+                func.substr(Issue.description, 1, 200).label("snippet"),
+                literal(0.0).label("rank"),
+            ).where(match)
+            selects.append(_in_projects(stmt, project_id, projects))
+        if entity_type in (None, "comment"):
+            stmt = (
+                select(
+                    literal("comment").label("entity_type"),
+                    Comment.id.label("entity_id"),
+                    Comment.issue_id.label("issue_id"),
+                    Issue.project_id.label("project_id"),
+                    Issue.title.label("title"),
+                    func.substr(Comment.content, 1, 200).label("snippet"),
+                    literal(0.0).label("rank"),
+                )
+                .join(Issue, Issue.id == Comment.issue_id)
+                .where(Comment.content.icontains(query, autoescape=True))
+            )
+            selects.append(_in_projects(stmt, project_id, projects))
+
+        combined = union_all(*selects).subquery()
+        rows = db.session.execute(
+            select(combined)
+            .order_by(combined.c.entity_type.desc(), combined.c.entity_id.desc())
+            .limit(limit)
+            .offset(offset)
+        )
+        return [SearchHit(*row) for row in rows]
+
+
+class PostgresSearchBackend(SearchBackend):
+    """
+    PostgreSQL full-text search.
+
+    Searches the ``to_tsvector`` expressions covered by the GIN indexes
+    declared on ``Issue`` and ``Comment``, so PostgreSQL keeps the index
+    current on every write and nothing needs to be synced by hand.
+    """
+
+    name = "postgresql"
+
+    @staticmethod
+    def _vector(*columns):
+        document = columns[0]
+        for part in columns[1:]:
+            document = document.op("||")(literal_column("' '")).op("||")(part)
+        return func.to_tsvector(literal_column("'english'"), document)
+
+    def search(self, query, project_id, entity_type, limit, offset, projects=None):
+        tsquery = func.websearch_to_tsquery(literal_column("'english'"), query)
+        options = "MaxFragments=1, MaxWords=30, MinWords=10"
+        selects = []
+        if entity_type in (None, "issue"):
+            vector = self._vector(Issue.title, Issue.description)
+            stmt = select(
+                literal("issue").label("entity_type"),
+                Issue.id.label("entity_id"),
+                Issue.id.label("issue_id"),
+                Issue.project_id.label("project_id"),
+                Issue.title.label("title"),
+                func.ts_headline("english", Issue.description, tsquery, options).label(
+                    "snippet"
+                ),
+                func.ts_rank(vector, tsquery).label("rank"),
+            ).where(vector.op("@@")(tsquery))
+            selects.append(_in_projects(stmt, project_id, projects))
+        if entity_type in (None, "comment"):
+            vector = self._vector(Comment.content)
+            stmt = (
+                select(
+                    literal("comment").label("entity_type"),
+                    Comment.id.label("entity_id"),
+                    Comment.issue_id.label("issue_id"),
+                    Issue.project_id.label("project_id"),
+                    Issue.title.label("title"),
+                    func.ts_headline(
+                        "english", Comment.content, tsquery, options
+                    ).label("snippet"),
+                    func.ts_rank(vector, tsquery).label("rank"),
+                )
+                .join(Issue, Issue.id == Comment.issue_id)
+                .where(vector.op("@@")(tsquery))
+            )
+            selects.append(_in_projects(stmt, project_id, projects))
+
+        combined = union_all(*selects).subquery()
+        rows = db.session.execute(
+            select(combined)
+            .order_by(combined.c.rank.desc(), combined.c.entity_id.desc())
+            .limit(limit)
+            .offset(offset)
+        )
+        return [SearchHit(*row) for row in rows]
+
+
+class SqliteSearchBackend(SearchBackend):
+    """
+    SQLite FTS5 search over a ``search_index`` virtual table.
+
+    The rowid of a document is derived from its entity type and id, so
+    documents are replaced and removed by rowid without scanning the index.
+    """
+
+    name = "sqlite"
+    needs_sync = True
+    table = "search_index"
+
+    @staticmethod
+    def _rowid(entity_type: str, entity_id: int) -> int:
+        return entity_id * len(ENTITY_TYPES) + ENTITY_TYPES.index(entity_type)
+
+    @staticmethod
+    def _match_query(query: str) -> str:
+        # Quote every term so user input is never parsed as FTS5 syntax
+        terms = ['"' + term.replace('"', '""') + '"' for term in query.split()]
+        return " ".join(terms)
+
+    def setup(self, connection):
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": self.table},
+        ).first()
+        if exists:
+            return
+        connection.execute(
+            text(
+                f"CREATE VIRTUAL TABLE {self.table} USING fts5("
+                "title, body, entity_type UNINDEXED, entity_id UNINDEXED, "
+                "issue_id UNINDEXED, tokenize = 'porter unicode61')"
+            )
+        )
+        self.rebuild(connection)
+
+    def index(self, connection, documents):
+        if not documents:
+            return
+        rows = [
+            {
+                "rowid": self._rowid(doc.entity_type, doc.entity_id),
+                "title": doc.title,
+                "body": doc.body,
+                "entity_type": doc.entity_type,
+                "entity_id": doc.entity_id,
+                "issue_id": doc.issue_id,
+            }
+            for doc in documents
+        ]
+        connection.execute(
+            text(f"DELETE FROM {self.table} WHERE rowid = :rowid"),
+            [{"rowid": row["rowid"]} for row in rows],
+        )
+        connection.execute(
+            text(
+                f"INSERT INTO {self.table} "
+                "(rowid, title, body, entity_type, entity_id, issue_id) "
+                "VALUES (:rowid, :title, :body, :entity_type, :entity_id, :issue_id)"
+            ),
+            rows,
+        )
+
+    def remove(self, connection, keys):
+        if not keys:
+            return
+        connection.execute(
+            text(f"DELETE FROM {self.table} WHERE rowid = :rowid"),
+            [
+                {"rowid": self._rowid(entity_type, entity_id)}
+                for entity_type, entity_id in keys
+            ],
+        )
+
+    def rebuild(self, connection):
+        connection.execute(text(f"DELETE FROM {self.table}"))
+        for entity_type in ENTITY_TYPES:
+            self.reindex(connection, entity_type)
+
+    def reindex(self, connection, entity_type):
+        if entity_type == "issue":
+            query = select(Issue.id, Issue.id, Issue.title, Issue.description)
+        else:
+            query = select(Comment.id, Comment.issue_id, literal(""), Comment.content)
+        result = connection.execute(query.execution_options(yield_per=1000))
+        for rows in result.partitions():
+            self.index(
+                connection, [SearchDocument(entity_type, *row) for row in rows]
+            )
+
+    def search(self, query, project_id, entity_type, limit, offset, projects=None):
+        match = self._match_query(query)
+        if not match:
+            return []
+        index = table(
+            self.table,
+            column("entity_type"),
+            column("entity_id"),
+            column("issue_id"),
+        )
+        rank = (-func.bm25(literal_column(self.table))).label("rank")
+        stmt = (
+            select(
+                index.c.entity_type,
+                index.c.entity_id,
+                index.c.issue_id,
+                Issue.project_id,
+                Issue.title,
+                func.snippet(literal_column(self.table), 1, "", "", "...", 30),
+                rank,
+            )
+            .join(Issue, Issue.id == index.c.issue_id)
+            .where(literal_column(self.table).op("MATCH")(match))
+        )
+        if entity_type is not None:
+            stmt = stmt.where(index.c.entity_type == entity_type)
+        stmt = _in_projects(stmt, project_id, projects)
+        rows = db.session.execute(
+            stmt.order_by(rank.desc(), index.c.entity_id.desc())
+            .limit(limit)
+            .offset(offset)
+        )
+        return [SearchHit(*row) for row in rows]
+
+
+def init_search(app: Flask) -> None:
+    """
+    Pick the search backend for the app's database.
+
+    The backend follows the database dialect unless ``SEARCH_BACKEND`` is set
+    to 'postgresql', 'sqlite' or 'like'. Nothing is read from the database
+    here; the index itself is created by the migrations, or by
+    ``SearchBackend.setup`` when ``DB_AUTO_CREATE`` creates the schema at
+    startup.
+    """
+    backends = {
+        backend.name: backend
+        for backend in (PostgresSearchBackend, SqliteSearchBackend, LikeSearchBackend)
+    }
+    with app.app_context():
+        name = app.config.get("SEARCH_BACKEND") or db.engine.dialect.name
+    app.extensions["search"] = backends.get(name, LikeSearchBackend)()
+
+
+def get_search_backend() -> SearchBackend | None:
+    if not has_app_context():
+        return None
+    return current_app.extensions.get("search")
+
+
+def sync_search_index(connection, targets: Iterable, deleted: Iterable) -> None:
+    """
+    Apply the issue and comment changes of a flush to the search index.
+
+    Args:
+        connection: Connection of the flush.
+        targets: Inserted or updated entities.
+        deleted: Deleted entities.
+    """
+    backend = get_search_backend()
+    if backend is None or not backend.needs_sync:
+        return
+    documents = [doc for doc in map(document_for, targets) if doc]
+    keys = [
+        (doc.entity_type, doc.entity_id) for doc in map(document_for, deleted) if doc
+    ]
+    backend.index(connection, documents)
+    backend.remove(connection, keys)
@@ -0,0 +1,336 @@
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import delete, func, insert, select, true, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.models import (
+    Comment,
+    Issue,
+    Project,
+    ProjectCommenterStats,
+    ProjectDailyStats,
+    ProjectStatusStats,
+    User,
+    db,
+)
+
+STATS_MODELS = (ProjectStatusStats, ProjectDailyStats, ProjectCommenterStats)
+
+# Dialects with INSERT ... ON CONFLICT DO UPDATE; the others update the
+# existing rows first and insert the missing ones
+UPSERTS = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}
+
+
+class StatsDelta:
+    """
+    Changes to the statistics counters of a batch of changes, summed per row.
+
+    Keys are the primary keys of the statistics rows; values are the amounts
+    to add to their counters.
+    """
+
+    def __init__(self) -> None:
+        self.statuses: Counter = Counter()
+        self.days: Dict[Tuple[int, date], Counter] = {}
+        self.commenters: Counter = Counter()
+
+    def add_issue(self, project_id: int, status: str, day: date, count: int = 1):
+        self.statuses[(project_id, status)] += count
+        self.days.setdefault((project_id, day), Counter())["issues"] += count
+
+    def add_comment(self, project_id: int, user_id: int, day: date, count: int = 1):
+        self.commenters[(project_id, user_id)] += count
+        self.days.setdefault((project_id, day), Counter())["comments"] += count
+
+    def drop_projects(self, project_ids: Iterable[int]) -> None:
+        """Forget the counters of projects whose rows are deleted anyway."""
+        project_ids = set(project_ids)
+        for counters in (self.statuses, self.days, self.commenters):
+            for key in [key for key in counters if key[0] in project_ids]:
+                del counters[key]
+
+
+def _day(value: datetime | None) -> date:
+    # Copies made for bulk inserts have no timestamp yet; it defaults to now
+    return (value or datetime.now()).date()
+
+
+def _upsert(connection, model, rows: List[Dict], counters: Tuple[str, ...]):
+    """
+    Add amounts to counters, creating the rows that do not exist yet.
+
+    Rows are written in primary key order so that concurrent transactions
+    lock them in the same order.
+    """
+    if not rows:
+        return
+    keys = [column.name for column in model.__table__.primary_key]
+    rows.sort(key=lambda row: tuple(row[key] for key in keys))
+    upsert = UPSERTS.get(connection.dialect.name)
+    if upsert is None:
+        _update_or_insert(connection, model, rows, keys, counters)
+        return
+    statement = upsert(model)
+    statement = statement.on_conflict_do_update(
+        index_elements=keys,
+        set_={
+            counter: getattr(model, counter) + statement.excluded[counter]
+            for counter in counters
+        },
+    )
+    connection.execute(statement, rows)
+
+
+def _update_or_insert(connection, model, rows, keys, counters) -> None:
+    # A concurrent transaction inserting the same new row makes one of them
+    # fail on the primary key, like any other conflicting write
+    table = model.__table__
+    missing = []
+    for row in rows:
+        result = connection.execute(
+            update(table)
+            .where(*(table.c[key] == row[key] for key in keys))
+            .values({counter: table.c[counter] + row[counter] for counter in counters})
+        )
+        if result.rowcount == 0:
+            missing.append(row)
+    if missing:
+        connection.execute(insert(table), missing)
+
+
+def apply_delta(connection, delta: StatsDelta) -> None:
+    _upsert(
+        connection,
+        ProjectStatusStats,
+        [
+            {"project_id": project_id, "status": status, "issues": amount}
+            for (project_id, status), amount in delta.statuses.items()
+            if amount
+        ],
+        ("issues",),
+    )
+    _upsert(
+        connection,
+        ProjectDailyStats,
+        [
+            {
+                "project_id": project_id,
+                "day": day,
+                "issues": counters["issues"],
+                "comments": counters["comments"],
+            }
+            for (project_id, day), counters in delta.days.items()
+            if any(counters.values())
+        ],
+        ("issues", "comments"),
+    )
+    _upsert(
+        connection,
+        ProjectCommenterStats,
+        [
+            {"project_id": project_id, "user_id": user_id, "comments": amount}
+            for (project_id, user_id), amount in delta.commenters.items()
+            if amount
+        ],
+        ("comments",),
+    )
+
+
+def delete_project_stats(connection, project_ids: Iterable[int]) -> None:
+    project_ids = list(project_ids)
+    if not project_ids:
+        return
+    for model in STATS_MODELS:
+        connection.execute(delete(model).where(model.project_id.in_(project_ids)))
+
+
+def update_stats(connection, changes) -> None:
+    """
+    Update the project statistics from a batch of changes.
+
+    Every change only adds to or subtracts from a few counters, so the cost
+    is independent of the size of the project. Status changes rely on the
+    ``previous`` values of the changes.
+
+    Args:
+        connection: Connection of the transaction making the changes.
+        changes: The ``Change`` tuples of the batch.
+    """
+    delta = StatsDelta()
+    deleted_projects = set()
+    # Project of the issues of the batch, which may be gone from the database
+    issue_projects: Dict[int, int] = {}
+    comments = []
+    for change in changes:
+        target, action = change.target, change.action_type
+        if isinstance(target, Project):
+            if action == "delete":
+                deleted_projects.add(target.id)
+        elif isinstance(target, Issue):
+            issue_projects[target.id] = target.project_id
+            if action == "inserte":
+                delta.add_issue(
+                    target.project_id, target.status, _day(target.created_at)
+                )
+            elif action == "delete":
+                delta.add_issue(
+                    target.project_id, target.status, _day(target.created_at), -1
+                )
+            elif "status" in (change.previous or {}):
+                delta.statuses[(target.project_id, change.previous["status"])] -= 1
+                delta.statuses[(target.project_id, target.status)] += 1
+        elif isinstance(target, Comment) and action != "update":
+            comments.append((target, 1 if action == "inserte" else -1))
+
+    unknown = {target.issue_id for target, _ in comments} - set(issue_projects)
+    if unknown:
+        issue_projects.update(
+            connection.execute(
+                select(Issue.id, Issue.project_id).where(Issue.id.in_(unknown))
+            ).all()
+        )
+    for target, sign in comments:
+        project_id = issue_projects.get(target.issue_id)
+        if project_id is not None:
+            delta.add_comment(project_id, target.user_id, _day(target.timestamp), sign)
+
+    delta.drop_projects(deleted_projects)
+    apply_delta(connection, delta)
+    delete_project_stats(connection, deleted_projects)
+
+
+def _count_issues(connection, delta: StatsDelta, condition) -> None:
+    day = func.date(Issue.created_at)
+    rows = connection.execute(
+        select(Issue.project_id, Issue.status, day, func.count())
+        .where(condition)
+        .group_by(Issue.project_id, Issue.status, day)
+    )
+    for project_id, status, issue_day, count in rows:
+        delta.add_issue(project_id, status, _as_date(issue_day), count)
+
+
+def _count_comments(connection, delta: StatsDelta, condition) -> None:
+    day = func.date(Comment.timestamp)
+    rows = connection.execute(
+        select(Issue.project_id, Comment.user_id, day, func.count())
+        .join(Issue, Comment.issue_id == Issue.id)
+        .where(condition)
+        .group_by(Issue.project_id, Comment.user_id, day)
+    )
+    for project_id, user_id, comment_day, count in rows:
+        delta.add_comment(project_id, user_id, _as_date(comment_day), count)
+
+
+def _as_date(value) -> date:
+    # SQLite returns date() as text
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+def add_inserted_stats(connection, kind: str, ids: List[int]) -> None:
+    """
+    Add bulk inserted rows to the project statistics.
+
+    The new rows are counted with grouped queries instead of one change each.
+
+    Args:
+        connection: Connection of the transaction that inserted the rows.
+        kind: 'issues' or 'comments'.
+        ids: Ids of the inserted rows.
+    """
+    delta = StatsDelta()
+    if kind == "issues":
+        _count_issues(connection, delta, Issue.id.in_(ids))
+    else:
+        _count_comments(connection, delta, Comment.id.in_(ids))
+    apply_delta(connection, delta)
+
+
+def rebuild_stats(connection, project_id: int | None = None) -> None:
+    """
+    Recompute the project statistics from the issues and comments.
+
+    Args:
+        connection: Connection to write with, in the caller's transaction.
+        project_id: Only rebuild this project, otherwise all of them.
+    """
+    if project_id is None:
+        for model in STATS_MODELS:
+            connection.execute(delete(model))
+        condition = true()
+    else:
+        delete_project_stats(connection, [project_id])
+        condition = Issue.project_id == project_id
+
+    delta = StatsDelta()
+    _count_issues(connection, delta, condition)
+    _count_comments(connection, delta, condition)
+    apply_delta(connection, delta)
+
+
+def get_project_stats(project_id: int, days: int, top: int) -> Dict:
+    """
+    Read the statistics of a project from the summary tables.
+
+    Args:
+        project_id: Id of the project.
+        days: Number of days of daily counts to return, up to today.
+        top: Number of top commenters to return.
+
+    Returns:
+        Issue counts by status, daily issue and comment counts (days without
+        any are left out) and the users with the most comments.
+    """
+    statuses = db.session.execute(
+        select(ProjectStatusStats.status, ProjectStatusStats.issues).where(
+            ProjectStatusStats.project_id == project_id, ProjectStatusStats.issues > 0
+        )
+    ).all()
+    daily = db.session.execute(
+        select(
+            ProjectDailyStats.day, ProjectDailyStats.issues, ProjectDailyStats.comments
+        )
+        .where(
+            ProjectDailyStats.project_id == project_id,
+            ProjectDailyStats.day > date.today() - timedelta(days=days),
+        )
+        .order_by(ProjectDailyStats.day)
+    ).all()
+    commenters = db.session.execute(
+        select(User.id, User.name, ProjectCommenterStats.comments)
+        .join(User, User.id == ProjectCommenterStats.user_id)
+        .where(
+            ProjectCommenterStats.project_id == project_id,
+            ProjectCommenterStats.comments > 0,
+        )
+        .order_by(ProjectCommenterStats.comments.desc(), User.id)
+        .limit(top)
+    ).all()
+
+    issues_by_status = dict(statuses)
+    return {
+        "project_id": project_id,
+        "issues": sum(issues_by_status.values()),
+        "issues_by_status": issues_by_status,
+        "comments": db.session.execute(
+            select(func.coalesce(func.sum(ProjectCommenterStats.comments), 0)).where(
+                ProjectCommenterStats.project_id == project_id
+            )
+        ).scalar(),
+        "daily": [
+            {
+                "day": day.isoformat(),
+                "issues": issues,
+                "comments": comments,
+            }
+            for day, issues, comments in daily
+            if issues or comments
+        ],
+        "top_commenters": [
+            {"user_id": user_id, "name": name, "comments": comments}
+            for user_id, name, comments in commenters
+        ],
+    }
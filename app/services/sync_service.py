@@ -0,0 +1,151 @@
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+from flask import current_app
+from sqlalchemy import and_, or_, select, true
+
+from app.models import ChangeLog, Comment, Issue, Project, db
+from app.serializers import (
+    serialize_all,
+    serialize_comment,
+    serialize_issue,
+    serialize_project_info,
+)
+from app.services.membership_service import accessible_projects
+from app.services.user_service import CurrentUser
+
+
+def _settled_before() -> datetime:
+    # Ids are taken when a change is flushed but only become visible when it
+    # commits, so a younger row may still be preceded by an uncommitted one
+    return datetime.now() - timedelta(seconds=current_app.config["SYNC_SETTLE_SECONDS"])
+
+
+def current_sync_cursor() -> int:
+    """
+    Get the position to start syncing from, before a full download.
+
+    Returns:
+        The id of the latest change old enough to be settled, or 0.
+    """
+    return (
+        db.session.execute(
+            select(ChangeLog.id)
+            .where(ChangeLog.timestamp <= _settled_before())
+            .order_by(ChangeLog.id.desc())
+            .limit(1)
+        ).scalar()
+        or 0
+    )
+
+
+def _visible_changes(user: CurrentUser):
+    """Condition on the change log rows a user may see."""
+    projects = accessible_projects(user)
+    if projects is None:
+        return true()
+    return or_(
+        ChangeLog.project_id.in_(projects),
+        # Removal from a project, which takes it out of the user's projects
+        and_(ChangeLog.entity_type == "member", ChangeLog.entity_id == user.id),
+        # Deleted projects have no owner or members left
+        and_(ChangeLog.entity_type == "project", ChangeLog.action == "deleted"),
+    )
+
+
+def sync_changes(user: CurrentUser, since: int, limit: int) -> Dict:
+    """
+    Get what changed in a user's projects after a position in the change log.
+
+    Changes are read in log order with a single range scan and collapsed to
+    the latest one per entity. Entities that still exist are returned in
+    their current state; the others are listed as deleted. The returned
+    cursor never moves past changes younger than ``SYNC_SETTLE_SECONDS``, so
+    those are sent again by the next sync rather than risk skipping a slower
+    transaction; applying a change twice is harmless.
+
+    Args:
+        user: The user syncing.
+        since: Id of the last change seen by the client.
+        limit: Maximum number of change log rows to read.
+
+    Returns:
+        The changed ``projects``, ``issues`` and ``comments``, the ``members``
+        changes, the ids of ``deleted`` entities, the ``cursor`` to pass back
+        and whether there are ``has_more`` changes to fetch right away.
+    """
+    rows = db.session.execute(
+        select(
+            ChangeLog.id,
+            ChangeLog.project_id,
+            ChangeLog.entity_type,
+            ChangeLog.entity_id,
+            ChangeLog.action,
+            ChangeLog.timestamp,
+        )
+        .where(ChangeLog.id > since, _visible_changes(user))
+        .order_by(ChangeLog.id)
+        .limit(limit + 1)
+    ).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    settled = _settled_before()
+    cursor = since
+    for row in rows:
+        if row.timestamp > settled:
+            break
+        cursor = row.id
+    # Everything left is too young to move past; wait for it to settle
+    has_more = has_more and cursor != since
+
+    latest: Dict[Tuple, str] = {}
+    members: Dict[Tuple[int, int], str] = {}
+    for row in rows:
+        if row.entity_type == "member":
+            members[(row.project_id, row.entity_id)] = row.action
+        else:
+            latest[(row.entity_type, row.entity_id)] = row.action
+
+    changed: Dict[str, List[int]] = {"project": [], "issue": [], "comment": []}
+    for (entity_type, entity_id), action in latest.items():
+        if action != "deleted":
+            changed[entity_type].append(entity_id)
+    projects = (
+        Project.query.filter(Project.id.in_(changed["project"])).all()
+        if changed["project"]
+        else []
+    )
+    issues = (
+        Issue.query.filter(Issue.id.in_(changed["issue"])).all()
+        if changed["issue"]
+        else []
+    )
+    comments = (
+        Comment.query.filter(Comment.id.in_(changed["comment"])).all()
+        if changed["comment"]
+        else []
+    )
+
+    found = {
+        "project": {project.id for project in projects},
+        "issue": {issue.id for issue in issues},
+        "comment": {comment.id for comment in comments},
+    }
+    deleted: Dict[str, List[int]] = {"projects": [], "issues": [], "comments": []}
+    for entity_type, entity_id in latest:
+        if entity_id not in found[entity_type]:
+            deleted[f"{entity_type}s"].append(entity_id)
+
+    return {
+        "cursor": cursor,
+        "has_more": has_more,
+        "projects": serialize_all(serialize_project_info, projects),
+        "issues": serialize_all(serialize_issue, issues),
+        "comments": serialize_all(serialize_comment, comments),
+        "members": [
+            {"project_id": project_id, "user_id": user_id, "action": action}
+            for (project_id, user_id), action in members.items()
+        ],
+        "deleted": deleted,
+    }
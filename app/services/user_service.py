@@ -0,0 +1,203 @@
+from typing import Dict, NamedTuple
+
+from flask import current_app, g, has_request_context
+from flask_jwt_extended import (
+    create_access_token,
+    create_refresh_token,
+    get_jwt,
+    get_jwt_identity,
+)
+from sqlalchemy import select
+
+from app.cache import TTLCache
+from app.extentions import jwt
+from app.models import User, db
+
+
+DEFAULT_CACHE_TTL = 30
+MAX_CACHE_SIZE = 10000
+
+
+class CurrentUser(NamedTuple):
+    id: int
+    username: str
+    role: str
+
+
+# username -> CurrentUser, shared by all requests of the process
+_cache = TTLCache(MAX_CACHE_SIZE)
+# user id -> role version
+_role_versions = TTLCache(MAX_CACHE_SIZE)
+
+
+def current_username():
+    """
+    Get the username from the JWT of the current request, if any.
+
+    Returns:
+        The username, or None outside an authenticated request.
+    """
+    if not has_request_context():
+        return None
+    try:
+        identity = get_jwt_identity()
+    except RuntimeError:
+        return None
+    if not identity:
+        return None
+    return identity.get("username")
+
+
+def current_claims() -> Dict:
+    """
+    Get the claims of the JWT of the current request, if any.
+
+    Returns:
+        The decoded token, or an empty dict outside an authenticated request.
+    """
+    if not has_request_context():
+        return {}
+    try:
+        return get_jwt()
+    except RuntimeError:
+        return {}
+
+
+def _cache_ttl() -> float:
+    return current_app.config.get("CURRENT_USER_CACHE_TTL", DEFAULT_CACHE_TTL)
+
+
+def get_current_identity() -> CurrentUser | None:
+    """
+    Resolve the id, username and role of the user making the request.
+
+    Tokens issued by ``access_token_for`` carry the id and role as claims,
+    which are trusted as long as their role version is current (see
+    ``token_revoked``). Older tokens are resolved by username, through a
+    short-lived process-wide cache. Either way the result is kept on
+    ``flask.g`` for the rest of the request.
+
+    Returns:
+        The current user, or None if the request is not authenticated or the
+        user no longer exists.
+    """
+    if "current_identity" in g:
+        return g.current_identity
+
+    username = current_username()
+    claims = current_claims()
+    user = None
+    if username and "uid" in claims and "role" in claims:
+        user = CurrentUser(claims["uid"], username, claims["role"])
+    elif username:
+        user = _cache.get(username)
+        if user is None:
+            row = db.session.execute(
+                select(User.id, User.username, User.role).where(
+                    User.username == username
+                )
+            ).first()
+            if row:
+                user = CurrentUser(*row)
+                _cache.set(username, user, _cache_ttl())
+
+    g.current_identity = user
+    return user
+
+
+def invalidate_user(username: str | None = None, user_id: int | None = None) -> None:
+    """
+    Drop a user from the cache, e.g. after a role change or deletion.
+
+    Args:
+        username: Username of the user to forget.
+        user_id: Id of the user to forget, when the username is not at hand.
+    """
+    if username is not None:
+        _cache.pop(username)
+    if user_id is not None:
+        _cache.discard(lambda _, user: user.id == user_id)
+        _role_versions.pop(user_id)
+
+    if has_request_context():
+        identity = g.get("current_identity")
+        if identity and (identity.username == username or identity.id == user_id):
+            g.pop("current_identity", None)
+
+
+def get_role_version(user_id: int) -> int | None:
+    """
+    Look up the role version of a user, through the process-wide cache.
+
+    Args:
+        user_id: Id of the user.
+
+    Returns:
+        The role version, or None if the user does not exist.
+    """
+    version = _role_versions.get(user_id)
+    if version is None:
+        version = db.session.execute(
+            select(User.role_version).where(User.id == user_id)
+        ).scalar()
+        if version is not None:
+            _role_versions.set(user_id, version, _cache_ttl())
+    return version
+
+
+def access_token_for(user: User) -> str:
+    """
+    Create an access token carrying the user's id, role and role version.
+
+    Args:
+        user: The user to log in.
+
+    Returns:
+        The encoded token.
+    """
+    return create_access_token(
+        identity={"username": user.username},
+        additional_claims={
+            "uid": user.id,
+            "role": user.role,
+            "role_version": user.role_version,
+        },
+    )
+
+
+def refresh_token_for(user: User) -> str:
+    """
+    Create a long-lived refresh token, exchanged for new access tokens.
+
+    Args:
+        user: The user to log in.
+
+    Returns:
+        The encoded token.
+    """
+    return create_refresh_token(
+        identity={"username": user.username}, additional_claims={"uid": user.id}
+    )
+
+
+@jwt.token_in_blocklist_loader
+def token_revoked(jwt_header: Dict, jwt_payload: Dict) -> bool:
+    """
+    Reject tokens of deleted users and access tokens issued before a role
+    change.
+
+    Every role change bumps ``User.role_version``, so an access token whose
+    claims no longer match has to be replaced through the refresh endpoint.
+    The check goes through the process-wide cache; other workers notice a
+    change within ``CURRENT_USER_CACHE_TTL`` seconds.
+    """
+    user_id = jwt_payload.get("uid")
+    if user_id is None:
+        # Issued before role claims existed; resolved by username instead
+        return False
+    version = get_role_version(user_id)
+    if version is None:
+        return True
+    return jwt_payload["type"] == "access" and jwt_payload.get(
+        "role_version"
+    ) != version
@@ -0,0 +1,136 @@
+from datetime import datetime
+from typing import Iterable, NamedTuple, Set
+
+from sqlalchemy import inspect, or_, select, update
+
+from app.models import Comment, Issue, Project, User, db, project_members
+
+
+class Version(NamedTuple):
+    version: int
+    updated_at: datetime
+
+
+def bump_version(target) -> None:
+    """
+    Bump the version of a project or issue that is about to be updated.
+
+    The increment is done in SQL so concurrent bumps are never lost.
+
+    Args:
+        target: The ``Project`` or ``Issue`` being flushed.
+    """
+    model = type(target)
+    target.version = model.version + 1
+    target.updated_at = datetime.now()
+
+
+def bump_parent_versions(connection, targets: Iterable) -> None:
+    """
+    Bump the versions of the issues and projects affected by a flush.
+
+    Issue changes bump their project, comment changes bump their issue and its
+    project, and member name or role changes bump the projects showing them.
+    All bumps are done with at most two UPDATE statements.
+
+    Args:
+        connection: Connection of the flush.
+        targets: Inserted, updated or deleted entities.
+    """
+    project_ids: Set[int] = set()
+    issue_ids: Set[int] = set()
+    user_ids: Set[int] = set()
+    for target in targets:
+        if isinstance(target, Issue):
+            project_ids.add(target.project_id)
+        elif isinstance(target, Comment):
+            issue_ids.add(target.issue_id)
+        elif isinstance(target, User):
+            state = inspect(target)
+            if any(state.attrs[key].history.has_changes() for key in ("name", "role")):
+                user_ids.add(target.id)
+
+    now = datetime.now()
+    if issue_ids:
+        connection.execute(
+            update(Issue)
+            .where(Issue.id.in_(issue_ids))
+            .values(version=Issue.version + 1, updated_at=now)
+        )
+
+    conditions = []
+    if project_ids:
+        conditions.append(Project.id.in_(project_ids))
+    if issue_ids:
+        conditions.append(
+            Project.id.in_(select(Issue.project_id).where(Issue.id.in_(issue_ids)))
+        )
+    if user_ids:
+        conditions.append(
+            Project.id.in_(
+                select(project_members.c.project_id).where(
+                    project_members.c.user_id.in_(user_ids)
+                )
+            )
+        )
+    if conditions:
+        connection.execute(
+            update(Project)
+            .where(or_(*conditions))
+            .values(version=Project.version + 1, updated_at=now)
+        )
+
+
+def bump_versions(
+    connection, project_ids: Iterable[int] = (), issue_ids: Iterable[int] = ()
+) -> None:
+    """
+    Bump the versions of the given projects and issues directly.
+
+    Used after writes that bypass the ORM entirely, such as imports.
+
+    Args:
+        connection: Connection of the transaction making the changes.
+        project_ids: Ids of the projects to bump.
+        issue_ids: Ids of the issues to bump.
+    """
+    now = datetime.now()
+    for model, ids in ((Project, set(project_ids)), (Issue, set(issue_ids))):
+        if ids:
+            connection.execute(
+                update(model)
+                .where(model.id.in_(ids))
+                .values(version=model.version + 1, updated_at=now)
+            )
+
+
+def get_project_version(project_id: int) -> Version | None:
+    """
+    Look up the version of a project without loading it.
+
+    Args:
+        project_id: Id of the project.
+
+    Returns:
+        The version, or None if the project does not exist.
+    """
+    row = db.session.execute(
+        select(Project.version, Project.updated_at).where(Project.id == project_id)
+    ).first()
+    return Version(*row) if row else None
+
+
+def get_issue_version(issue_id: int) -> Version | None:
+    """
+    Look up the version of an issue without loading it.
+
+    Args:
+        issue_id: Id of the issue.
+
+    Returns:
+        The version, or None if the issue does not exist.
+    """
+    row = db.session.execute(
+        select(Issue.version, Issue.updated_at).where(Issue.id == issue_id)
+    ).first()
+    return Version(*row) if row else None
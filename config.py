@@ -0,0 +1,163 @@
+import os
+from datetime import timedelta
+from typing import Dict
+
+from dotenv import load_dotenv
+from sqlalchemy.pool import NullPool
+
+load_dotenv()
+
+
+def env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return int(value)
+
+
+class Config:
+    SECRET_KEY = os.getenv("SECRET_KEY")
+    SQLALCHEMY_DATABASE_URI = os.getenv("SQLALCHEMY_DATABASE_URI")
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
+    # Access tokens carry the user's role, so they are kept short-lived and
+    # renewed with a refresh token from /api/refresh
+    JWT_ACCESS_TOKEN_EXPIRES = timedelta(
+        minutes=env_int("JWT_ACCESS_TOKEN_MINUTES", 15)
+    )
+    JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=env_int("JWT_REFRESH_TOKEN_DAYS", 30))
+
+    # Seconds a resolved current user is reused across requests
+    CURRENT_USER_CACHE_TTL = env_int("CURRENT_USER_CACHE_TTL", 30)
+    # JSON provider name ('orjson' or 'default'), defaults to orjson when
+    # it is installed
+    JSON_PROVIDER = os.getenv("JSON_PROVIDER")
+    # Seconds a project membership check is reused across requests
+    MEMBERSHIP_CACHE_TTL = env_int("MEMBERSHIP_CACHE_TTL", 30)
+    # Search backend name, defaults to the database dialect
+    SEARCH_BACKEND = os.getenv("SEARCH_BACKEND")
+
+    # Seconds a change may take to commit; /api/sync cursors stay behind
+    # younger changes so that slower transactions are not skipped
+    SYNC_SETTLE_SECONDS = env_int("SYNC_SETTLE_SECONDS", 10)
+
+    # Audit log retention, see `flask logs prune`: entries older than
+    # LOG_RETENTION_DAYS are archived to LOG_ARCHIVE_DIR (nowhere if empty)
+    # and deleted, LOG_RETENTION_BATCH_SIZE at a time
+    LOG_RETENTION_DAYS = env_int("LOG_RETENTION_DAYS", 365)
+    LOG_ARCHIVE_DIR = os.getenv("LOG_ARCHIVE_DIR", "log_archive")
+    LOG_RETENTION_BATCH_SIZE = env_int("LOG_RETENTION_BATCH_SIZE", 5000)
+
+    # Change event streams: 'local' delivers events within each worker,
+    # 'postgresql' shares them between workers with LISTEN/NOTIFY
+    EVENT_BROKER = os.getenv("EVENT_BROKER", "local")
+    # Seconds between keepalive comments on idle streams
+    EVENTS_HEARTBEAT = env_int("EVENTS_HEARTBEAT", 15)
+    # Events buffered per stream before a slow client is told to resync
+    EVENTS_QUEUE_SIZE = env_int("EVENTS_QUEUE_SIZE", 100)
+
+    # Response compression: bodies smaller than COMPRESS_MIN_SIZE bytes are
+    # sent as is, compressed bodies are cached up to COMPRESS_CACHE_MAX_BYTES
+    COMPRESS_ENABLED = env_bool("COMPRESS_ENABLED", True)
+    COMPRESS_MIN_SIZE = env_int("COMPRESS_MIN_SIZE", 1024)
+    COMPRESS_LEVEL = env_int("COMPRESS_LEVEL", 6)
+    COMPRESS_BROTLI_QUALITY = env_int("COMPRESS_BROTLI_QUALITY", 5)
+    COMPRESS_CACHE_MAX_BYTES = env_int("COMPRESS_CACHE_MAX_BYTES", 32 * 1024 * 1024)
+    COMPRESS_MIMETYPES = ("application/json", "text/csv", "text/plain", "text/html")
+
+    # bcrypt cost factor; existing hashes are upgraded on the next login
+    BCRYPT_LOG_ROUNDS = env_int("BCRYPT_LOG_ROUNDS", 12)
+    # Threads hashing passwords, and how many hashes may be running or
+    # waiting before requests are turned away with a 503
+    BCRYPT_WORKERS = env_int("BCRYPT_WORKERS", 2)
+    BCRYPT_MAX_PENDING = env_int("BCRYPT_MAX_PENDING", 16)
+
+    # Rate limits as '<requests>/<seconds>' token buckets: logins and
+    # registrations per client address, failed logins per username
+    RATE_LIMIT_ENABLED = env_bool("RATE_LIMIT_ENABLED", True)
+    RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+    RATE_LIMIT_LOGIN = os.getenv("RATE_LIMIT_LOGIN", "30/60")
+    RATE_LIMIT_LOGIN_FAILURES = os.getenv("RATE_LIMIT_LOGIN_FAILURES", "5/300")
+    RATE_LIMIT_REGISTER = os.getenv("RATE_LIMIT_REGISTER", "10/3600")
+
+    # Connection pool, per worker process
+    DB_POOL_SIZE = env_int("DB_POOL_SIZE", 5)
+    DB_MAX_OVERFLOW = env_int("DB_MAX_OVERFLOW", 10)
+    DB_POOL_TIMEOUT = env_int("DB_POOL_TIMEOUT", 30)
+    DB_POOL_RECYCLE = env_int("DB_POOL_RECYCLE", 1800)
+    DB_POOL_PRE_PING = env_bool("DB_POOL_PRE_PING", True)
+    # Behind PgBouncer in transaction mode: no client-side pooling and no
+    # server-side prepared statements
+    DB_PGBOUNCER = env_bool("DB_PGBOUNCER", False)
+    # Default statement timeout for PostgreSQL in milliseconds, 0 to disable
+    DB_STATEMENT_TIMEOUT_MS = env_int("DB_STATEMENT_TIMEOUT_MS", 0)
+    # Create missing tables at startup instead of running `flask db upgrade`;
+    # only meant for throwaway databases
+    DB_AUTO_CREATE = env_bool("DB_AUTO_CREATE", False)
+
+    @property
+    def SQLALCHEMY_ENGINE_OPTIONS(self) -> Dict:
+        uri = self.SQLALCHEMY_DATABASE_URI or ""
+        if uri.startswith("sqlite"):
+            return {}
+        if self.DB_PGBOUNCER:
+            options = {"poolclass": NullPool}
+            if uri.startswith("postgresql+psycopg:"):
+                options["connect_args"] = {"prepare_threshold": None}
+            return options
+        return {
+            "pool_size": self.DB_POOL_SIZE,
+            "max_overflow": self.DB_MAX_OVERFLOW,
+            "pool_timeout": self.DB_POOL_TIMEOUT,
+            "pool_recycle": self.DB_POOL_RECYCLE,
+            "pool_pre_ping": self.DB_POOL_PRE_PING,
+        }
+
+
+class DevelopmentConfig(Config):
+    DEBUG = True
+
+
+class TestingConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = os.getenv("TEST_DATABASE_URI", "sqlite://")
+    CURRENT_USER_CACHE_TTL = 0
+    MEMBERSHIP_CACHE_TTL = 0
+    DB_AUTO_CREATE = True
+    BCRYPT_LOG_ROUNDS = 4
+    RATE_LIMIT_ENABLED = False
+
+
+class ProductionConfig(Config):
+    DB_STATEMENT_TIMEOUT_MS = env_int("DB_STATEMENT_TIMEOUT_MS", 30000)
+
+
+config = {
+    "development": DevelopmentConfig,
+    "testing": TestingConfig,
+    "production": ProductionConfig,
+}
+
+
+def get_config(name: str | None = None) -> Config:
+    """
+    Get the configuration profile to create the app with.
+
+    Args:
+        name: Profile name; defaults to the ``APP_ENV`` environment variable,
+            then to 'production'.
+
+    Returns:
+        An instance of the profile, ready for ``app.config.from_object``.
+    """
+    name = name or os.getenv("APP_ENV", "production")
+    if name not in config:
+        raise ValueError(f"Unknown configuration profile: {name}")
+    return config[name]()
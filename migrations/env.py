@@ -0,0 +1,62 @@
+from logging.config import fileConfig
+
+from alembic import context
+from flask import has_app_context
+
+from app.extentions import db
+
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = db.metadata
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    # The SQLite FTS5 index and its shadow tables are managed by hand
+    if type_ == "table" and name.startswith("search_index"):
+        return False
+    return True
+
+
+def run_migrations_offline():
+    context.configure(
+        url=str(db.engine.url),
+        target_metadata=target_metadata,
+        include_object=include_object,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    with db.engine.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+            render_as_batch=connection.dialect.name == "sqlite",
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+def run_migrations():
+    if context.is_offline_mode():
+        run_migrations_offline()
+    else:
+        run_migrations_online()
+
+
+if has_app_context():
+    run_migrations()
+else:
+    # Invoked through the plain `alembic` command rather than `flask db`
+    from app import create_app
+
+    with create_app().app_context():
+        run_migrations()
@@ -0,0 +1,94 @@
+"""Query indexes, version counters and full-text search
+
+Adds the log and issue listing indexes, the project and issue version
+counters used for conditional requests, and the full-text search index
+(GIN expression indexes on PostgreSQL, an FTS5 table on SQLite).
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:10:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+
+    op.create_index("ix_log_user_id", "log", ["user_id"])
+    op.create_index("ix_log_timestamp", "log", ["timestamp"])
+    op.create_index(
+        "ix_issue_project_id_status_id", "issue", ["project_id", "status", "id"]
+    )
+    op.create_index("ix_issue_project_id_id", "issue", ["project_id", "id"])
+
+    for table in ("project", "issue"):
+        op.add_column(
+            table,
+            sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+        )
+        op.add_column(table, sa.Column("updated_at", sa.DateTime(), nullable=True))
+        op.execute(f"UPDATE {table} SET updated_at = CURRENT_TIMESTAMP")
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(
+                "updated_at", existing_type=sa.DateTime(), nullable=False
+            )
+
+    if dialect == "postgresql":
+        op.create_index(
+            "ix_issue_search",
+            "issue",
+            [sa.text("to_tsvector('english', title || ' ' || description)")],
+            postgresql_using="gin",
+        )
+        op.create_index(
+            "ix_comment_search",
+            "comment",
+            [sa.text("to_tsvector('english', content)")],
+            postgresql_using="gin",
+        )
+    elif dialect == "sqlite":
+        # See SqliteSearchBackend for the layout and rowid scheme
+        op.execute(
+            "CREATE VIRTUAL TABLE search_index USING fts5("
+            "title, body, entity_type UNINDEXED, entity_id UNINDEXED, "
+            "issue_id UNINDEXED, tokenize = 'porter unicode61')"
+        )
+        op.execute(
+            "INSERT INTO search_index "
+            "(rowid, title, body, entity_type, entity_id, issue_id) "
+            "SELECT id * 2, title, description, 'issue', id, id FROM issue"
+        )
+        op.execute(
+            "INSERT INTO search_index "
+            "(rowid, title, body, entity_type, entity_id, issue_id) "
+            "SELECT id * 2 + 1, '', content, 'comment', id, issue_id FROM comment"
+        )
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == "postgresql":
+        op.drop_index("ix_comment_search", table_name="comment")
+        op.drop_index("ix_issue_search", table_name="issue")
+    elif dialect == "sqlite":
+        op.execute("DROP TABLE search_index")
+
+    for table in ("issue", "project"):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column("updated_at")
+            batch_op.drop_column("version")
+
+    op.drop_index("ix_issue_project_id_id", table_name="issue")
+    op.drop_index("ix_issue_project_id_status_id", table_name="issue")
+    op.drop_index("ix_log_timestamp", table_name="log")
+    op.drop_index("ix_log_user_id", table_name="log")
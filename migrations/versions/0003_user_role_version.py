@@ -0,0 +1,31 @@
+"""User role version
+
+Adds the role version counter embedded in access tokens, bumped on every
+role change so tokens carrying the old role stop being accepted.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 14:20:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "user",
+        sa.Column("role_version", sa.Integer(), server_default="1", nullable=False),
+    )
+
+
+def downgrade():
+    with op.batch_alter_table("user") as batch_op:
+        batch_op.drop_column("role_version")
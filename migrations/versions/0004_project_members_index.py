@@ -0,0 +1,30 @@
+"""Project members index
+
+Adds an index on project_members by project, for member lists; membership
+checks by user already use the primary key.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 15:05:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_project_members_project_id_user_id",
+        "project_members",
+        ["project_id", "user_id"],
+    )
+
+
+def downgrade():
+    op.drop_index("ix_project_members_project_id_user_id", "project_members")
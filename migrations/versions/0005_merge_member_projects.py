@@ -0,0 +1,45 @@
+"""Merge member_projects into project_members
+
+Both tables held the same user/project membership, written from either
+side of the relationship. Rows only present in member_projects are copied
+into project_members, which becomes the single association table.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 15:40:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute(
+        "INSERT INTO project_members (user_id, project_id) "
+        "SELECT m.user_id, m.project_id FROM member_projects AS m "
+        "WHERE NOT EXISTS (SELECT 1 FROM project_members AS p "
+        "WHERE p.user_id = m.user_id AND p.project_id = m.project_id)"
+    )
+    op.drop_table("member_projects")
+
+
+def downgrade():
+    op.create_table(
+        "member_projects",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("project_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["project_id"], ["project.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["user.id"]),
+        sa.PrimaryKeyConstraint("user_id", "project_id"),
+    )
+    op.execute(
+        "INSERT INTO member_projects (user_id, project_id) "
+        "SELECT user_id, project_id FROM project_members"
+    )
@@ -0,0 +1,30 @@
+"""Comment thread index
+
+Adds the (issue_id, timestamp, id) index used to page through and poll the
+comments of an issue.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 16:10:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_comment_issue_id_timestamp_id",
+        "comment",
+        ["issue_id", "timestamp", "id"],
+    )
+
+
+def downgrade():
+    op.drop_index("ix_comment_issue_id_timestamp_id", "comment")
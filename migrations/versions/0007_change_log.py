@@ -0,0 +1,44 @@
+"""Change log
+
+Adds the change_log table, the monotonic sequence of project changes read by
+/api/sync.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 17:20:00
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "change_log",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("project_id", sa.Integer(), nullable=False),
+        sa.Column("entity_type", sa.String(length=20), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=False),
+        sa.Column("action", sa.String(length=20), nullable=False),
+        sa.Column("timestamp", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_change_log_project_id_id", "change_log", ["project_id", "id"])
+    op.create_index(
+        "ix_change_log_entity_type_entity_id_id",
+        "change_log",
+        ["entity_type", "entity_id", "id"],
+    )
+
+
+def downgrade():
+    op.drop_index("ix_change_log_entity_type_entity_id_id", "change_log")
+    op.drop_index("ix_change_log_project_id_id", "change_log")
+    op.drop_table("change_log")
@@ -0,0 +1,79 @@
+"""Project statistics
+
+Adds the issue creation time and the summary tables behind
+/api/projects/<id>/stats, filled from the existing issues and comments.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 18:05:00
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("issue", sa.Column("created_at", sa.DateTime(), nullable=True))
+    # The closest known time for existing issues
+    op.execute("UPDATE issue SET created_at = updated_at")
+    with op.batch_alter_table("issue") as batch_op:
+        batch_op.alter_column("created_at", existing_type=sa.DateTime(), nullable=False)
+
+    op.create_table(
+        "project_status_stats",
+        sa.Column("project_id", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("issues", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("project_id", "status"),
+    )
+    op.create_table(
+        "project_daily_stats",
+        sa.Column("project_id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("issues", sa.Integer(), nullable=False),
+        sa.Column("comments", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("project_id", "day"),
+    )
+    op.create_table(
+        "project_commenter_stats",
+        sa.Column("project_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("comments", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("project_id", "user_id"),
+    )
+
+    op.execute(
+        "INSERT INTO project_status_stats (project_id, status, issues) "
+        "SELECT project_id, status, COUNT(*) FROM issue GROUP BY project_id, status"
+    )
+    op.execute(
+        "INSERT INTO project_daily_stats (project_id, day, issues, comments) "
+        "SELECT project_id, day, SUM(issues), SUM(comments) FROM ("
+        "SELECT project_id, DATE(created_at) AS day, 1 AS issues, 0 AS comments "
+        "FROM issue "
+        "UNION ALL "
+        "SELECT issue.project_id, DATE(comment.timestamp), 0, 1 "
+        "FROM comment JOIN issue ON issue.id = comment.issue_id"
+        ") AS activity GROUP BY project_id, day"
+    )
+    op.execute(
+        "INSERT INTO project_commenter_stats (project_id, user_id, comments) "
+        "SELECT issue.project_id, comment.user_id, COUNT(*) "
+        "FROM comment JOIN issue ON issue.id = comment.issue_id "
+        "GROUP BY issue.project_id, comment.user_id"
+    )
+
+
+def downgrade():
+    op.drop_table("project_commenter_stats")
+    op.drop_table("project_daily_stats")
+    op.drop_table("project_status_stats")
+    with op.batch_alter_table("issue") as batch_op:
+        batch_op.drop_column("created_at")
@@ -0,0 +1,86 @@
+import pytest
+
+from app import create_app
+from app.extentions import db
+
+
+@pytest.fixture
+def app():
+    app = create_app("testing")
+    app.config.update(
+        SECRET_KEY="test", JWT_SECRET_KEY="test-secret-key-for-jwt-tokens"
+    )
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def register(client, username, email, password="password"):
+    """Register and log in a user, returning its access and refresh tokens."""
+    client.post(
+        "/api/register",
+        json={
+            "name": username,
+            "username": username,
+            "email": email,
+            "password": password,
+        },
+    )
+    response = client.post(
+        "/api/login", json={"username": username, "password": password}
+    )
+    assert response.status_code == 200
+    return response.json
+
+
+def auth(tokens, kind="access_token"):
+    return {"Authorization": f"Bearer {tokens[kind]}"}
+
+
+@pytest.fixture
+def admin(client):
+    return auth(register(client, "admin", "admin@admin.com"))
+
+
+@pytest.fixture
+def project(client, admin):
+    response = client.post(
+        "/api/projects",
+        json={"name": "Project", "description": "Description", "user_id": 1},
+        headers=admin,
+    )
+    assert response.status_code == 201
+    return response.json["id"]
+
+
+def bulk(client, headers, *operations, atomic=False):
+    response = client.post(
+        "/api/issues/bulk",
+        json={"operations": list(operations), "atomic": atomic},
+        headers=headers,
+    )
+    return response
+
+
+def create_issue(client, headers, project_id, title="Issue", status="open"):
+    """Create an issue and return its id, which POST /api/issues does not."""
+    response = bulk(
+        client,
+        headers,
+        {
+            "op": "create",
+            "title": title,
+            "description": "Description",
+            "status": status,
+            "project_id": project_id,
+        },
+    )
+    assert response.status_code == 200
+    return response.json["results"][0]["id"]
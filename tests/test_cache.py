@@ -0,0 +1,75 @@
+from app import cache as cache_module
+from app.cache import TTLCache
+from app.services.rate_limit_service import MemoryRateLimitBackend, parse_limit
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_their_ttl(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module.time, "monotonic", clock)
+    cache = TTLCache(10)
+
+    cache.set("key", "value", 30)
+    cache.set("skipped", "value", 0)
+    assert cache.get("key") == "value"
+    assert cache.get("skipped") is None
+
+    clock.now += 31
+    assert cache.get("key") is None
+    assert len(cache) == 0
+
+
+def test_full_cache_drops_expired_entries_then_starts_over(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module.time, "monotonic", clock)
+    cache = TTLCache(3)
+
+    cache.set(1, "short", 10)
+    cache.set(2, "long", 100)
+    cache.set(3, "long", 100)
+    clock.now += 20
+    cache.set(4, "new", 100)
+    assert len(cache) == 3
+    assert cache.get(2) == "long"
+
+    cache.set(5, "new", 100)
+    assert len(cache) == 1
+    assert cache.get(5) == "new"
+
+
+def test_discard_drops_matching_entries():
+    cache = TTLCache(10)
+    for key in [(1, 1), (1, 2), (2, 1)]:
+        cache.set(key, True, 30)
+
+    cache.discard(lambda key, _: key[0] == 1)
+
+    assert cache.get((1, 1)) is None
+    assert cache.get((1, 2)) is None
+    assert cache.get((2, 1)) is True
+
+
+def test_rate_limit_buckets_are_forgotten_once_refilled(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module.time, "monotonic", clock)
+    backend = MemoryRateLimitBackend()
+    limit = parse_limit("2/60")
+
+    assert backend.take("key", limit) == 0
+    assert backend.take("key", limit) == 0
+    assert backend.take("key", limit) > 0
+
+    clock.now += 30
+    assert backend.take("key", limit) == 0
+    assert backend.check("key", limit) > 0
+
+    clock.now += 61
+    assert backend.check("key", limit) == 0
+    assert len(backend._buckets) == 0
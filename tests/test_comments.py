@@ -0,0 +1,57 @@
+from app.services.pagination import encode_cursor
+from tests.conftest import create_issue
+
+
+def add_comments(client, headers, issue_id, count):
+    for i in range(count):
+        response = client.post(
+            "/api/comments",
+            json={"user_id": 1, "issue_id": issue_id, "content": f"Comment {i}"},
+            headers=headers,
+        )
+        assert response.status_code == 201
+
+
+def get_comments(client, headers, **args):
+    return client.get("/api/comments", query_string=args, headers=headers)
+
+
+def test_comments_are_paged_oldest_first(client, admin, project):
+    issue = create_issue(client, admin, project)
+    add_comments(client, admin, issue, 3)
+
+    response = get_comments(client, admin, issue_id=issue, limit=2)
+    assert [c["content"] for c in response.json] == ["Comment 0", "Comment 1"]
+    cursor = response.headers["X-Next-Cursor"]
+
+    response = get_comments(client, admin, issue_id=issue, limit=2, cursor=cursor)
+    assert [c["content"] for c in response.json] == ["Comment 2"]
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_newest_timestamp_can_be_passed_back_as_since(client, admin, project):
+    issue = create_issue(client, admin, project)
+    add_comments(client, admin, issue, 2)
+
+    newest = get_comments(client, admin, issue_id=issue).json[-1]["timestamp"]
+    assert get_comments(client, admin, issue_id=issue, since=newest).json == []
+
+    add_comments(client, admin, issue, 1)
+    response = get_comments(client, admin, issue_id=issue, since=newest)
+    assert [c["content"] for c in response.json] == ["Comment 0"]
+
+
+def test_comments_reject_malformed_cursors(client, admin, project):
+    issue = create_issue(client, admin, project)
+    for values in (
+        ["2026-01-01T00:00:00", True],
+        ["2026-01-01T00:00:00"],
+        ["yesterday", 1],
+        [1, 1],
+    ):
+        response = get_comments(
+            client, admin, issue_id=issue, cursor=encode_cursor(values)
+        )
+        assert response.status_code == 400
+    response = get_comments(client, admin, issue_id=issue, since="yesterday")
+    assert response.status_code == 400
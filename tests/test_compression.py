@@ -0,0 +1,99 @@
+import gzip
+
+import pytest
+
+from app import compression
+from app.compression import CompressedCache
+from tests.conftest import bulk
+
+
+@pytest.fixture
+def issues_url(client, admin, project):
+    bulk(
+        client,
+        admin,
+        *[
+            {
+                "op": "create",
+                "title": f"Issue {i}",
+                "description": "A description long enough to compress " * 4,
+                "status": "open",
+                "project_id": project,
+            }
+            for i in range(20)
+        ],
+    )
+    return f"/api/issues?project_id={project}"
+
+
+def get(client, url, headers, encoding):
+    return client.get(url, headers={**headers, "Accept-Encoding": encoding})
+
+
+def test_gzip_is_negotiated(client, admin, issues_url):
+    plain = get(client, issues_url, admin, "identity")
+    assert "Content-Encoding" not in plain.headers
+    assert "Accept-Encoding" in plain.headers["Vary"]
+
+    response = get(client, issues_url, admin, "gzip, deflate")
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(response.data) == plain.data
+    assert len(response.data) < len(plain.data)
+    # The compressed bytes only promise semantic equivalence
+    assert response.headers["ETag"] == f"W/{plain.headers['ETag']}"
+
+    refused = get(client, issues_url, admin, "gzip;q=0")
+    assert "Content-Encoding" not in refused.headers
+
+
+def test_weak_etag_of_compressed_response_still_validates(client, admin, issues_url):
+    etag = get(client, issues_url, admin, "gzip").headers["ETag"]
+
+    response = client.get(
+        issues_url,
+        headers={**admin, "Accept-Encoding": "gzip", "If-None-Match": etag},
+    )
+
+    assert response.status_code == 304
+
+
+def test_small_bodies_are_not_compressed(client, admin, project):
+    response = get(client, f"/api/project/{project}", admin, "gzip")
+    assert len(response.data) < 1024
+    assert "Content-Encoding" not in response.headers
+
+
+def test_compressed_bodies_are_cached(client, admin, issues_url, monkeypatch):
+    calls = []
+    real_compress = compression._compress
+
+    def counting_compress(data, encoding):
+        calls.append(encoding)
+        return real_compress(data, encoding)
+
+    monkeypatch.setattr(compression, "_compress", counting_compress)
+    first = get(client, issues_url, admin, "gzip")
+    second = get(client, issues_url, admin, "gzip")
+
+    assert calls == ["gzip"]
+    assert second.data == first.data
+
+
+def test_brotli_is_preferred_when_available(client, admin, issues_url):
+    pytest.importorskip("brotli")
+    response = get(client, issues_url, admin, "gzip, br")
+    assert response.headers["Content-Encoding"] == "br"
+
+
+def test_cache_evicts_least_recently_used_bodies():
+    cache = CompressedCache(max_bytes=10)
+    cache.set("a", b"aaaa")
+    cache.set("b", b"bbbb")
+    assert cache.get("a") == b"aaaa"
+    cache.set("c", b"cccc")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"aaaa" and cache.get("c") == b"cccc"
+    assert cache.size == 8
+    cache.set("big", b"x" * 11)
+    assert cache.get("big") is None
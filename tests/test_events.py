@@ -0,0 +1,70 @@
+from app.extentions import db
+from app.models import Issue
+from app.services.event_service import LocalBroker, project_channel
+from tests.conftest import auth, create_issue, register
+
+
+def subscribe(app, project_id):
+    broker = app.extensions["events"]
+    assert isinstance(broker, LocalBroker)
+    return broker.subscribe(project_channel(project_id))
+
+
+def add_issue(project_id):
+    db.session.add(
+        Issue(
+            title="Issue",
+            description="Description",
+            status="open",
+            project_id=project_id,
+        )
+    )
+    db.session.flush()
+
+
+def test_events_are_published_once_committed(app, project):
+    subscription = subscribe(app, project)
+    with app.app_context():
+        add_issue(project)
+        assert subscription.get(0) is None
+        db.session.commit()
+
+    assert subscription.get(0) == {
+        "project_id": project,
+        "type": "issue",
+        "id": 1,
+        "action": "created",
+    }
+    assert subscription.get(0) is None
+    subscription.close()
+
+
+def test_rolled_back_changes_are_not_published(app, project):
+    subscription = subscribe(app, project)
+    with app.app_context():
+        add_issue(project)
+        db.session.rollback()
+        db.session.commit()
+
+    assert subscription.get(0) is None
+    subscription.close()
+
+
+def test_stream_ends_once_access_is_lost(app, client, admin, project):
+    app.config["EVENTS_HEARTBEAT"] = 0.01
+    member = auth(register(client, "member", "member@example.com"))
+    client.post(f"/api/projects/{project}/add_user", json={"user_id": 2}, headers=admin)
+    url = f"/api/projects/{project}/events"
+
+    chunks = iter(client.get(url, headers=member).response)
+    assert next(chunks) == b"retry: 5000\n\n"
+    create_issue(client, admin, project)
+    assert b'"type":"issue"' in next(chunk for chunk in chunks if b"event:" in chunk)
+
+    client.post(
+        f"/api/projects/{project}/remove_user", json={"user_id": 2}, headers=admin
+    )
+    # The removal itself may still be sent before the next access check
+    # ends the stream
+    assert b'"type":"issue"' not in b"".join(chunks)
+    assert client.get(url, headers=member).status_code == 403
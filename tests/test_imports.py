@@ -0,0 +1,103 @@
+import io
+import json
+
+from app.extentions import db
+from app.models import ChangeLog, Issue, Log
+from tests.conftest import auth, create_issue, register
+
+
+def ndjson(*records):
+    return "".join(json.dumps(record) + "\n" for record in records)
+
+
+def issue_record(project_id, title="Imported", status="new"):
+    return {
+        "title": title,
+        "description": "Description",
+        "status": status,
+        "project_id": project_id,
+    }
+
+
+def import_data(client, headers, kind, data, **args):
+    return client.post(
+        f"/api/import/{kind}", query_string=args, data=data, headers=headers
+    )
+
+
+def test_import_writes_valid_rows_and_reports_the_others(app, client, admin, project):
+    data = (
+        ndjson(
+            issue_record(project, "First"),
+            {"title": "No description", "status": "new", "project_id": project},
+            issue_record(999),
+            issue_record(project, "Second"),
+            issue_record(project, "Third"),
+        )
+        + "not json\n"
+    )
+
+    response = import_data(client, admin, "issues", data, chunk_size=2)
+
+    assert response.status_code == 200
+    report = response.json
+    assert (report["processed"], report["imported"], report["failed"]) == (6, 3, 3)
+    assert [error["line"] for error in report["errors"]] == [2, 3, 6]
+    with app.app_context():
+        titles = [issue.title for issue in Issue.query.order_by(Issue.id)]
+        assert titles == ["First", "Second", "Third"]
+        assert Log.query.filter(Log.action.like("Imported 3 issues%")).count() == 1
+
+
+def test_csv_upload_takes_the_project_from_the_query(app, client, admin, project):
+    data = "title,description,status\nOne,Description,new\nTwo,Description,open\n"
+
+    response = client.post(
+        "/api/import/issues",
+        query_string={"project_id": project},
+        data={"file": (io.BytesIO(data.encode()), "issues.csv")},
+        headers=admin,
+    )
+
+    assert response.json["imported"] == 2
+    with app.app_context():
+        assert Issue.query.filter_by(project_id=project).count() == 2
+
+
+def test_imported_rows_are_in_the_change_log_and_stats(app, client, admin, project):
+    issue = create_issue(client, admin, project)
+    import_data(client, admin, "issues", ndjson(*[issue_record(project)] * 2))
+    import_data(
+        client,
+        admin,
+        "comments",
+        ndjson(
+            {"content": "Imported", "issue_id": issue, "user_id": 1},
+            {"content": "Imported", "issue_id": issue, "user_id": 1},
+        ),
+    )
+
+    with app.app_context():
+        imported = [issue.id for issue in Issue.query.filter_by(title="Imported")]
+        logged = db.session.query(ChangeLog).all()
+        created = {
+            (row.entity_type, row.entity_id)
+            for row in logged
+            if row.action == "created" and row.project_id == project
+        }
+        assert {("issue", issue_id) for issue_id in imported} <= created
+        assert len([row for row in created if row[0] == "comment"]) == 2
+
+    stats = client.get(f"/api/projects/{project}/stats", headers=admin).json
+    assert stats["issues_by_status"] == {"new": 2, "open": 1}
+    assert stats["comments"] == 2
+    response = client.get("/api/search", query_string={"q": "Imported"}, headers=admin)
+    assert len(response.json) == 4
+
+
+def test_import_requires_a_project_manager(client, admin):
+    member = auth(register(client, "member", "member@example.com"))
+
+    response = import_data(client, member, "issues", ndjson(issue_record(1)))
+
+    assert response.status_code == 403
@@ -0,0 +1,186 @@
+from sqlalchemy import event
+
+from app.extentions import db
+from app.models import Issue, Log
+from app.services.pagination import encode_cursor
+from tests.conftest import auth, bulk, create_issue, register
+
+
+def create_operation(project_id, title="Issue", status="open"):
+    return {
+        "op": "create",
+        "title": title,
+        "description": "Description",
+        "status": status,
+        "project_id": project_id,
+    }
+
+
+def test_bulk_applies_every_kind_of_operation(app, client, admin, project):
+    first = create_issue(client, admin, project)
+    second = create_issue(client, admin, project)
+
+    response = bulk(
+        client,
+        admin,
+        create_operation(project, title="New"),
+        {"op": "update", "issue_id": first, "status": "closed"},
+        {"op": "delete", "issue_id": second},
+    )
+
+    assert response.status_code == 200
+    assert [result["status"] for result in response.json["results"]] == [
+        "created",
+        "updated",
+        "deleted",
+    ]
+    with app.app_context():
+        assert db.session.get(Issue, first).status == "closed"
+        assert db.session.get(Issue, second) is None
+        assert Issue.query.filter_by(title="New").count() == 1
+
+
+def test_bulk_rejects_duplicate_issue_ids(app, client, admin, project):
+    updated = create_issue(client, admin, project)
+    deleted = create_issue(client, admin, project)
+
+    response = bulk(
+        client,
+        admin,
+        {"op": "update", "issue_id": updated, "status": "review"},
+        {"op": "update", "issue_id": updated, "status": "closed"},
+        {"op": "delete", "issue_id": deleted},
+        {"op": "delete", "issue_id": deleted},
+    )
+
+    assert response.status_code == 200
+    results = response.json["results"]
+    assert [result["status"] for result in results] == [
+        "updated",
+        "error",
+        "deleted",
+        "error",
+    ]
+    assert results[1]["message"] == "Duplicate issue_id"
+    assert results[3]["message"] == "Duplicate issue_id"
+    with app.app_context():
+        assert db.session.get(Issue, updated).status == "review"
+        deletions = Log.query.filter(
+            Log.action.like(f"Deleted Issue with ID {deleted} %")
+        ).count()
+        assert deletions == 1
+
+
+def test_bulk_rejects_boolean_ids(client, admin, project):
+    response = bulk(
+        client,
+        admin,
+        create_operation(True),
+        {"op": "update", "issue_id": True, "status": "closed"},
+    )
+
+    results = response.json["results"]
+    assert results[0]["message"] == "project_id is required"
+    assert results[1]["message"] == "issue_id is required"
+
+
+def test_bulk_rejects_bodies_that_are_not_objects(client, admin):
+    for body in ([{"op": "delete", "issue_id": 1}], "operations", 1):
+        response = client.post("/api/issues/bulk", json=body, headers=admin)
+        assert response.status_code == 400
+
+
+def test_atomic_bulk_applies_nothing_on_error(app, client, admin, project):
+    response = bulk(
+        client,
+        admin,
+        create_operation(project),
+        {"op": "update", "issue_id": 999, "status": "closed"},
+        atomic=True,
+    )
+
+    assert response.status_code == 400
+    with app.app_context():
+        assert Issue.query.count() == 0
+
+
+def test_issue_list_is_not_modified_until_an_issue_changes(client, admin, project):
+    issue = create_issue(client, admin, project)
+    url = f"/api/issues?project_id={project}"
+
+    response = client.get(url, headers=admin)
+    etag = response.headers["ETag"]
+    assert response.status_code == 200
+    assert "Last-Modified" in response.headers
+
+    response = client.get(url, headers={**admin, "If-None-Match": etag})
+    assert response.status_code == 304
+
+    bulk(client, admin, {"op": "update", "issue_id": issue, "status": "closed"})
+    response = client.get(url, headers={**admin, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_audit_log_is_written_with_one_insert_per_flush(app, client, admin, project):
+    statements = []
+
+    def count_log_inserts(conn, cursor, statement, parameters, context, many):
+        if statement.startswith("INSERT INTO log "):
+            statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", count_log_inserts)
+    try:
+        response = bulk(
+            client, admin, *[create_operation(project, f"Issue {i}") for i in range(5)]
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", count_log_inserts)
+
+    assert response.status_code == 200
+    assert len(statements) == 1
+    with app.app_context():
+        assert Log.query.filter(Log.action.like("Inserted Issue %")).count() == 5
+
+
+def test_project_issues_require_project_access(client, admin, project):
+    create_issue(client, admin, project)
+    outsider = auth(register(client, "outsider", "outsider@example.com"))
+    url = f"/api/projects/{project}/issues"
+
+    assert client.get(url, headers=outsider).status_code == 403
+    response = client.get(url, headers=admin)
+    assert response.status_code == 200
+    assert len(response.json) == 1
+
+
+def test_issue_list_pages_with_a_cursor(client, admin, project):
+    ids = [create_issue(client, admin, project) for _ in range(3)]
+    url = f"/api/issues?project_id={project}&limit=2"
+
+    response = client.get(url, headers=admin)
+    assert [issue["id"] for issue in response.json] == ids[:2]
+    cursor = response.headers["X-Next-Cursor"]
+
+    response = client.get(f"{url}&cursor={cursor}", headers=admin)
+    assert [issue["id"] for issue in response.json] == ids[2:]
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_issue_list_rejects_malformed_cursors(client, admin, project):
+    url = f"/api/issues?project_id={project}"
+    for values in ([True], ["1"], [1, 2], [None]):
+        response = client.get(f"{url}&cursor={encode_cursor(values)}", headers=admin)
+        assert response.status_code == 400
+    response = client.get(f"{url}&cursor=not-a-cursor", headers=admin)
+    assert response.status_code == 400
+
+
+def test_issue_list_rejects_an_empty_projection(client, admin, project):
+    for fields in (",", "%20", "id,nope"):
+        response = client.get(
+            f"/api/issues?project_id={project}&fields={fields}", headers=admin
+        )
+        assert response.status_code == 400
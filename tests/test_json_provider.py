@@ -0,0 +1,57 @@
+import json
+import uuid
+from collections import namedtuple
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+from flask.json.provider import DefaultJSONProvider
+
+from app.json_provider import OrjsonProvider, orjson
+
+pytestmark = pytest.mark.skipif(orjson is None, reason="orjson is not installed")
+
+Row = namedtuple("Row", "id name")
+
+
+@dataclass
+class Point:
+    x: int
+    y: int
+
+
+PAYLOADS = [
+    {"id": 1, "title": "Ünïcode ✓", "tags": ["a", "b"], "none": None},
+    {"when": datetime(2026, 10, 18, 7, 30, 44, 123456)},
+    {"aware": datetime(2026, 10, 18, 7, 30, tzinfo=timezone.utc)},
+    {"day": date(2026, 10, 18)},
+    {1: "int key", 2.5: "float key"},
+    {"row": Row(1, "name"), "rows": [Row(2, "other")]},
+    {"amount": Decimal("1.50"), "uuid": uuid.UUID(int=1), "point": Point(1, 2)},
+    [1.5, True, False, 10**15],
+]
+
+
+@pytest.mark.parametrize("payload", PAYLOADS)
+def test_orjson_output_matches_the_default_provider(app, payload):
+    default = DefaultJSONProvider(app)
+    fast = OrjsonProvider(app)
+
+    assert json.loads(fast.dumps(payload)) == json.loads(default.dumps(payload))
+    with app.app_context():
+        assert json.loads(fast.response(payload).data) == json.loads(
+            default.response(payload).data
+        )
+
+
+def test_orjson_keeps_key_order_and_loads(app):
+    fast = OrjsonProvider(app)
+    assert fast.dumps({"b": 1, "a": 2}) == '{"b":1,"a":2}'
+    assert fast.loads(b'{"a": [1, 2]}') == {"a": [1, 2]}
+    # Stdlib arguments fall back to the default provider
+    assert fast.dumps({"a": 1}, indent=2) == '{\n  "a": 1\n}'
+
+
+def test_app_uses_orjson_when_installed(app):
+    assert isinstance(app.json, OrjsonProvider)
@@ -0,0 +1,41 @@
+from tests.conftest import create_issue
+
+
+def get_logs(client, **args):
+    response = client.get("/api/logs", query_string=args)
+    assert response.status_code == 200
+    return response
+
+
+def test_logs_are_paged_newest_first(client, admin, project):
+    for _ in range(3):
+        create_issue(client, admin, project)
+    newest = get_logs(client).json
+    ids = [log["id"] for log in newest]
+    assert ids == sorted(ids, reverse=True)
+
+    response = get_logs(client, limit=2)
+    assert [log["id"] for log in response.json] == ids[:2]
+    response = get_logs(client, limit=2, before=response.headers["X-Next-Cursor"])
+    assert [log["id"] for log in response.json] == ids[2:4]
+    assert [log["id"] for log in get_logs(client, after=ids[2]).json] == ids[:2]
+
+
+def test_logs_filter_by_user(client, admin, project):
+    create_issue(client, admin, project)
+
+    assert {log["id"] for log in get_logs(client, user_id=1).json}
+    assert get_logs(client, user_id=2).json == []
+
+
+def test_logs_reject_parameters_that_do_not_parse(client):
+    for args in (
+        {"user_id": "abc"},
+        {"before": "x"},
+        {"after": "1.5"},
+        {"since": "yesterday"},
+        {"limit": "0"},
+        {"count": "many"},
+    ):
+        response = client.get("/api/logs", query_string=args)
+        assert response.status_code == 400, args
@@ -0,0 +1,81 @@
+import threading
+
+import pytest
+
+from app.extentions import bcrypt, db
+from app.models import User
+from app.services.password_service import (
+    PasswordPool,
+    PasswordPoolBusy,
+    hash_password,
+    needs_rehash,
+    verify_password,
+)
+from tests.conftest import register
+
+
+def test_hashes_are_made_and_checked_on_the_pool(app):
+    with app.app_context():
+        password_hash = hash_password("secret")
+        assert password_hash.startswith("$2b$04$")
+        assert verify_password(password_hash, "secret")
+        assert not verify_password(password_hash, "wrong")
+
+        thread = app.extensions["password_pool"].run(
+            lambda: threading.current_thread().name
+        )
+        assert thread.startswith("bcrypt")
+
+
+def test_full_pool_rejects_new_jobs():
+    pool = PasswordPool(workers=1, max_pending=1)
+    started, release = threading.Event(), threading.Event()
+
+    def blocking():
+        started.set()
+        release.wait(5)
+
+    worker = threading.Thread(target=pool.run, args=(blocking,))
+    worker.start()
+    started.wait(5)
+    with pytest.raises(PasswordPoolBusy):
+        pool.run(lambda: None)
+
+    release.set()
+    worker.join(5)
+    assert pool.run(lambda: "done") == "done"
+
+
+def test_login_upgrades_hashes_made_with_another_cost(app, client):
+    register(client, "user", "user@example.com")
+    with app.app_context():
+        user = User.query.filter_by(username="user").one()
+        user.password_hash = bcrypt.generate_password_hash(
+            "password", rounds=5
+        ).decode()
+        db.session.commit()
+        assert needs_rehash(user.password_hash)
+
+    response = client.post(
+        "/api/login", json={"username": "user", "password": "password"}
+    )
+
+    assert response.status_code == 200
+    with app.app_context():
+        upgraded = User.query.filter_by(username="user").one().password_hash
+        assert upgraded.startswith("$2b$04$") and not needs_rehash(upgraded)
+
+
+def test_login_answers_503_when_the_pool_is_busy(app, client, monkeypatch):
+    register(client, "user", "user@example.com")
+
+    def busy(*args):
+        raise PasswordPoolBusy()
+
+    monkeypatch.setattr(app.extensions["password_pool"], "run", busy)
+    response = client.post(
+        "/api/login", json={"username": "user", "password": "password"}
+    )
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
@@ -0,0 +1,29 @@
+from tests.conftest import auth, register
+
+
+def test_project_is_not_modified_until_it_changes(client, admin, project):
+    url = f"/api/project/{project}"
+    response = client.get(url, headers=admin)
+    etag = response.headers["ETag"]
+    assert response.status_code == 200
+
+    response = client.get(url, headers={**admin, "If-None-Match": etag})
+    assert response.status_code == 304
+
+    client.patch(
+        "/api/projects",
+        json={"project_id": project, "user_id": 1, "name": "Renamed"},
+        headers=admin,
+    )
+    response = client.get(url, headers={**admin, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json["name"] == "Renamed"
+
+
+def test_exports_require_project_access(client, admin, project):
+    outsider = auth(register(client, "outsider", "outsider@example.com"))
+
+    for kind in ("issues", "comments"):
+        url = f"/api/projects/{project}/export/{kind}"
+        assert client.get(url, headers=outsider).status_code == 403
+        assert client.get(url, headers=admin).status_code == 200
@@ -0,0 +1,76 @@
+import gzip
+import json
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from app.extentions import db
+from app.models import Log
+from app.services.retention_service import prune_logs
+
+
+def add_logs(app, days_old, count):
+    timestamp = datetime.now() - timedelta(days=days_old)
+    with app.app_context():
+        db.session.execute(
+            insert(Log),
+            [
+                {"user_id": None, "action": f"Action {i}", "timestamp": timestamp}
+                for i in range(count)
+            ],
+        )
+        db.session.commit()
+
+
+def remaining_actions(app):
+    with app.app_context():
+        return [log.action for log in Log.query.order_by(Log.id)]
+
+
+def test_old_entries_are_archived_then_deleted_in_batches(app, tmp_path):
+    add_logs(app, 400, 5)
+    add_logs(app, 1, 2)
+    reports = []
+
+    with app.app_context():
+        report = prune_logs(
+            datetime.now() - timedelta(days=365),
+            archive_dir=str(tmp_path),
+            batch_size=2,
+            progress=lambda report: reports.append(report.deleted),
+        )
+
+    assert report.deleted == 5
+    assert reports == [2, 4, 5]
+    assert remaining_actions(app) == ["Action 0", "Action 1"]
+    # One gzip member per batch, readable as a single file
+    with gzip.open(report.archive, "rt") as archive:
+        archived = [json.loads(line) for line in archive]
+    assert [row["id"] for row in archived] == [1, 2, 3, 4, 5]
+    assert set(archived[0]) == {"id", "user_id", "action", "timestamp"}
+
+
+def test_nothing_to_prune_leaves_no_archive(app, tmp_path):
+    add_logs(app, 1, 2)
+
+    with app.app_context():
+        report = prune_logs(datetime.now() - timedelta(days=365), str(tmp_path))
+
+    assert report.deleted == 0 and report.archive is None
+    assert list(tmp_path.iterdir()) == []
+    assert len(remaining_actions(app)) == 2
+
+
+def test_prune_command_can_skip_the_archive(app, tmp_path):
+    app.config["LOG_ARCHIVE_DIR"] = str(tmp_path)
+    add_logs(app, 40, 3)
+    add_logs(app, 1, 1)
+
+    result = app.test_cli_runner().invoke(
+        args=["logs", "prune", "--days", "30", "--no-archive"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "Deleted 3 log entries older than 30 days." in result.output
+    assert list(tmp_path.iterdir()) == []
+    assert len(remaining_actions(app)) == 1
@@ -0,0 +1,69 @@
+import pytest
+
+from app.services.pagination import encode_cursor
+from app.services.search_service import LikeSearchBackend, SqliteSearchBackend
+from tests.conftest import auth, bulk, create_issue, register
+
+
+@pytest.fixture(params=["sqlite", "like"])
+def backend(request, app):
+    if request.param == "like":
+        app.extensions["search"] = LikeSearchBackend()
+    else:
+        assert isinstance(app.extensions["search"], SqliteSearchBackend)
+    return request.param
+
+
+def search(client, headers, q, **args):
+    return client.get("/api/search", query_string={"q": q, **args}, headers=headers)
+
+
+def found(response):
+    assert response.status_code == 200
+    return sorted((hit["type"], hit["id"]) for hit in response.json)
+
+
+def test_index_follows_writes(backend, client, admin, project):
+    issue = create_issue(client, admin, project, title="Flaky login")
+    client.post(
+        "/api/comments",
+        json={"user_id": 1, "issue_id": issue, "content": "The login hangs"},
+        headers=admin,
+    )
+    assert found(search(client, admin, "login")) == [("comment", 1), ("issue", issue)]
+    assert found(search(client, admin, "login", type="issue")) == [("issue", issue)]
+
+    bulk(client, admin, {"op": "update", "issue_id": issue, "title": "Slow page"})
+    assert found(search(client, admin, "flaky")) == []
+    assert found(search(client, admin, "slow")) == [("issue", issue)]
+
+    client.delete("/api/comment?id=1", headers=admin)
+    assert found(search(client, admin, "hangs")) == []
+    bulk(client, admin, {"op": "delete", "issue_id": issue})
+    assert found(search(client, admin, "slow")) == []
+
+
+def test_search_is_limited_to_accessible_projects(backend, client, admin, project):
+    issue = create_issue(client, admin, project, title="Secret plan")
+    outsider = auth(register(client, "outsider", "outsider@example.com"))
+
+    assert found(search(client, admin, "secret")) == [("issue", issue)]
+    assert found(search(client, outsider, "secret")) == []
+    response = search(client, outsider, "secret", project_id=project)
+    assert response.status_code == 403
+    assert search(client, admin, "secret", project_id=999).status_code == 404
+
+
+def test_search_pages_with_a_cursor(backend, client, admin, project):
+    ids = {create_issue(client, admin, project, title="Paged") for _ in range(3)}
+
+    response = search(client, admin, "paged", limit=2)
+    first = {hit["id"] for hit in response.json}
+    cursor = response.headers["X-Next-Cursor"]
+    response = search(client, admin, "paged", limit=2, cursor=cursor)
+    assert first | {hit["id"] for hit in response.json} == ids
+    assert "X-Next-Cursor" not in response.headers
+
+    for values in ([True], [-1], ["0"]):
+        response = search(client, admin, "paged", cursor=encode_cursor(values))
+        assert response.status_code == 400
@@ -0,0 +1,91 @@
+from app.extentions import db
+from app.models import ChangeLog
+from app.services.pagination import encode_cursor
+from tests.conftest import auth, bulk, create_issue, register
+
+
+def change_log(app):
+    with app.app_context():
+        return [
+            (row.project_id, row.entity_type, row.entity_id, row.action)
+            for row in db.session.query(ChangeLog).order_by(ChangeLog.id)
+        ]
+
+
+def sync(client, headers, since=None):
+    args = {} if since is None else {"since": since}
+    response = client.get("/api/sync", query_string=args, headers=headers)
+    assert response.status_code == 200
+    return response.json
+
+
+def test_writes_are_recorded_in_the_change_log(app, client, admin, project):
+    issue = create_issue(client, admin, project)
+    bulk(client, admin, {"op": "update", "issue_id": issue, "status": "closed"})
+    bulk(client, admin, {"op": "delete", "issue_id": issue})
+
+    assert change_log(app)[-3:] == [
+        (project, "issue", issue, "created"),
+        (project, "issue", issue, "updated"),
+        (project, "issue", issue, "deleted"),
+    ]
+
+
+def test_sync_returns_the_latest_state_of_changed_entities(app, client, admin):
+    app.config["SYNC_SETTLE_SECONDS"] = 0
+    since = sync(client, admin)["cursor"]
+    project = client.post(
+        "/api/projects",
+        json={"name": "Project", "description": "Description", "user_id": 1},
+        headers=admin,
+    ).json["id"]
+    kept = create_issue(client, admin, project)
+    deleted = create_issue(client, admin, project)
+    for status in ("review", "closed"):
+        bulk(client, admin, {"op": "update", "issue_id": kept, "status": status})
+    bulk(client, admin, {"op": "delete", "issue_id": deleted})
+
+    changes = sync(client, admin, since)
+
+    assert [issue["id"] for issue in changes["issues"]] == [kept]
+    assert changes["issues"][0]["status"] == "closed"
+    assert [p["id"] for p in changes["projects"]] == [project]
+    assert changes["deleted"] == {"projects": [], "issues": [deleted], "comments": []}
+    assert changes["has_more"] is False
+    # Nothing changed since the returned cursor
+    again = sync(client, admin, changes["cursor"])
+    assert again["issues"] == [] and again["cursor"] == changes["cursor"]
+
+
+def test_sync_only_returns_the_callers_projects(app, client, admin, project):
+    app.config["SYNC_SETTLE_SECONDS"] = 0
+    outsider = auth(register(client, "outsider", "outsider@example.com"))
+    create_issue(client, admin, project)
+
+    changes = sync(client, outsider, encode_cursor([0]))
+
+    assert changes["issues"] == [] and changes["projects"] == []
+
+
+def test_cursor_stays_behind_unsettled_changes(app, client, admin, project):
+    app.config["SYNC_SETTLE_SECONDS"] = 3600
+    since = sync(client, admin)["cursor"]
+    assert since == encode_cursor([0])
+    issue = create_issue(client, admin, project)
+
+    changes = sync(client, admin, since)
+
+    # Young changes are sent, but sent again next time
+    assert [i["id"] for i in changes["issues"]] == [issue]
+    assert changes["cursor"] == since
+    assert changes["has_more"] is False
+
+
+def test_sync_rejects_malformed_cursors(client, admin):
+    for values in ([True], ["1"], [1, 2]):
+        response = client.get(
+            "/api/sync",
+            query_string={"since": encode_cursor(values)},
+            headers=admin,
+        )
+        assert response.status_code == 400
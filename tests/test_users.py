@@ -0,0 +1,49 @@
+from flask_jwt_extended import decode_token
+
+from tests.conftest import auth, register
+
+
+def change_role(client, headers, user_id, role):
+    response = client.post(
+        "/api/admin/change_role",
+        json={"user_id": user_id, "role": role},
+        headers=headers,
+    )
+    assert response.status_code == 200
+
+
+def test_role_change_revokes_old_access_tokens(client, admin):
+    tokens = register(client, "member", "member@example.com")
+    assert client.get("/api/user", headers=auth(tokens)).status_code == 200
+
+    change_role(client, admin, 2, "project_manager")
+
+    response = client.get("/api/user", headers=auth(tokens))
+    assert response.status_code == 401
+
+
+def test_refresh_issues_a_token_with_the_current_role(app, client, admin):
+    tokens = register(client, "member", "member@example.com")
+    assert client.get("/api/user", headers=auth(tokens)).json["role"] == "member"
+
+    change_role(client, admin, 2, "project_manager")
+
+    response = client.post("/api/refresh", headers=auth(tokens, "refresh_token"))
+    assert response.status_code == 200
+    with app.app_context():
+        assert decode_token(response.json["access_token"])["role"] == "project_manager"
+    headers = auth(response.json)
+    response = client.get("/api/user", headers=headers)
+    assert response.status_code == 200
+    assert response.json["role"] == "project_manager"
+
+
+def test_login_rejects_credentials_that_are_not_strings(client):
+    for credentials in [
+        {"username": 1, "password": "password"},
+        {"username": ["admin"], "password": "password"},
+        {"username": "admin", "password": None},
+        {"password": "password"},
+    ]:
+        response = client.post("/api/login", json=credentials)
+        assert response.status_code == 400